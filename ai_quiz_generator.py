@@ -2,26 +2,37 @@ import cv2
 import numpy as np
 from PIL import Image
 import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+from transformers import pipeline
 import openai
 import os
 from dotenv import load_dotenv
 import json
 import random
+import threading
 
 # 환경 변수 로드
 load_dotenv()
 
+# 인스턴스 간 공유되는 모델 (처음 사용할 때 로드)
+_shared_models = {}
+_shared_models_lock = threading.Lock()
+
+def get_shared_model(name, loader):
+    """프로세스 공용 모델 반환 (없으면 로드)"""
+    model = _shared_models.get(name)
+    if model is None:
+        with _shared_models_lock:
+            model = _shared_models.get(name)
+            if model is None:
+                model = loader()
+                _shared_models[name] = model
+    return model
+
 class AIQuizGenerator:
-    def __init__(self):
+    def __init__(self, batch_size=8):
         """AI 퀴즈 생성기 초기화"""
-        self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
-        # 이미지 분석을 위한 모델 (실제로는 더 정교한 모델 사용)
-        self.image_analyzer = pipeline("image-classification", model="microsoft/resnet-50")
-        
-        # 텍스트 생성 모델
-        self.text_generator = pipeline("text-generation", model="gpt2")
+        # 프레임 배치 추론 크기
+        self.batch_size = batch_size
         
         # 도로교통법 관련 키워드
         self.traffic_keywords = {
@@ -32,6 +43,23 @@ class AIQuizGenerator:
             "특수상황": ["긴급차량", "장애인", "어린이", "보호구역", "학교"]
         }
     
+    @property
+    def openai_client(self):
+        return get_shared_model("openai_client", lambda: openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY')))
+    
+    @property
+    def image_analyzer(self):
+        """이미지 분석을 위한 모델 (실제로는 더 정교한 모델 사용)"""
+        return get_shared_model("image_classifier", lambda: pipeline("image-classification", model="microsoft/resnet-50"))
+    
+    def _extract_road_elements(self, results):
+        """분석 결과에서 도로 관련 요소 추출"""
+        road_elements = []
+        for result in results:
+            if any(keyword in result['label'].lower() for keyword in ['car', 'road', 'traffic', 'signal', 'crossing']):
+                road_elements.append(result['label'])
+        return road_elements
+    
     def analyze_video_frame(self, frame):
         """비디오 프레임 분석"""
         try:
@@ -43,16 +71,23 @@ class AIQuizGenerator:
             results = self.image_analyzer(pil_image)
             
             # 분석 결과에서 도로 관련 요소 추출
-            road_elements = []
-            for result in results:
-                if any(keyword in result['label'].lower() for keyword in ['car', 'road', 'traffic', 'signal', 'crossing']):
-                    road_elements.append(result['label'])
-            
-            return road_elements
+            return self._extract_road_elements(results)
         except Exception as e:
             print(f"프레임 분석 오류: {e}")
             return []
     
+    def analyze_video_frames(self, frames):
+        """여러 프레임을 배치로 분석"""
+        if not frames:
+            return []
+        try:
+            pil_images = [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame in frames]
+            batch_results = self.image_analyzer(pil_images, batch_size=self.batch_size)
+            return [self._extract_road_elements(results) for results in batch_results]
+        except Exception as e:
+            print(f"배치 프레임 분석 오류: {e}")
+            return [[] for _ in frames]
+    
     def generate_scenario_description(self, road_elements):
         """도로 상황 설명 생성"""
         try:
@@ -190,13 +225,20 @@ class AIQuizGenerator:
             all_elements = []
             
             while cap.isOpened() and frames_analyzed < 10:  # 최대 10프레임 분석
-                ret, frame = cap.read()
-                if not ret:
+                # 배치 크기만큼 프레임 디코딩 후 한 번에 추론
+                window = []
+                while len(window) < self.batch_size and frames_analyzed + len(window) < 10:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    window.append(frame)
+                
+                if not window:
                     break
                 
-                elements = self.analyze_video_frame(frame)
-                all_elements.extend(elements)
-                frames_analyzed += 1
+                for elements in self.analyze_video_frames(window):
+                    all_elements.extend(elements)
+                frames_analyzed += len(window)
             
             cap.release()
             
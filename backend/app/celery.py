@@ -0,0 +1,40 @@
+from celery import Celery
+
+from app.core.config import settings
+
+# docker-compose: celery -A app.celery worker -B (퀴즈 재고 보충/업로드 세션 정리 주기 작업 포함)
+celery = Celery(
+    "road_quiz",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.tasks"]
+)
+
+celery.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    result_expires=settings.JOB_TTL,
+    # 작업 하나가 수 초 이상 걸리므로 미리 가져가지 않고, 워커가 죽으면 다시 전달되도록 완료 후 ack
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # 워커가 죽으면 단계 작업은 이 시간 뒤 다시 전달됨 (스케줄러의 재큐잉보다 먼저 일어나도록 짧게)
+    broker_transport_options={"visibility_timeout": settings.SCHEDULER_PROCESSING_TIMEOUT // 2},
+    timezone="Asia/Seoul"
+)
+
+celery.conf.beat_schedule = {
+    "refill-quiz-pool": {
+        "task": "quiz.refill_pool",
+        "schedule": float(settings.QUIZ_POOL_REFILL_INTERVAL)
+    },
+    "reap-stale-quiz-jobs": {
+        "task": "quiz.reap_stale",
+        "schedule": float(settings.SCHEDULER_REAP_INTERVAL)
+    },
+    "purge-upload-sessions": {
+        "task": "uploads.purge_sessions",
+        "schedule": float(settings.UPLOAD_SESSION_PURGE_INTERVAL)
+    }
+}
@@ -12,16 +12,117 @@ class Settings(BaseSettings):
     
     # OpenAI 설정
     OPENAI_API_KEY: str = ""  # 개발 환경용 더미 키
+    LLM_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_BASE_URL: str = ""  # OpenAI 호환 서버 주소 (예: fake_openai_server.py는 http://localhost:8002/v1)
+    LLM_TIMEOUT: float = 30.0  # 호출당 전체 타임아웃 (초)
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_MAX_CONCURRENCY: int = 8  # 프로세스당 동시 LLM 호출 수
+    LLM_MAX_CONNECTIONS: int = 16  # 공유 커넥션 풀 크기
+    LLM_MAX_RETRIES: int = 3  # 429/5xx/타임아웃 재시도 횟수
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_RETRY_MAX_DELAY: float = 8.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 시 서킷 차단
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0  # 차단 후 시험 호출까지 대기 시간
+    LLM_COMBINED_GENERATION: bool = True  # 상황 설명과 퀴즈를 JSON 모드 한 번의 호출로 생성 (실패 시 두 단계)
+    LLM_STREAMING: bool = True  # 응답을 스트리밍으로 받아 점진적으로 JSON 파싱
+    
+    # LLM 응답 캐시 설정
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 7 * 24 * 3600  # 7일
+    LLM_CACHE_MAX_ITEMS: int = 1024  # 인메모리 LRU 최대 항목 수
+    LLM_SEMANTIC_CACHE_ENABLED: bool = False  # 프롬프트 가변 부분(도로 요소 목록)의 임베딩 유사도로 응답 재사용 (text_embedder 사용)
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = 0.95  # 코사인 유사도 임계값
+    LLM_SEMANTIC_CACHE_MAX_ITEMS: int = 5000  # 파라미터 조합별 임베딩 인덱스 최대 크기
+    
+    # AI 모델 설정
+    IMAGE_MODEL_NAME: str = "microsoft/resnet-50"
+    FRAME_CLASSIFIER_BACKEND: str = "torch"  # torch | onnx | onnx-int8
+    ONNX_MODEL_DIR: str = "models"  # ONNX 변환 모델 저장 경로
+    FRAME_TAGGER: str = "classifier"  # classifier (ImageNet 분류) | clip (키워드 제로샷 태깅)
+    CLIP_IMAGE_MODEL: str = "openai/clip-vit-base-patch32"
+    CLIP_TEXT_MODEL: str = "sentence-transformers/clip-ViT-B-32-multilingual-v1"  # CLIP 이미지 인코더와 정렬된 다국어 텍스트 모델
+    CLIP_PROMPT_TEMPLATE: str = "도로 주행 영상 속 {}"
+    CLIP_TAG_THRESHOLD: float = 0.1  # 키워드 확률 임계값
+    
+    # 추론 서버 설정 (inference_server.py)
+    INFERENCE_SERVER_URL: str = ""  # 설정 시 모델을 직접 로드하지 않고 추론 서버 사용 (Unix 소켓이면 http://localhost)
+    INFERENCE_SERVER_UDS: str = ""  # Unix 소켓 경로 (비어 있으면 TCP)
+    INFERENCE_SERVER_TIMEOUT: float = 30.0
+    INFERENCE_SERVER_HOST: str = "127.0.0.1"
+    INFERENCE_SERVER_PORT: int = 8001
+    INFERENCE_MAX_BATCH_SIZE: int = 32
+    INFERENCE_MAX_WAIT_MS: float = 10.0  # 배치를 모으기 위해 기다리는 최대 시간
+    TEXT_EMBED_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    MODEL_WARMUP: str = "image_classifier,text_embedder"  # 서버 시작 시 미리 로드할 모델 (쉼표 구분)
+    MODEL_IDLE_TIMEOUT: int = 0  # 이 시간(초) 동안 사용하지 않은 모델은 메모리에서 내림 (0이면 비활성화)
     
     # Weaviate 설정
     WEAVIATE_URL: str = "http://localhost:8080"
+    WEAVIATE_VECTORIZER: str = "text2vec-transformers"  # text2vec-transformers | none (TEXT_EMBED_MODEL 벡터 직접 전달, migrate_weaviate_vectors.py 실행 후 사용)
     
     # Redis 설정
     REDIS_URL: str = "redis://localhost:6379"
     
+    # Celery 작업 설정 (app/celery.py, app/tasks.py)
+    JOB_TTL: int = 24 * 3600  # 작업 상태 보관 시간 (초)
+    SCHEDULER_INTERACTIVE_WEIGHT: int = 4  # 사용자 요청 : 일괄 작업 처리 비율
+    SCHEDULER_BULK_WEIGHT: int = 1
+    SCHEDULER_MAX_ACTIVE: int = 4  # 동시에 실행할 퀴즈 생성 체인 수 (보통 워커 동시성과 같게)
+    SCHEDULER_PROCESSING_TIMEOUT: int = 2 * 3600  # 이 시간 넘게 끝나지 않은 작업은 다시 큐에 넣음
+    SCHEDULER_REAP_INTERVAL: int = 300  # 멈춘 작업 확인 주기 (초, celery beat)
+    SCHEDULER_MAX_ATTEMPTS: int = 3  # 워커 장애로 다시 큐에 넣는 최대 횟수
+    SCHEDULER_INFLIGHT_TTL: int = 4 * 3600  # 같은 영상 처리 담당 표시 유지 시간 (PROCESSING_TIMEOUT보다 길게)
+    
+    # 카테고리별 퀴즈 재고 설정 (celery worker -B로 주기적 보충)
+    QUIZ_POOL_LOW_WATER: int = 20  # 재고가 이보다 적으면 보충
+    QUIZ_POOL_HIGH_WATER: int = 50  # 보충 목표 재고
+    QUIZ_POOL_BATCH_SIZE: int = 5  # LLM 호출 한 번에 생성할 퀴즈 수
+    QUIZ_POOL_REFILL_INTERVAL: int = 300  # 재고 확인 주기 (초)
+    QUIZ_POOL_DEDUP_WINDOW: int = 500  # 재고 추가 시 중복 확인할 카테고리별 최근 출제 퀴즈 수
+    
+    # 예비 퀴즈 설정 (LLM 장애 시 사용)
+    FALLBACK_QUIZ_PATH: str = "app/data/fallback_quizzes.json"
+    FALLBACK_QUIZ_HISTORY_TTL: int = 30 * 24 * 3600  # 사용자별 출제 순서 보관 시간 (초)
+    
     # 파일 업로드 설정
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
+    UPLOAD_SESSION_TTL: int = 24 * 3600  # 이어받기 업로드 세션 유효 시간 (초)
+    UPLOAD_SESSION_PURGE_INTERVAL: int = 3600  # 만료된 업로드 세션 정리 주기 (초, celery beat)
+    UPLOAD_CHUNK_MAX_SIZE: int = 16 * 1024 * 1024  # 이어받기 업로드 PUT 한 번의 최대 크기
+    
+    # 운영 서버 설정 (serve.py)
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 0  # 0이면 CPU 코어 수
+    WEB_TIMEOUT: int = 120
+    TORCH_THREADS_PER_WORKER: int = 0  # 0이면 CPU 코어 수 / 워커 수
+    TORCH_INTEROP_THREADS: int = 1
+    
+    # 영상 분석 설정
+    VIDEO_MAX_FRAMES: int = 10  # 영상당 분석할 최대 프레임 수
+    FRAME_BATCH_SIZE: int = 8  # 이미지 분류 모델 배치 크기
+    VIDEO_SCENE_THRESHOLD: float = 0.0  # 장면 변화 필터 임계값 (0이면 비활성화)
+    VIDEO_PIPELINE_ENABLED: bool = False  # 디코딩/추론 파이프라인 모드
+    VIDEO_PIPELINE_QUEUE_SIZE: int = 16  # 디코더 → 추론 단계 큐 크기
+    VIDEO_ANALYSIS_MODE: str = "frames"  # frames (키프레임 분류) | tracking (객체 검출 + 추적)
+    DETECTOR_MODEL: str = "facebook/detr-resnet-50"
+    DETECTION_THRESHOLD: float = 0.7
+    DETECTION_INTERVAL: int = 5  # 추적 모드: k번째 프레임마다 검출, 사이 프레임은 추적
+    TRACKING_FPS: float = 5.0  # 추적 모드 프레임 샘플링 속도
+    TRACKING_MAX_FRAMES: int = 150  # 영상 길이와 무관하게 추적할 최대 프레임 수
+    TRACKING_FRAME_WIDTH: int = 640  # 검출/추적 전에 축소할 프레임 너비
+    TRACKING_MIN_HITS: int = 2  # 검출 프레임에서 이 횟수 이상 잡힌 트랙만 도로 요소로 사용 (일회성 오검출 제거)
+    KEYFRAME_DIR: str = "uploads/keyframes"  # 재분석용 축소 키프레임 저장 경로
+    KEYFRAME_SHORT_EDGE: int = 256  # 저장할 키프레임의 짧은 변 길이
+    
+    # 분석 결과 캐시 설정
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_TTL: int = 7 * 24 * 3600  # 7일
+    ANALYSIS_CACHE_MAX_ITEMS: int = 256  # 인메모리 LRU 최대 항목 수
+    NEAR_DUP_MAX_DISTANCE: int = 7  # 키프레임 해시 해밍 거리 임계값 (64비트 중, 8 이상이면 구간당 2비트씩 조회해 검색이 크게 느려짐)
+    NEAR_DUP_MIN_MATCH_RATIO: float = 0.6  # 유사 영상으로 판단할 일치 키프레임 비율
+    NEAR_DUP_MAX_FINGERPRINTS: int = 30  # 영상당 지문 프레임 최대 수 (검색 시간이 영상 수 × 이 값에 비례)
+    NEAR_DUP_MAX_VIDEOS: int = 20000  # 유사 영상 인덱스에 유지할 최대 영상 수 (오래된 것부터 제거)
     
     class Config:
         env_file = ".env"
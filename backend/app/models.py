@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -75,4 +75,18 @@ class VideoAnalysis(Base):
     road_elements = Column(Text)  # JSON 형태로 저장
     description = Column(Text)
     category = Column(String(100))
-    created_at = Column(DateTime(timezone=True), server_default=func.now()) 
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class QuizPool(Base):
+    __tablename__ = "quiz_pool"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String(100))
+    question = Column(Text)
+    options = Column(Text)  # JSON 형태로 저장
+    correct_answer = Column(Integer)
+    explanation = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # 카테고리별 가장 오래된 재고를 인덱스만으로 찾도록 (category, id) 복합 인덱스
+    __table_args__ = (Index("ix_quiz_pool_category_id", "category", "id"),)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from app.models import User
+from app.routers.auth import get_current_user
+from app.services.video_pipeline import pipeline_metrics
+from app.services.model_registry import model_registry
+from app.services.job_scheduler import get_job_scheduler
+from app.services.llm_gateway import llm_gateway
+from app.services.llm_cache import llm_cache
+
+router = APIRouter()
+
+@router.get("/pipeline")
+def get_pipeline_metrics(current_user: User = Depends(get_current_user)):
+    """영상 분석 파이프라인 단계별 소요 시간 및 큐 깊이 조회"""
+    return pipeline_metrics.snapshot()
+
+@router.get("/models")
+def get_loaded_models(current_user: User = Depends(get_current_user)):
+    """현재 프로세스에 로드된 AI 모델 목록 조회"""
+    return {"loaded": model_registry.loaded_models()}
+
+@router.get("/scheduler")
+def get_scheduler_metrics(current_user: User = Depends(get_current_user)):
+    """퀴즈 생성 스케줄러의 요청 종류별 큐 깊이 및 대기 시간 조회"""
+    return get_job_scheduler().stats()
+
+@router.get("/llm")
+def get_llm_metrics(current_user: User = Depends(get_current_user)):
+    """LLM 게이트웨이 호출/재시도/실패 수, 서킷 상태, 응답 캐시 적중률/절약 토큰 조회"""
+    return dict(llm_gateway.snapshot(), cache=llm_cache.stats())
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
@@ -7,6 +9,13 @@ from app.database import get_db
 from app.models import Quiz, User, WrongAnswer
 from app.schemas import QuizCreate, QuizResponse, QuizAnswer
 from app.routers.auth import get_current_user
+from app.services.ai_service import AIService, TRAFFIC_KEYWORDS
+from app.services.job_store import job_store
+from app.services.job_events import job_event_stream
+from app.core.config import settings
+from app.services.quiz_service import claim_pool_quiz, count_pool_quizzes, save_default_quiz, quiz_to_dict
+from app.services.upload_service import stream_multipart_upload
+from app.tasks import start_quiz_job, request_pool_refill
 
 router = APIRouter()
 
@@ -87,33 +96,70 @@ def submit_answer(
         "explanation": quiz.explanation
     }
 
-@router.post("/generate")
-async def generate_ai_quiz(
-    video: UploadFile = File(...),
-    category: str = Form(...),
+@router.get("/pool/{category}")
+def get_pool_quiz(
+    category: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """AI 퀴즈 생성 (임시 구현)"""
-    # TODO: 실제 AI 모델 연동
-    # 현재는 임시 퀴즈 생성
+    """카테고리별 미리 생성된 퀴즈 하나 제공 (LLM 호출 없이 재고에서 바로 꺼냄)
+
+    재고는 Celery beat가 주기적으로 보충하며, 꺼낸 뒤 QUIZ_POOL_LOW_WATER 미만이면 즉시 보충을 요청한다.
+    비어 있으면 기본 퀴즈를 제공한다.
+    """
+    if category not in TRAFFIC_KEYWORDS:
+        raise HTTPException(status_code=400, detail="Invalid category")
     
-    # 임시 퀴즈 데이터
-    temp_quiz = {
-        "id": 999,
-        "question": "교차로에서 우회전할 때 가장 안전한 방법은?",
-        "options": [
-            "빨리 우회전하기",
-            "왼쪽을 확인하고 천천히 우회전하기",
-            "신호등만 보고 우회전하기", 
-            "다른 차량이 없으면 무시하고 우회전하기"
-        ],
-        "correct_answer": 1,
-        "explanation": "우회전 시에는 반드시 왼쪽을 확인하고 천천히 우회전해야 합니다. 특히 보행자와 자전거를 주의해야 합니다.",
-        "category": category
-    }
+    quiz = claim_pool_quiz(db, current_user.id, category)
+    if quiz is None or count_pool_quizzes(db, category) < settings.QUIZ_POOL_LOW_WATER:
+        request_pool_refill(category)
+    if quiz is None:
+        quiz = save_default_quiz(db, current_user.id, category, AIService().generate_default_quiz(category, current_user.id))
+    return quiz_to_dict(quiz)
+
+@router.post("/generate", status_code=202)
+async def generate_ai_quiz(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """AI 퀴즈 생성 작업 등록
+
+    업로드 영상(video 필드)은 UploadFile로 스풀링하지 않고 요청 본문을 청크 단위로
+    UPLOAD_DIR에 바로 저장하며, 저장하면서 해시 계산과 MAX_FILE_SIZE 검사를 한다.
+    분석/생성은 Celery 워커에서 실행되며 진행 상황은 /jobs/{job_id}로 조회한다.
+    """
+    # category가 잘못되면 영상을 UPLOAD_DIR에 남기지 않고 400 반환
+    upload = await stream_multipart_upload(
+        request, file_field="video",
+        field_validators={"category": lambda category: category in TRAFFIC_KEYWORDS}
+    )
+    category = upload.fields["category"]
     
-    return {
-        "quiz": temp_quiz,
-        "message": "AI 퀴즈가 생성되었습니다! (임시 데이터)"
-    } 
\ No newline at end of file
+    return await run_in_threadpool(start_quiz_job, db, current_user.id, upload.path, upload.sha256, category)
+
+@router.get("/jobs/{job_id}")
+def get_quiz_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """퀴즈 생성 작업 상태 및 단계별 진행도 조회"""
+    job = job_store.get(job_id)
+    if job is None or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/events")
+def stream_quiz_job_events(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """퀴즈 생성 진행 이벤트 스트림 (SSE: snapshot, stage, road_elements, description, quiz, done/error)"""
+    job = job_store.get(job_id)
+    if job is None or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        job_event_stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import User
+from app.schemas import UploadSessionCreate, UploadSessionResponse
+from app.routers.auth import get_current_user
+from app.services.ai_service import TRAFFIC_KEYWORDS
+from app.services.resumable_upload import upload_sessions, parse_content_range
+from app.tasks import start_quiz_job
+
+router = APIRouter()
+
+def session_response(session, offset: int) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=session["id"],
+        offset=offset,
+        size=session["size"],
+        expires_at=session["expires_at"]
+    )
+
+@router.post("/", response_model=UploadSessionResponse)
+def create_upload_session(
+    upload: UploadSessionCreate,
+    current_user: User = Depends(get_current_user)
+):
+    """이어받기 업로드 세션 생성"""
+    if upload.category not in TRAFFIC_KEYWORDS:
+        raise HTTPException(status_code=400, detail="Invalid category")
+
+    session = upload_sessions.create(current_user.id, upload.filename, upload.size, upload.category, upload.sha256)
+    return session_response(session, 0)
+
+@router.get("/{session_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """업로드 세션 조회 (끊긴 뒤 이어 보낼 오프셋 확인)"""
+    session = upload_sessions.get(session_id, current_user.id)
+    return session_response(session, upload_sessions.offset(session_id))
+
+@router.head("/{session_id}")
+def head_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """업로드 세션 오프셋을 Upload-Offset 헤더로 반환"""
+    session = upload_sessions.get(session_id, current_user.id)
+    return Response(headers={
+        "Upload-Offset": str(upload_sessions.offset(session_id)),
+        "Upload-Length": str(session["size"])
+    })
+
+@router.put("/{session_id}", response_model=UploadSessionResponse)
+async def upload_range(
+    session_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Content-Range 헤더로 지정한 바이트 구간 업로드 (현재 오프셋부터 순서대로)"""
+    session = upload_sessions.get(session_id, current_user.id)
+    start, end, total = parse_content_range(request.headers.get("content-range"))
+    offset = await upload_sessions.write_range(session, start, end, total, request.stream())
+    return session_response(session, offset)
+
+@router.post("/{session_id}/complete", status_code=202)
+async def complete_upload(
+    session_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """업로드 완료: 크기/체크섬 검증 후 퀴즈 생성 작업 등록"""
+    session = upload_sessions.get(session_id, current_user.id)
+    upload = await run_in_threadpool(upload_sessions.complete, session)
+
+    return await run_in_threadpool(
+        start_quiz_job, db, current_user.id, upload["path"], upload["sha256"], session["category"]
+    )
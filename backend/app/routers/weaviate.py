@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException
-from app.services.weaviate_client import get_weaviate_client, init_weaviate_schema
+from app.services.weaviate_client import (
+    get_weaviate_client, init_weaviate_schema, byo_vectors, embed_text, quiz_text, with_similarity
+)
 import weaviate
 import logging
 
@@ -31,19 +33,25 @@ async def initialize_weaviate():
         raise HTTPException(status_code=500, detail=f"Weaviate schema initialization error: {str(e)}")
 
 @router.post("/add-quiz")
-async def add_quiz_to_weaviate(quiz_data: dict):
-    """Weaviate에 퀴즈 벡터 추가"""
+def add_quiz_to_weaviate(quiz_data: dict):
+    """Weaviate에 퀴즈 벡터 추가 (임베딩 계산이 CPU를 쓰므로 스레드풀에서 실행되는 동기 핸들러)"""
     try:
         client = get_weaviate_client()
         if not client:
             raise HTTPException(status_code=503, detail="Weaviate is not available")
 
-        # 퀴즈 데이터 벡터화 및 저장
-        quiz_vector = client.data_object.create({
+        # 퀴즈 데이터 벡터화 및 저장 (vectorizer: none이면 임베딩을 직접 전달)
+        quiz = {
             "question": quiz_data.get("question", ""),
             "category": quiz_data.get("category", ""),
             "difficulty": quiz_data.get("difficulty", "")
-        }, "Quiz")
+        }
+        if quiz_data.get("options"):
+            quiz["options"] = quiz_data["options"]
+        quiz_vector = client.data_object.create(
+            quiz, "Quiz",
+            vector=embed_text(quiz_text(quiz)) if byo_vectors() else None
+        )
 
         return {"status": "success", "message": "Quiz added to Weaviate", "vector_id": quiz_vector}
     except Exception as e:
@@ -51,16 +59,15 @@ async def add_quiz_to_weaviate(quiz_data: dict):
         raise HTTPException(status_code=500, detail=f"Error adding quiz: {str(e)}")
 
 @router.get("/search-quiz")
-async def search_quiz_in_weaviate(query: str):
-    """Weaviate에서 퀴즈 검색"""
+def search_quiz_in_weaviate(query: str):
+    """Weaviate에서 퀴즈 검색 (임베딩 계산이 CPU를 쓰므로 스레드풀에서 실행되는 동기 핸들러)"""
     try:
         client = get_weaviate_client()
         if not client:
             raise HTTPException(status_code=503, detail="Weaviate is not available")
 
-        # 벡터 검색
-        result = client.query.get("Quiz", ["question", "category", "difficulty"]) \
-            .with_near_text({"concepts": [query]}) \
+        # 벡터 검색 (저장 시와 같은 벡터 공간)
+        result = with_similarity(client.query.get("Quiz", ["question", "category", "difficulty"]), query) \
             .with_limit(5) \
             .do()
 
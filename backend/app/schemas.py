@@ -125,6 +125,18 @@ class QuizResponse(BaseModel):
     quiz: Quiz
     analysis: Optional[VideoAnalysis] = None
 
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int
+    category: str
+    sha256: Optional[str] = None
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    offset: int
+    size: int
+    expires_at: float
+
 class QuizAnswer(BaseModel):
     selected_option: int
     
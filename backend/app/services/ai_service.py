@@ -1,77 +1,149 @@
 import cv2
 import numpy as np
 from PIL import Image
-import torch
-from transformers import pipeline
-import openai
-import json
-import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Callable
+from pydantic import ValidationError
 from app.core.config import settings
-import weaviate
-from sentence_transformers import SentenceTransformer
+from app.schemas import QuizCreate
+from app.services.frame_sampler import EvenlySpacedFrames, KeyframeSampler
+from app.services.video_pipeline import FramePipeline
+from app.services.analysis_cache import analysis_cache, hash_file
+from app.services.video_fingerprint import fingerprint_frames, near_duplicate_index
+from app.services.model_registry import model_registry
+from app.services.object_tracker import track_objects
+from app.services.keyframe_store import keyframe_store
+from app.services.llm_gateway import llm_gateway
+from app.services.json_stream import IncrementalJSONParser, extract_json_object
+from app.services.fallback_bank import fallback_bank
+from app.services.weaviate_client import byo_vectors, embed_text, quiz_text, with_similarity
+
+# 도로교통법 관련 키워드
+TRAFFIC_KEYWORDS = {
+    "신호 및 표지": ["신호등", "도로표지", "신호체계", "빨간불", "초록불", "노란불"],
+    "교차로 통과": ["교차로", "우회전", "좌회전", "직진", "보행자", "우선순위"],
+    "주차 및 정차": ["주차", "정차", "주차장", "주차금지", "출입구"],
+    "고속도로": ["고속도로", "진입", "진출", "속도제한", "차선변경"],
+    "특수상황": ["긴급차량", "장애인", "어린이", "보호구역", "학교"]
+}
+
+DEFAULT_DESCRIPTION = "도로 상황이 감지되었습니다. 안전 운전에 주의하세요."
 
 class AIService:
     def __init__(self):
-        """AI 서비스 초기화"""
-        self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-        
-        # Weaviate 클라이언트 초기화
-        self.weaviate_client = weaviate.Client(settings.WEAVIATE_URL)
-        
-        # 이미지 분석 모델
-        self.image_analyzer = pipeline("image-classification", model="microsoft/resnet-50")
-        
-        # 텍스트 임베딩 모델
-        self.text_embedder = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-        
+        """AI 서비스 초기화
+
+        모델과 외부 클라이언트는 model_registry에서 처음 사용할 때 로드되어
+        모든 인스턴스가 공유한다.
+        """
         # 도로교통법 관련 키워드
-        self.traffic_keywords = {
-            "신호 및 표지": ["신호등", "도로표지", "신호체계", "빨간불", "초록불", "노란불"],
-            "교차로 통과": ["교차로", "우회전", "좌회전", "직진", "보행자", "우선순위"],
-            "주차 및 정차": ["주차", "정차", "주차장", "주차금지", "출입구"],
-            "고속도로": ["고속도로", "진입", "진출", "속도제한", "차선변경"],
-            "특수상황": ["긴급차량", "장애인", "어린이", "보호구역", "학교"]
-        }
+        self.traffic_keywords = TRAFFIC_KEYWORDS
+    
+    @property
+    def weaviate_client(self):
+        return model_registry.get("weaviate_client")
+    
+    @property
+    def image_analyzer(self):
+        """이미지 분석 모델 (FRAME_CLASSIFIER_BACKEND에 따른 추론 백엔드)"""
+        return model_registry.get("image_classifier")
+    
+    @property
+    def frame_tagger(self):
+        """CLIP 제로샷 태거 (FRAME_TAGGER=clip일 때만 사용)"""
+        return model_registry.get("clip_tagger")
+    
+    @property
+    def text_embedder(self):
+        """텍스트 임베딩 모델"""
+        return model_registry.get("text_embedder")
+    
+    # ImageNet 라벨 중 도로 관련 요소로 간주할 키워드
+    ROAD_LABEL_KEYWORDS = ['car', 'road', 'traffic', 'signal', 'crossing', 'vehicle']
+    
+    def _extract_road_elements(self, results: List[Dict[str, Any]]) -> List[str]:
+        """분류 결과에서 도로 관련 요소 추출"""
+        road_elements = []
+        for result in results:
+            if any(keyword in result['label'].lower() for keyword in self.ROAD_LABEL_KEYWORDS):
+                road_elements.append(result['label'])
+        return road_elements
     
     def analyze_video_frame(self, frame: np.ndarray) -> List[str]:
         """비디오 프레임 분석"""
+        return self.analyze_video_frames([frame], batch_size=1)[0]
+    
+    def _use_clip(self) -> bool:
+        return settings.FRAME_TAGGER == "clip"
+    
+    def _prepare_frame(self, frame: np.ndarray) -> np.ndarray:
+        """디코딩된 BGR 버퍼를 바로 모델 입력 크기로 축소/crop"""
+        model = self.frame_tagger if self._use_clip() else self.image_analyzer
+        return model.preprocessor.prepare(frame)
+    
+    def _classify_prepared(self, crops: List[np.ndarray], batch_size: int) -> List[List[str]]:
+        """전처리된 프레임 배치를 분류하여 프레임별 도로 요소 반환"""
         try:
-            # 프레임을 PIL 이미지로 변환
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(frame_rgb)
-            
-            # 이미지 분석
-            results = self.image_analyzer(pil_image)
+            if self._use_clip():
+                # 카테고리 키워드가 바로 도로 요소가 됨
+                return self.frame_tagger.tag_frames(crops, batch_size=batch_size)
             
-            # 도로 관련 요소 추출
-            road_elements = []
-            for result in results:
-                if any(keyword in result['label'].lower() for keyword in ['car', 'road', 'traffic', 'signal', 'crossing', 'vehicle']):
-                    road_elements.append(result['label'])
-            
-            return road_elements
+            batch_results = self.image_analyzer.classify_frames(crops, batch_size=batch_size)
+            return [self._extract_road_elements(results) for results in batch_results]
         except Exception as e:
-            print(f"프레임 분석 오류: {e}")
+            print(f"배치 프레임 분석 오류: {e}")
+            return [[] for _ in crops]
+    
+    def analyze_video_frames(self, frames: List[np.ndarray], batch_size: Optional[int] = None) -> List[List[str]]:
+        """여러 프레임을 배치로 분석 (프레임별 도로 요소 반환)"""
+        if not frames:
             return []
+        
+        batch_size = batch_size or settings.FRAME_BATCH_SIZE
+        try:
+            # 전체 해상도 변환/PIL 복사 없이 축소 후 배치 텐서로 추론
+            crops = [self._prepare_frame(frame) for frame in frames]
+        except Exception as e:
+            print(f"배치 프레임 분석 오류: {e}")
+            return [[] for _ in frames]
+        
+        return self._classify_prepared(crops, batch_size)
     
-    def analyze_video_file(self, video_path: str) -> List[str]:
-        """비디오 파일 분석"""
+    def _analyze_pipelined(self, frames: Iterable[np.ndarray], batch_size: int) -> List[List[str]]:
+        """디코딩과 추론을 겹쳐 실행하는 스트리밍 파이프라인 모드"""
+        pipeline = FramePipeline(
+            preprocess=self._prepare_frame,
+            infer=lambda crops: self._classify_prepared(crops, batch_size),
+            batch_size=batch_size,
+            queue_size=settings.VIDEO_PIPELINE_QUEUE_SIZE
+        )
+        return pipeline.run(frames)
+    
+    def _analyze_sequential(self, frames: Iterable[np.ndarray], batch_size: int) -> List[List[str]]:
+        """키프레임을 배치 크기만큼 모아 순차적으로 추론"""
+        frame_elements = []
+        window = []
+        for frame in frames:
+            window.append(frame)
+            if len(window) == batch_size:
+                frame_elements.extend(self.analyze_video_frames(window, batch_size=batch_size))
+                window = []
+        
+        if window:
+            frame_elements.extend(self.analyze_video_frames(window, batch_size=batch_size))
+        return frame_elements
+    
+    def analyze_keyframes(self, frames: Iterable[np.ndarray], batch_size: Optional[int] = None) -> List[str]:
+        """키프레임 분석 (중복 제거된 도로 요소 반환)"""
+        batch_size = batch_size or settings.FRAME_BATCH_SIZE
         try:
-            cap = cv2.VideoCapture(video_path)
-            frames_analyzed = 0
-            all_elements = []
+            if settings.VIDEO_PIPELINE_ENABLED:
+                frame_elements = self._analyze_pipelined(frames, batch_size)
+            else:
+                frame_elements = self._analyze_sequential(frames, batch_size)
             
-            while cap.isOpened() and frames_analyzed < 10:  # 최대 10프레임 분석
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                elements = self.analyze_video_frame(frame)
+            all_elements = []
+            for elements in frame_elements:
                 all_elements.extend(elements)
-                frames_analyzed += 1
-            
-            cap.release()
             
             # 중복 제거
             unique_elements = list(set(all_elements))
@@ -81,141 +153,284 @@ class AIService:
             print(f"비디오 분석 오류: {e}")
             return []
     
+    # 추적 모드에서 도로 요소로 사용할 COCO 객체 라벨
+    ROAD_OBJECT_LABELS = {
+        "person", "bicycle", "car", "motorcycle", "bus", "truck",
+        "traffic light", "stop sign", "fire hydrant", "parking meter"
+    }
+    
+    @property
+    def object_detector(self):
+        """객체 검출 모델 (VIDEO_ANALYSIS_MODE=tracking일 때만 사용)"""
+        return model_registry.get("object_detector")
+    
+    def _detect_objects(self, frame: np.ndarray) -> List[Dict[str, Any]]:
+        """프레임에서 도로 관련 객체 검출"""
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        detections = []
+        for result in self.object_detector(image, threshold=settings.DETECTION_THRESHOLD):
+            if result["label"] in self.ROAD_OBJECT_LABELS:
+                box = result["box"]
+                detections.append({
+                    "label": result["label"],
+                    "score": result["score"],
+                    "box": (box["xmin"], box["ymin"], box["xmax"], box["ymax"])
+                })
+        return detections
+    
+    def analyze_video_tracks(self, video_path: str,
+                             keyframes: Optional[EvenlySpacedFrames] = None) -> List[Dict[str, Any]]:
+        """k번째 프레임마다 객체를 검출하고 사이 프레임은 추적하여 객체별 트랙 반환
+
+        keyframes를 넘기면 추적용으로 디코딩한 프레임에서 키프레임도 함께 고른다.
+        """
+        def frames():
+            for timestamp, frame in KeyframeSampler().iter_frames_at_rate(
+                video_path, settings.TRACKING_FPS, settings.TRACKING_MAX_FRAMES
+            ):
+                height, width = frame.shape[:2]
+                if width > settings.TRACKING_FRAME_WIDTH:
+                    scale = settings.TRACKING_FRAME_WIDTH / width
+                    frame = cv2.resize(frame, (settings.TRACKING_FRAME_WIDTH, round(height * scale)),
+                                       interpolation=cv2.INTER_AREA)
+                if keyframes is not None:
+                    keyframes.add(timestamp, frame)
+                yield timestamp, frame
+        
+        try:
+            tracks = track_objects(frames(), self._detect_objects, settings.DETECTION_INTERVAL,
+                                   min_hits=settings.TRACKING_MIN_HITS)
+            return [track.as_dict() for track in tracks]
+        except Exception as e:
+            print(f"객체 추적 오류: {e}")
+            return []
+    
+    def track_labels(self, tracks: List[Dict[str, Any]]) -> List[str]:
+        """시간순 객체 트랙을 도로 요소 문자열로 변환 (예: "traffic light (0.0s~3.2s)")"""
+        return [f"{track['label']} ({track['start']:.1f}s~{track['end']:.1f}s)" for track in tracks]
+    
+    def analyze_video_file(self, video_path: str, batch_size: Optional[int] = None) -> List[str]:
+        """비디오 파일 분석"""
+        if settings.VIDEO_ANALYSIS_MODE == "tracking":
+            return self.track_labels(self.analyze_video_tracks(video_path))
+        
+        # 영상 전체에서 균등 간격 키프레임 추출 후 분석
+        frames = (frame for _, frame in KeyframeSampler().iter_keyframes(video_path))
+        return self.analyze_keyframes(frames, batch_size=batch_size)
+    
+    def _description_messages(self, road_elements: List[str]) -> List[Dict[str, str]]:
+        # 순서/중복만 다른 목록이 같은 프롬프트(캐시 키)가 되도록 정렬
+        prompt = f"""
+        다음 도로 요소들이 감지되었습니다: {', '.join(sorted(set(road_elements)))}
+        
+        이 상황을 바탕으로 도로교통법에 관련된 상황 설명을 생성해주세요.
+        설명은 한국어로 작성하고, 도로교통법과 관련된 내용을 포함해야 합니다.
+        """
+        return [
+            {"role": "system", "content": "당신은 도로교통법 전문가입니다. 도로 상황을 분석하여 명확하고 교육적인 설명을 제공합니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _quiz_messages(self, description: str, category: str) -> List[Dict[str, str]]:
+        prompt = f"""
+        다음 도로 상황 설명을 바탕으로 도로교통법 퀴즈를 생성해주세요:
+        
+        상황: {description}
+        카테고리: {category}
+        
+        다음 형식으로 JSON 응답을 제공해주세요:
+        {{
+            "question": "퀴즈 질문",
+            "options": ["보기1", "보기2", "보기3", "보기4"],
+            "correct": 0,
+            "explanation": "정답 설명"
+        }}
+        
+        퀴즈는 도로교통법에 관련된 내용이어야 하며, 4개의 보기 중 하나의 정답이 있어야 합니다.
+        """
+        return [
+            {"role": "system", "content": "당신은 도로교통법 교육 전문가입니다. 명확하고 교육적인 퀴즈를 생성합니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
     def generate_scenario_description(self, road_elements: List[str]) -> str:
         """도로 상황 설명 생성"""
         try:
-            prompt = f"""
-            다음 도로 요소들이 감지되었습니다: {', '.join(road_elements)}
-            
-            이 상황을 바탕으로 도로교통법에 관련된 상황 설명을 생성해주세요.
-            설명은 한국어로 작성하고, 도로교통법과 관련된 내용을 포함해야 합니다.
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 도로교통법 전문가입니다. 도로 상황을 분석하여 명확하고 교육적인 설명을 제공합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
+            # 의미 캐시는 프롬프트 틀을 뺀 도로 요소 목록만 비교
+            return llm_gateway.chat(self._description_messages(road_elements), cache=True,
+                                    semantic=', '.join(sorted(set(road_elements))),
+                                    max_tokens=200, temperature=0.7)
         except Exception as e:
             print(f"상황 설명 생성 오류: {e}")
-            return "도로 상황이 감지되었습니다. 안전 운전에 주의하세요."
+            return DEFAULT_DESCRIPTION
     
-    def generate_quiz_from_description(self, description: str, category: str) -> Dict[str, Any]:
-        """설명을 바탕으로 퀴즈 생성"""
+    def _validated_quiz(self, data: Optional[Dict[str, Any]], category: str) -> Optional[Dict[str, Any]]:
+        """퀴즈 JSON 검증 (QuizCreate 스키마, 보기 4개, 정답 인덱스 범위)"""
+        if not isinstance(data, dict):
+            return None
         try:
-            prompt = f"""
-            다음 도로 상황 설명을 바탕으로 도로교통법 퀴즈를 생성해주세요:
-            
-            상황: {description}
-            카테고리: {category}
-            
-            다음 형식으로 JSON 응답을 제공해주세요:
-            {{
-                "question": "퀴즈 질문",
-                "options": ["보기1", "보기2", "보기3", "보기4"],
-                "correct": 0,
-                "explanation": "정답 설명"
-            }}
-            
-            퀴즈는 도로교통법에 관련된 내용이어야 하며, 4개의 보기 중 하나의 정답이 있어야 합니다.
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 도로교통법 교육 전문가입니다. 명확하고 교육적인 퀴즈를 생성합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.8
+            quiz = QuizCreate(
+                category=category,
+                question=data["question"],
+                options=data["options"],
+                correct_answer=data["correct"],
+                explanation=data["explanation"],
+                ai_generated=True
             )
-            
-            # JSON 응답 파싱
-            try:
-                quiz_data = json.loads(response.choices[0].message.content.strip())
-                return quiz_data
-            except json.JSONDecodeError:
-                return self.generate_default_quiz(category)
-                
+        except (KeyError, TypeError, ValidationError) as e:
+            print(f"퀴즈 응답 검증 실패: {e}")
+            return None
+        
+        if len(quiz.options) != 4 or not 0 <= quiz.correct_answer < 4:
+            print("퀴즈 응답 검증 실패: 보기/정답 형식 오류")
+            return None
+        return {
+            "question": quiz.question,
+            "options": quiz.options,
+            "correct": quiz.correct_answer,
+            "explanation": quiz.explanation
+        }
+    
+    def _stream_json(self, messages: List[Dict[str, str]], on_field: Optional[Callable[[str, Any], None]] = None,
+                     **kwargs) -> Optional[Dict[str, Any]]:
+        """스트리밍 응답을 받는 대로 파싱하며 완성된 최상위 필드를 on_field로 먼저 전달"""
+        parser = IncrementalJSONParser()
+        for chunk in llm_gateway.stream(messages, **kwargs):
+            for key, value in parser.feed(chunk):
+                if on_field is not None:
+                    on_field(key, value)
+        return parser.result()
+    
+    def generate_quiz_from_description(self, description: str, category: str,
+                                       on_field: Optional[Callable[[str, Any], None]] = None,
+                                       user_id: Optional[int] = None) -> Dict[str, Any]:
+        """설명을 바탕으로 퀴즈 생성 (LLM 장애/서킷 차단/형식 오류 시 예비 퀴즈)
+
+        LLM_STREAMING이면 토큰을 받는 대로 파싱해 질문 등 완성된 필드를 on_field로 먼저 알린다.
+        """
+        if llm_gateway.degraded:
+            return self.generate_default_quiz(category, user_id)
+        messages = self._quiz_messages(description, category)
+        try:
+            if settings.LLM_STREAMING:
+                data = self._stream_json(messages, on_field, max_tokens=300, temperature=0.8)
+            else:
+                data = extract_json_object(llm_gateway.chat(messages, max_tokens=300, temperature=0.8))
         except Exception as e:
             print(f"퀴즈 생성 오류: {e}")
-            return self.generate_default_quiz(category)
-    
-    def generate_default_quiz(self, category: str) -> Dict[str, Any]:
-        """기본 퀴즈 생성 (AI 실패 시)"""
-        default_quizzes = {
-            "신호 및 표지": {
-                "question": "빨간 신호등에서 우회전하려고 할 때, 다음 중 올바른 행동은?",
-                "options": [
-                    "보행자가 없으면 바로 우회전한다",
-                    "보행자가 있으면 보행자가 건너기를 기다린 후 우회전한다",
-                    "신호가 바뀔 때까지 기다린다",
-                    "경찰관의 지시를 받는다"
-                ],
-                "correct": 1,
-                "explanation": "빨간 신호에서 우회전할 때는 보행자가 있으면 보행자가 건너기를 기다린 후 우회전해야 합니다."
-            },
-            "교차로 통과": {
-                "question": "신호등이 없는 교차로에서 좌회전하려고 할 때, 다음 중 우선순위가 높은 것은?",
-                "options": [
-                    "직진하는 차량",
-                    "우회전하는 차량",
-                    "보행자",
-                    "자전거"
-                ],
-                "correct": 2,
-                "explanation": "교차로에서는 보행자가 가장 우선순위가 높습니다."
-            },
-            "주차 및 정차": {
-                "question": "다음 중 주차금지구역에 해당하지 않는 곳은?",
-                "options": [
-                    "교차로 모퉁이 5m 이내",
-                    "횡단보도 10m 이내",
-                    "버스정류장 10m 이내",
-                    "주차장 출입구 3m 이내"
-                ],
-                "correct": 3,
-                "explanation": "주차장 출입구는 3m 이내가 아닌 5m 이내가 주차금지구역입니다."
-            },
-            "고속도로": {
-                "question": "고속도로에서 긴급상황으로 정차해야 할 때, 다음 중 올바른 행동은?",
-                "options": [
-                    "가능한 한 도로 우측에 정차한다",
-                    "가능한 한 도로 좌측에 정차한다",
-                    "가능한 한 도로 중앙에 정차한다",
-                    "가능한 한 도로 밖으로 나간다"
-                ],
-                "correct": 0,
-                "explanation": "고속도로에서는 가능한 한 도로 우측에 정차해야 합니다."
-            },
-            "특수상황": {
-                "question": "어린이 보호구역에서 다음 중 올바른 운전 방법은?",
-                "options": [
-                    "시속 30km 이하로 주행한다",
-                    "시속 50km 이하로 주행한다",
-                    "시속 60km 이하로 주행한다",
-                    "시속 80km 이하로 주행한다"
-                ],
-                "correct": 0,
-                "explanation": "어린이 보호구역에서는 시속 30km 이하로 주행해야 합니다."
-            }
-        }
+            return self.generate_default_quiz(category, user_id)
+        return self._validated_quiz(data, category) or self.generate_default_quiz(category, user_id)
+    
+    def _combined_messages(self, road_elements: List[str], category: str) -> List[Dict[str, str]]:
+        # 상황 설명 프롬프트와 같이 순서/중복만 다른 목록은 같은 프롬프트가 되도록 정렬
+        prompt = f"""
+        다음 도로 요소들이 감지되었습니다: {', '.join(sorted(set(road_elements)))}
+        카테고리: {category}
+        
+        1. 이 상황을 바탕으로 도로교통법에 관련된 상황 설명을 한국어로 작성하고,
+        2. 그 설명을 바탕으로 4지선다 도로교통법 퀴즈를 생성해주세요.
+        
+        반드시 다음 형식의 JSON 객체 하나로만 응답해주세요:
+        {{
+            "description": "상황 설명",
+            "question": "퀴즈 질문",
+            "options": ["보기1", "보기2", "보기3", "보기4"],
+            "correct": 0,
+            "explanation": "정답 설명"
+        }}
+        """
+        return [
+            {"role": "system", "content": "당신은 도로교통법 교육 전문가입니다. 도로 상황을 설명하고 교육적인 퀴즈를 JSON으로 생성합니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _validated_combined(self, data: Optional[Dict[str, Any]], category: str) -> Optional[Dict[str, Any]]:
+        """설명+퀴즈 JSON 검증"""
+        quiz = self._validated_quiz(data, category)
+        description = str(data.get("description") or "").strip() if quiz else ""
+        if not description:
+            return None
+        return {"description": description, "quiz": quiz}
+    
+    def generate_description_and_quiz(self, road_elements: List[str], category: str,
+                                      on_field: Optional[Callable[[str, Any], None]] = None) -> Optional[Dict[str, Any]]:
+        """상황 설명과 퀴즈를 JSON 모드 한 번의 호출로 생성 (실패 시 None → 두 단계 생성)"""
+        if llm_gateway.degraded:
+            # 서킷 시험 호출은 설명 생성이 맡고, 퀴즈는 예비 퀴즈로 바로 대체
+            return None
+        messages = self._combined_messages(road_elements, category)
+        options = dict(max_tokens=500, temperature=0.7, response_format={"type": "json_object"})
+        try:
+            if settings.LLM_STREAMING:
+                data = self._stream_json(messages, on_field, **options)
+            else:
+                data = extract_json_object(llm_gateway.chat(messages, **options))
+        except Exception as e:
+            print(f"설명+퀴즈 생성 오류: {e}")
+            return None
+        return self._validated_combined(data, category)
+    
+    def _batch_messages(self, category: str, count: int) -> List[Dict[str, str]]:
+        prompt = f"""
+        카테고리: {category}
+        관련 도로 요소: {', '.join(self.traffic_keywords.get(category, []))}
+        
+        위 카테고리의 서로 다른 상황을 다루는 4지선다 도로교통법 퀴즈 {count}개를 생성해주세요.
+        질문이 서로 겹치지 않아야 합니다.
+        
+        반드시 다음 형식의 JSON 객체 하나로만 응답해주세요:
+        {{
+            "quizzes": [
+                {{
+                    "question": "퀴즈 질문",
+                    "options": ["보기1", "보기2", "보기3", "보기4"],
+                    "correct": 0,
+                    "explanation": "정답 설명"
+                }}
+            ]
+        }}
+        """
+        return [
+            {"role": "system", "content": "당신은 도로교통법 교육 전문가입니다. 명확하고 교육적인 퀴즈를 JSON으로 생성합니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def generate_quiz_batch(self, category: str, count: int) -> List[Dict[str, Any]]:
+        """퀴즈 재고 보충용: LLM 호출 한 번으로 카테고리 퀴즈 여러 개 생성 (검증을 통과한 것만 반환)
+
+        재고는 다양해야 하므로 응답 캐시를 쓰지 않는다. 실패 시 빈 목록.
+        """
+        try:
+            content = llm_gateway.chat(
+                self._batch_messages(category, count),
+                cache=False,
+                max_tokens=300 * count,
+                temperature=0.9,
+                response_format={"type": "json_object"}
+            )
+        except Exception as e:
+            print(f"퀴즈 일괄 생성 오류: {e}")
+            return []
         
-        return default_quizzes.get(category, default_quizzes["신호 및 표지"])
+        data = extract_json_object(content) or {}
+        items = data.get("quizzes")
+        if not isinstance(items, list):
+            print("퀴즈 일괄 생성 응답 형식 오류")
+            return []
+        quizzes = []
+        for item in items:
+            quiz = self._validated_quiz(item, category)
+            if quiz is not None:
+                quizzes.append(quiz)
+        return quizzes
+    
+    def generate_default_quiz(self, category: str, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """예비 퀴즈 (AI 실패 시, 사용자별로 한 바퀴 안에서 중복 없이 선택)"""
+        return fallback_bank.pick(category, user_id)
     
     def store_in_weaviate(self, quiz_data: Dict[str, Any], video_analysis: Dict[str, Any]):
-        """퀴즈 데이터를 Weaviate에 저장"""
+        """퀴즈 데이터를 Weaviate에 저장 (vectorizer: none이면 임베딩을 객체 벡터로 전달)"""
         try:
-            # 퀴즈 텍스트 임베딩 생성
-            quiz_text = f"{quiz_data['question']} {' '.join(quiz_data['options'])}"
-            embedding = self.text_embedder.encode(quiz_text)
-            
             # Weaviate에 데이터 저장
             data_object = {
                 "question": quiz_data["question"],
@@ -224,30 +439,27 @@ class AIService:
                 "explanation": quiz_data["explanation"],
                 "category": video_analysis["category"],
                 "road_elements": video_analysis["road_elements"],
-                "description": video_analysis["description"],
-                "embedding": embedding.tolist()
+                "description": video_analysis["description"]
             }
             
             self.weaviate_client.data_object.create(
                 data_object=data_object,
-                class_name="Quiz"
+                class_name="Quiz",
+                vector=embed_text(quiz_text(quiz_data)) if byo_vectors() else None
             )
             
         except Exception as e:
             print(f"Weaviate 저장 오류: {e}")
     
     def search_similar_quizzes(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """유사한 퀴즈 검색"""
+        """유사한 퀴즈 검색 (저장 시와 같은 벡터 공간에서 검색)"""
         try:
-            # 쿼리 임베딩 생성
-            query_embedding = self.text_embedder.encode(query)
-            
-            # Weaviate에서 유사한 퀴즈 검색
-            result = self.weaviate_client.query.get("Quiz", [
-                "question", "options", "correct_answer", "explanation", "category"
-            ]).with_near_vector({
-                "vector": query_embedding.tolist()
-            }).with_limit(limit).do()
+            result = with_similarity(
+                self.weaviate_client.query.get("Quiz", [
+                    "question", "options", "correct_answer", "explanation", "category"
+                ]),
+                query
+            ).with_limit(limit).do()
             
             return result["data"]["Get"]["Quiz"]
             
@@ -255,29 +467,129 @@ class AIService:
             print(f"유사 퀴즈 검색 오류: {e}")
             return []
     
-    def create_quiz_from_video(self, video_path: str, category: str) -> Dict[str, Any]:
-        """비디오에서 퀴즈 생성"""
-        # 1. 비디오 분석
-        road_elements = self.analyze_video_file(video_path)
+    def find_near_duplicate_analysis(self, content_hash: str, frame_hashes: List[Optional[int]]) -> Optional[Dict[str, Any]]:
+        """재인코딩/잘린 유사 영상의 분석 결과 조회"""
+        # 키프레임 perceptual hash로 유사 영상 검색
+        match = near_duplicate_index.find(frame_hashes, exclude=content_hash)
+        if match is None:
+            return None
+        
+        cached = analysis_cache.get(match)
+        if cached is None:
+            return None
+        
+        # 다음 업로드는 바로 캐시에서 찾도록 등록
+        analysis_cache.set(content_hash, cached["road_elements"], cached["description"])
+        near_duplicate_index.add(content_hash, frame_hashes)
+        return dict(cached, near_duplicate_of=match)
+    
+    def analyze_video_stage(self, video_path: str, content_hash: Optional[str] = None,
+                            analysis_id: Optional[int] = None) -> Dict[str, Any]:
+        """1단계: 영상 분석 (analysis_id가 있으면 캐시 적중 여부와 관계없이 재분석용 키프레임을 연결)
+
+        결과는 JSON으로 직렬화 가능한 dict이며 다음 단계(describe_stage)의 입력이 된다.
+        """
+        content_hash = content_hash or hash_file(video_path)
+        result = {
+            "video_path": video_path,
+            "content_hash": content_hash,
+            "frame_hashes": [],
+            "cache_hit": False,
+            "near_duplicate_of": None
+        }
+        
+        # 동일/유사 영상의 분석 결과가 캐시에 있으면 추론 생략
+        cached = analysis_cache.get(content_hash)
+        sampled = []
+        tracks = None
+        if cached is None and settings.VIDEO_ANALYSIS_MODE == "tracking":
+            # 추적용으로 디코딩한 프레임에서 키프레임도 골라 영상을 한 번만 디코딩
+            collector = EvenlySpacedFrames(settings.VIDEO_MAX_FRAMES)
+            tracks = self.analyze_video_tracks(video_path, collector)
+            sampled = collector.frames()
+        elif cached is None or (analysis_id is not None and not keyframe_store.exists(content_hash)):
+            # 정확한 캐시 적중이면 같은 내용의 키프레임이 이미 있으므로 추출하지 않고 연결만 한다
+            sampled = KeyframeSampler().sample(video_path)
+        
+        if cached is None:
+            # 분석용으로 디코딩한 키프레임의 해시로 유사 영상 검색 (지문용으로 영상을 다시 디코딩하지 않음)
+            result["frame_hashes"] = fingerprint_frames([frame for _, frame in sampled])
+            cached = self.find_near_duplicate_analysis(content_hash, result["frame_hashes"])
+        if cached is None and tracks is not None:
+            result["road_elements"] = self.track_labels(tracks)
+        
+        keyframes = [frame for _, frame in sampled]
+        if analysis_id is not None:
+            # 재분석(reprocess_videos.py)용 키프레임은 내용 해시별로 한 벌만 저장하고 분석 행은 연결
+            if keyframes:
+                keyframe_store.save(content_hash, keyframes, [timestamp for timestamp, _ in sampled])
+            keyframe_store.link(analysis_id, content_hash)
+        
+        if cached is not None:
+            result.update(
+                road_elements=cached["road_elements"],
+                description=cached["description"],
+                cache_hit=True,
+                near_duplicate_of=cached.get("near_duplicate_of")
+            )
+        elif "road_elements" not in result:
+            result["road_elements"] = self.analyze_keyframes(keyframes)
+        return result
+    
+    def describe_stage(self, analysis: Dict[str, Any], category: Optional[str] = None,
+                       on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """2단계: 상황 설명 생성 후 분석 결과 캐시에 등록 (캐시 적중 시 생략)
+
+        LLM_COMBINED_GENERATION이면 category의 퀴즈까지 한 번에 생성해 "quiz"에 담는다.
+        """
+        if analysis["cache_hit"]:
+            return analysis
+        
+        combined = None
+        if settings.LLM_COMBINED_GENERATION and category:
+            combined = self.generate_description_and_quiz(analysis["road_elements"], category, on_field)
+        if combined is not None:
+            description = combined["description"]
+            analysis = dict(analysis, quiz=combined["quiz"])
+        else:
+            description = self.generate_scenario_description(analysis["road_elements"])
         
-        # 2. 상황 설명 생성
-        description = self.generate_scenario_description(road_elements)
+        analysis_cache.set(analysis["content_hash"], analysis["road_elements"], description)
+        near_duplicate_index.add(analysis["content_hash"], analysis["frame_hashes"])
+        return dict(analysis, description=description)
+    
+    def quiz_stage(self, analysis: Dict[str, Any], category: str,
+                   on_field: Optional[Callable[[str, Any], None]] = None,
+                   user_id: Optional[int] = None) -> Dict[str, Any]:
+        """3단계: 퀴즈 생성 (설명과 함께 생성된 퀴즈가 있으면 그대로 사용)"""
+        if analysis.get("quiz") is not None:
+            return analysis["quiz"]
+        return self.generate_quiz_from_description(analysis["description"], category, on_field, user_id)
+    
+    def create_quiz_from_video(self, video_path: str, category: str, content_hash: Optional[str] = None,
+                               analysis_id: Optional[int] = None) -> Dict[str, Any]:
+        """비디오에서 퀴즈 생성 (단계별 작업을 한 번에 실행)"""
+        # 1. 비디오 분석 / 2. 상황 설명 생성
+        analysis = self.describe_stage(self.analyze_video_stage(video_path, content_hash, analysis_id), category)
         
         # 3. 퀴즈 생성
-        quiz = self.generate_quiz_from_description(description, category)
+        quiz = self.quiz_stage(analysis, category)
         
         # 4. Weaviate에 저장
         video_analysis = {
-            "road_elements": road_elements,
-            "description": description,
+            "road_elements": analysis["road_elements"],
+            "description": analysis["description"],
             "category": category
         }
         self.store_in_weaviate(quiz, video_analysis)
         
         return {
             "video_path": video_path,
-            "road_elements": road_elements,
-            "description": description,
+            "content_hash": analysis["content_hash"],
+            "road_elements": analysis["road_elements"],
+            "description": analysis["description"],
             "quiz": quiz,
-            "category": category
+            "category": category,
+            "cache_hit": analysis["cache_hit"],
+            "near_duplicate_of": analysis["near_duplicate_of"]
         } 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache import TieredCache
+
+# 분석 로직이 바뀌면 올려서 기존 캐시를 무효화
+ANALYSIS_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """파일 내용을 스트리밍으로 읽어 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def analysis_fingerprint() -> str:
+    """분석 결과에 영향을 주는 모델/설정 식별자"""
+    parts = [
+        f"v{ANALYSIS_VERSION}",
+        settings.IMAGE_MODEL_NAME,
+        settings.FRAME_CLASSIFIER_BACKEND,
+        settings.FRAME_TAGGER,
+        settings.VIDEO_ANALYSIS_MODE,
+        settings.LLM_MODEL,
+        f"frames={settings.VIDEO_MAX_FRAMES}",
+        f"scene={settings.VIDEO_SCENE_THRESHOLD}",
+    ]
+    # 사용 중인 태거/분석 모드의 설정만 포함 (쓰지 않는 설정을 바꿔도 캐시가 무효화되지 않도록)
+    if settings.FRAME_TAGGER == "clip":
+        parts += [
+            settings.CLIP_IMAGE_MODEL,
+            settings.CLIP_TEXT_MODEL,
+            settings.CLIP_PROMPT_TEMPLATE,
+            f"clip_threshold={settings.CLIP_TAG_THRESHOLD}",
+        ]
+    if settings.VIDEO_ANALYSIS_MODE == "tracking":
+        parts += [
+            settings.DETECTOR_MODEL,
+            f"detection={settings.DETECTION_THRESHOLD}/{settings.DETECTION_INTERVAL}",
+            f"tracking={settings.TRACKING_FPS}/{settings.TRACKING_MAX_FRAMES}/{settings.TRACKING_FRAME_WIDTH}"
+            f"/{settings.TRACKING_MIN_HITS}",
+        ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+class AnalysisCache:
+    """영상 내용 해시 기반 분석 결과(road_elements, 상황 설명) 캐시"""
+
+    def __init__(self):
+        self.cache = TieredCache(
+            namespace="analysis",
+            ttl=settings.ANALYSIS_CACHE_TTL,
+            max_items=settings.ANALYSIS_CACHE_MAX_ITEMS
+        )
+
+    def _key(self, content_hash: str) -> str:
+        return f"{analysis_fingerprint()}:{content_hash}"
+
+    def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return None
+        return self.cache.get(self._key(content_hash))
+
+    def set(self, content_hash: str, road_elements: list, description: str):
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return
+        self.cache.set(self._key(content_hash), {
+            "road_elements": road_elements,
+            "description": description
+        })
+
+
+analysis_cache = AnalysisCache()
@@ -0,0 +1,109 @@
+import json
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def get_redis_client() -> redis.Redis:
+    """프로세스 공용 Redis 클라이언트"""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+class LRUCache:
+    """항목 수 제한과 TTL을 갖는 스레드 안전 인메모리 LRU 캐시"""
+
+    def __init__(self, max_items: int, ttl: Optional[float] = None):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class TieredCache:
+    """인메모리 LRU를 앞단에 둔 Redis JSON 캐시
+
+    Redis 장애 시에는 인메모리 캐시만으로 동작한다.
+    """
+
+    def __init__(self, namespace: str, ttl: int, max_items: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = LRUCache(max_items=max_items, ttl=ttl)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        try:
+            raw = get_redis_client().get(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache read failed: {str(e)}")
+            return None
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any):
+        self.local.set(key, value)
+        try:
+            get_redis_client().setex(self._redis_key(key), self.ttl, json.dumps(value, ensure_ascii=False))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache write failed: {str(e)}")
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        try:
+            get_redis_client().delete(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache delete failed: {str(e)}")
@@ -0,0 +1,71 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.frame_preprocess import FramePreprocessor
+
+logger = logging.getLogger(__name__)
+
+
+class ClipFrameTagger:
+    """CLIP 제로샷 도로 요소 태깅
+
+    카테고리 키워드의 텍스트 임베딩은 생성 시 한 번만 계산해 (K, D) 행렬로 보관하고,
+    프레임 배치의 이미지 임베딩 (N, D)과 한 번의 행렬곱으로 점수를 매긴다.
+    텍스트는 CLIP 이미지 인코더와 정렬된 다국어 모델로 인코딩하여 한국어 키워드를 그대로 쓴다.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]], image_model: Optional[str] = None,
+                 text_model: Optional[str] = None, prompt_template: Optional[str] = None):
+        import torch
+        from transformers import CLIPModel
+        from sentence_transformers import SentenceTransformer
+
+        image_model = image_model or settings.CLIP_IMAGE_MODEL
+        text_model = text_model or settings.CLIP_TEXT_MODEL
+        prompt_template = prompt_template or settings.CLIP_PROMPT_TEMPLATE
+
+        self.torch = torch
+        self.model = CLIPModel.from_pretrained(image_model).eval()
+        self.preprocessor = FramePreprocessor.from_pretrained(image_model)
+        self.logit_scale = float(self.model.logit_scale.exp())
+
+        # 여러 카테고리에 속한 키워드는 한 번만 인코딩
+        self.labels = list(dict.fromkeys(keyword for words in keywords.values() for keyword in words))
+
+        text_encoder = SentenceTransformer(text_model)
+        prompts = [prompt_template.format(label) for label in self.labels]
+        # (D, K) 전치 행렬로 보관하여 추론 시 복사 없이 matmul
+        self.label_matrix = np.ascontiguousarray(
+            text_encoder.encode(prompts, convert_to_numpy=True, normalize_embeddings=True).T.astype(np.float32)
+        )
+        logger.info(f"Precomputed CLIP embeddings for {len(self.labels)} keywords")
+
+    def embed_frames(self, crops: List[np.ndarray], batch_size: int) -> np.ndarray:
+        """전처리된 프레임의 정규화된 이미지 임베딩 (N, D)"""
+        embeddings = []
+        for start in range(0, len(crops), batch_size):
+            pixel_values = self.preprocessor.to_tensor_batch(crops[start:start + batch_size])
+            with self.torch.inference_mode():
+                features = self.model.get_image_features(pixel_values=self.torch.from_numpy(pixel_values))
+            embeddings.append(features.numpy())
+        embeddings = np.concatenate(embeddings)
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def score_frames(self, crops: List[np.ndarray], batch_size: int) -> np.ndarray:
+        """프레임별 키워드 확률 (N, K)"""
+        logits = self.embed_frames(crops, batch_size) @ self.label_matrix * self.logit_scale
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def tag_frames(self, crops: List[np.ndarray], batch_size: int,
+                   threshold: Optional[float] = None) -> List[List[str]]:
+        """임계값 이상인 키워드를 프레임별 도로 요소로 반환"""
+        if not crops:
+            return []
+        threshold = settings.CLIP_TAG_THRESHOLD if threshold is None else threshold
+        probs = self.score_frames(crops, batch_size)
+        return [[self.labels[k] for k in np.flatnonzero(row >= threshold)] for row in probs]
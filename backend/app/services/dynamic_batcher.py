@@ -0,0 +1,90 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """동시 요청을 모아 한 번에 처리하는 비동기 배처
+
+    첫 요청이 도착하면 max_batch_size개가 모이거나 max_wait_ms가 지날 때까지
+    기다렸다가 process_fn을 한 번 호출한다. 모델은 전용 스레드 하나에서만 실행된다.
+    """
+
+    def __init__(self, name: str, process_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int, max_wait_ms: float):
+        self.name = name
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batcher-{name}")
+        self.batches = 0
+        self.items = 0
+        self.process_time = 0.0
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, item: Any) -> Any:
+        """항목 하나를 배치에 넣고 결과를 기다림"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self.process_fn, items)
+            except Exception as e:
+                logger.error(f"Batch '{self.name}' failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.process_time += time.perf_counter() - started
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "avg_batch_time": round(self.process_time / self.batches, 4) if self.batches else 0.0,
+        }
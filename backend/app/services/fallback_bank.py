@@ -0,0 +1,81 @@
+import hashlib
+import json
+import math
+import random
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from app.core.config import settings
+from app.services.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = "신호 및 표지"
+
+
+class FallbackQuizBank:
+    """LLM 장애 시 사용하는 검수된 예비 퀴즈 (카테고리별 목록, 프로세스당 한 번 로드)
+
+    사용자별로는 Redis 카운터 i를 (a·i + b) mod n 순열로 바꿔 O(1)로 고르므로, 한 바퀴(n문제)를
+    다 풀기 전에는 같은 문제가 다시 나오지 않는다. 바퀴마다 a, b를 새로 정해 순서도 바뀐다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._quizzes: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        # 카테고리별 n과 서로소인 곱셈 계수 후보 (순열 생성용)
+        self._multipliers: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._quizzes is None:
+            with self._lock:
+                if self._quizzes is None:
+                    with open(self.path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    for category, quizzes in data.items():
+                        n = len(quizzes)
+                        self._multipliers[category] = [a for a in range(1, n) if math.gcd(a, n) == 1] or [1]
+                    self._quizzes = data
+                    logger.info(f"Loaded fallback quiz bank: { {c: len(q) for c, q in data.items()} }")
+        return self._quizzes
+
+    def _permuted_index(self, user_id: int, category: str, counter: int) -> int:
+        n = len(self._quizzes[category])
+        cycle, position = divmod(counter, n)
+        seed = int.from_bytes(hashlib.sha256(f"{user_id}:{category}:{cycle}".encode()).digest()[:8], "big")
+        multipliers = self._multipliers[category]
+        a = multipliers[seed % len(multipliers)]
+        b = (seed >> 32) % n
+        return (a * position + b) % n
+
+    def _next_counter(self, user_id: int, category: str) -> Optional[int]:
+        key = f"fallback_quiz:{user_id}:{category}"
+        try:
+            pipe = get_redis_client().pipeline()
+            pipe.incr(key)
+            pipe.expire(key, settings.FALLBACK_QUIZ_HISTORY_TTL)
+            return pipe.execute()[0] - 1
+        except redis.RedisError as e:
+            logger.warning(f"Fallback quiz history unavailable: {str(e)}")
+            return None
+
+    def pick(self, category: str, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """카테고리 예비 퀴즈 하나 반환 (user_id가 있으면 한 바퀴 안에서 중복 없이)"""
+        quizzes = self.load()
+        if category not in quizzes:
+            category = DEFAULT_CATEGORY
+        items = quizzes[category]
+
+        counter = self._next_counter(user_id, category) if user_id is not None else None
+        if counter is None:
+            index = random.randrange(len(items))
+        else:
+            index = self._permuted_index(user_id, category, counter)
+        return dict(items[index])
+
+
+fallback_bank = FallbackQuizBank(settings.FALLBACK_QUIZ_PATH)
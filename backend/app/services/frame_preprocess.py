@@ -0,0 +1,75 @@
+import threading
+from typing import List, Sequence
+
+import cv2
+import numpy as np
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class FramePreprocessor:
+    """PIL을 거치지 않는 프레임 전처리
+
+    디코딩된 BGR 버퍼를 OpenCV로 먼저 축소한 뒤 중앙을 잘라내고(prepare),
+    미리 할당한 float32 배치 버퍼에 RGB 순서로 정규화하여 채운다(to_tensor_batch).
+    1080p 프레임 전체를 변환/복사하는 과정이 없다.
+    """
+
+    def __init__(self, crop_size: int = 224, resize_short_edge: int = 256,
+                 mean: Sequence[float] = IMAGENET_MEAN, std: Sequence[float] = IMAGENET_STD):
+        self.crop_size = crop_size
+        self.resize_short_edge = resize_short_edge
+        std = np.asarray(std, dtype=np.float32)
+        # (x / 255 - mean) / std = x * scale - offset
+        self.scale = 1.0 / (255.0 * std)
+        self.offset = np.asarray(mean, dtype=np.float32) / std
+        self._buffers = threading.local()
+
+    @classmethod
+    def from_pretrained(cls, model_name: str) -> "FramePreprocessor":
+        """HF 이미지 프로세서 설정(크기, crop 비율, 정규화 값)으로 생성"""
+        from transformers import AutoImageProcessor
+
+        processor = AutoImageProcessor.from_pretrained(model_name)
+        size = processor.size
+        edge = size.get("shortest_edge") or size.get("height")
+        crop_size = getattr(processor, "crop_size", None)
+        if crop_size:
+            # CLIP 계열: 짧은 변을 edge로 맞춘 뒤 crop_size만큼 자름
+            crop, short = crop_size["height"], edge
+        else:
+            # ResNet/ConvNext 계열: edge / crop_pct로 맞춘 뒤 edge만큼 자름
+            crop, short = edge, int(edge / getattr(processor, "crop_pct", 0.875))
+        return cls(crop, short, processor.image_mean, processor.image_std)
+
+    def prepare(self, frame: np.ndarray) -> np.ndarray:
+        """BGR 프레임을 축소 후 중앙 crop (crop_size x crop_size x 3, uint8, BGR)"""
+        height, width = frame.shape[:2]
+        scale = self.resize_short_edge / min(height, width)
+        resized_w, resized_h = max(round(width * scale), self.crop_size), max(round(height * scale), self.crop_size)
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        resized = cv2.resize(frame, (resized_w, resized_h), interpolation=interpolation)
+
+        top = (resized_h - self.crop_size) // 2
+        left = (resized_w - self.crop_size) // 2
+        return np.ascontiguousarray(resized[top:top + self.crop_size, left:left + self.crop_size])
+
+    def _buffer(self, batch_size: int) -> np.ndarray:
+        """스레드별로 재사용하는 (N, 3, H, W) float32 버퍼"""
+        buffer = getattr(self._buffers, "array", None)
+        if buffer is None or buffer.shape[0] < batch_size:
+            buffer = np.empty((batch_size, 3, self.crop_size, self.crop_size), dtype=np.float32)
+            self._buffers.array = buffer
+        return buffer[:batch_size]
+
+    def to_tensor_batch(self, crops: List[np.ndarray]) -> np.ndarray:
+        """prepare() 결과를 정규화된 NCHW RGB 배치로 변환 (버퍼는 다음 호출 때 재사용됨)"""
+        batch = self._buffer(len(crops))
+        for index, crop in enumerate(crops):
+            for channel in range(3):
+                # BGR → RGB 변환을 채널 인덱스로 처리하여 별도 복사 없음
+                out = batch[index, channel]
+                np.multiply(crop[:, :, 2 - channel], self.scale[channel], out=out, casting="unsafe")
+                out -= self.offset[channel]
+        return batch
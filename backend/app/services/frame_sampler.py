@@ -0,0 +1,156 @@
+import cv2
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+# 장면 변화 점수 계산용 축소 크기 / 히스토그램 구간 수
+SIGNATURE_SIZE = (32, 32)
+HISTOGRAM_BINS = 32
+
+
+def frame_signature(frame: np.ndarray) -> np.ndarray:
+    """장면 비교용 축소 흑백 히스토그램 생성"""
+    small = cv2.resize(frame, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    hist = cv2.calcHist([gray], [0], None, [HISTOGRAM_BINS], [0, 256])
+    return cv2.normalize(hist, hist).flatten()
+
+
+def scene_change_score(prev_signature: np.ndarray, signature: np.ndarray) -> float:
+    """두 프레임 간 장면 변화 점수 (0: 동일, 1: 완전히 다름)"""
+    return float(cv2.compareHist(prev_signature, signature, cv2.HISTCMP_BHATTACHARYYA))
+
+
+class EvenlySpacedFrames:
+    """길이를 모르는 프레임 스트림에서 고르게 떨어진 프레임을 골라 보관 (최대 2·count개)
+
+    보관 수가 2·count를 넘으면 하나 건너 하나씩 버리고 간격을 두 배로 늘린다.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.stride = 1
+        self.index = 0
+        self.kept: List[Tuple[float, np.ndarray]] = []
+
+    def add(self, timestamp: float, frame: np.ndarray):
+        if self.index % self.stride == 0:
+            self.kept.append((timestamp, frame))
+            if len(self.kept) > 2 * self.count:
+                self.kept = self.kept[::2]
+                self.stride *= 2
+        self.index += 1
+
+    def frames(self) -> List[Tuple[float, np.ndarray]]:
+        """보관한 프레임 중 균등 간격 구간의 중앙 프레임 count개 반환"""
+        if len(self.kept) <= self.count:
+            return list(self.kept)
+        step = len(self.kept) / self.count
+        return [self.kept[int(step * (i + 0.5))] for i in range(self.count)]
+
+
+class KeyframeSampler:
+    """영상 전체 구간에서 균등한 시점의 키프레임 추출"""
+
+    def __init__(self, num_frames: Optional[int] = None, scene_threshold: Optional[float] = None):
+        self.num_frames = num_frames or settings.VIDEO_MAX_FRAMES
+        # 0이면 장면 변화 필터링 비활성화
+        self.scene_threshold = settings.VIDEO_SCENE_THRESHOLD if scene_threshold is None else scene_threshold
+
+    def _target_indices(self, frame_count: int) -> List[int]:
+        """균등 간격 구간의 중앙 프레임 인덱스 계산"""
+        count = min(self.num_frames, frame_count)
+        step = frame_count / count
+        return sorted({int(step * (i + 0.5)) for i in range(count)})
+
+    def _iter_sequential(self, cap: cv2.VideoCapture, fps: float) -> Iterator[Tuple[float, np.ndarray]]:
+        """프레임 수를 알 수 없는 스트림은 앞에서부터 순차 디코딩"""
+        index = 0
+        while index < self.num_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield index / fps, frame
+            index += 1
+
+    def _iter_seek(self, cap: cv2.VideoCapture, fps: float, frame_count: int) -> Iterator[Tuple[float, np.ndarray]]:
+        """목표 시점으로 탐색하여 해당 프레임만 디코딩"""
+        # 이 간격보다 가까우면 seek 대신 grab()으로 건너뜀
+        max_skip = max(int(fps), 1)
+        position = 0
+        for target in self._target_indices(frame_count):
+            if 0 <= target - position <= max_skip:
+                while position < target:
+                    if not cap.grab():
+                        return
+                    position += 1
+            else:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+
+            ret, frame = cap.read()
+            if not ret:
+                return
+            position += 1
+            yield target / fps, frame
+
+    def iter_keyframes(self, video_path: str) -> Iterator[Tuple[float, np.ndarray]]:
+        """(타임스탬프(초), BGR 프레임) 순으로 키프레임 생성"""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                return
+
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if frame_count > 0:
+                frames = self._iter_seek(cap, fps, frame_count)
+            else:
+                frames = self._iter_sequential(cap, fps)
+
+            prev_signature = None
+            for timestamp, frame in frames:
+                if self.scene_threshold > 0:
+                    # 직전 키프레임과 거의 같은 장면이면 분류하지 않음
+                    signature = frame_signature(frame)
+                    if prev_signature is not None and scene_change_score(prev_signature, signature) < self.scene_threshold:
+                        continue
+                    prev_signature = signature
+                yield timestamp, frame
+        finally:
+            cap.release()
+
+    def iter_frames_at_rate(self, video_path: str, target_fps: float,
+                            max_frames: int) -> Iterator[Tuple[float, np.ndarray]]:
+        """일정 간격 연속 프레임 생성 (객체 추적용)
+
+        영상이 길면 간격을 넓혀 전체 프레임 수를 max_frames 이하로 유지한다.
+        건너뛰는 프레임은 grab()만 하고 retrieve()하지 않는다.
+        """
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                return
+
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            step = max(1, round(fps / target_fps))
+            if frame_count > 0:
+                step = max(step, -(-frame_count // max_frames))
+
+            index = 0
+            emitted = 0
+            while emitted < max_frames and cap.grab():
+                if index % step == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    yield index / fps, frame
+                    emitted += 1
+                index += 1
+        finally:
+            cap.release()
+
+    def sample(self, video_path: str) -> List[Tuple[float, np.ndarray]]:
+        """키프레임 목록 반환"""
+        return list(self.iter_keyframes(video_path))
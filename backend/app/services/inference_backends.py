@@ -0,0 +1,202 @@
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.frame_preprocess import FramePreprocessor
+
+logger = logging.getLogger(__name__)
+
+# HF image-classification 파이프라인 기본값과 동일
+DEFAULT_TOP_K = 5
+
+# int8은 ONNX 경로만 제공: torch quantize_dynamic은 Linear만 양자화해 ResNet 계열에서는 fc 층만 바뀐다
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def top_k_labels(logits: np.ndarray, id2label: Dict[int, str], k: int = DEFAULT_TOP_K) -> List[List[Dict[str, Any]]]:
+    """로짓 배치를 파이프라인과 같은 [{"label", "score"}] 형식으로 변환"""
+    probs = _softmax(logits.astype(np.float32))
+    results = []
+    for row in probs:
+        top = np.argsort(row)[::-1][:k]
+        results.append([{"label": id2label[int(i)], "score": float(row[i])} for i in top])
+    return results
+
+
+class FrameClassifierBackend:
+    """프레임 분류 추론 백엔드 인터페이스
+
+    classify()는 PIL 이미지를, classify_frames()는 FramePreprocessor.prepare()로
+    축소/crop한 BGR 프레임을 받는다.
+    """
+
+    name = ""
+    preprocessor: FramePreprocessor
+
+    def classify(self, images: List[Any], batch_size: int) -> List[List[Dict[str, Any]]]:
+        """이미지 목록을 분류하여 이미지별 상위 라벨 목록 반환"""
+        raise NotImplementedError
+
+    def classify_tensor(self, pixel_values: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """정규화된 NCHW float32 배치 분류"""
+        raise NotImplementedError
+
+    def classify_frames(self, crops: List[np.ndarray], batch_size: int) -> List[List[Dict[str, Any]]]:
+        """전처리된 프레임을 배치 텐서로 만들어 분류"""
+        results = []
+        for start in range(0, len(crops), batch_size):
+            results.extend(self.classify_tensor(self.preprocessor.to_tensor_batch(crops[start:start + batch_size])))
+        return results
+
+
+class PipelineBackend(FrameClassifierBackend):
+    """기본 fp32 transformers 파이프라인"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        import torch
+        from transformers import pipeline
+
+        self.torch = torch
+        self.pipeline = pipeline("image-classification", model=model_name)
+        self.preprocessor = FramePreprocessor.from_pretrained(model_name)
+
+    def classify(self, images, batch_size):
+        return self.pipeline(images, batch_size=batch_size)
+
+    def classify_tensor(self, pixel_values):
+        # 파이프라인의 PIL 전처리를 건너뛰고 모델에 텐서를 직접 전달
+        with self.torch.inference_mode():
+            logits = self.pipeline.model(pixel_values=self.torch.from_numpy(pixel_values)).logits
+        return top_k_labels(logits.numpy(), self.pipeline.model.config.id2label)
+
+
+def export_onnx_model(model_name: str, path: str, quantize: bool = False) -> str:
+    """HF 이미지 분류 모델을 ONNX로 내보내기 (quantize=True면 Conv/MatMul 가중치를 int8로 동적 양자화)"""
+    import torch
+    from transformers import AutoModelForImageClassification
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, pixel_values):
+            return self.model(pixel_values=pixel_values).logits
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fp32_path = path.replace("-int8.onnx", ".onnx") if quantize else path
+    if not os.path.exists(fp32_path):
+        model = AutoModelForImageClassification.from_pretrained(model_name).eval()
+        size = model.config.image_size if hasattr(model.config, "image_size") else 224
+        torch.onnx.export(
+            LogitsOnly(model),
+            (torch.randn(1, 3, size, size),),
+            fp32_path,
+            input_names=["pixel_values"],
+            output_names=["logits"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=17
+        )
+        logger.info(f"Exported ONNX model to {fp32_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QUInt8)
+        logger.info(f"Quantized ONNX model to {path}")
+    return path
+
+
+class OnnxBackend(FrameClassifierBackend):
+    """ONNX Runtime CPU 추론 (선택적으로 int8 양자화 모델 사용)"""
+
+    name = "onnx"
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        import onnxruntime
+        from transformers import AutoConfig, AutoImageProcessor
+
+        suffix = "-int8.onnx" if quantize else ".onnx"
+        path = os.path.join(settings.ONNX_MODEL_DIR, model_name.replace("/", "__") + suffix)
+        if not os.path.exists(path):
+            export_onnx_model(model_name, path, quantize=quantize)
+
+        self.name = "onnx-int8" if quantize else "onnx"
+        self.processor = AutoImageProcessor.from_pretrained(model_name)
+        self.id2label = AutoConfig.from_pretrained(model_name).id2label
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.preprocessor = FramePreprocessor.from_pretrained(model_name)
+
+    def classify(self, images, batch_size):
+        results = []
+        for start in range(0, len(images), batch_size):
+            pixel_values = self.processor(images[start:start + batch_size], return_tensors="np")["pixel_values"]
+            logits = self.session.run(["logits"], {"pixel_values": pixel_values.astype(np.float32)})[0]
+            results.extend(top_k_labels(logits, self.id2label))
+        return results
+
+    def classify_tensor(self, pixel_values):
+        logits = self.session.run(["logits"], {"pixel_values": pixel_values})[0]
+        return top_k_labels(logits, self.id2label)
+
+
+def load_frame_classifier(backend: Optional[str] = None, model_name: Optional[str] = None) -> FrameClassifierBackend:
+    """설정에 따른 프레임 분류 백엔드 생성"""
+    backend = backend or settings.FRAME_CLASSIFIER_BACKEND
+    model_name = model_name or settings.IMAGE_MODEL_NAME
+
+    if backend == "torch":
+        return PipelineBackend(model_name)
+    if backend == "onnx":
+        return OnnxBackend(model_name)
+    if backend == "onnx-int8":
+        return OnnxBackend(model_name, quantize=True)
+    raise ValueError(f"Unknown frame classifier backend: {backend} (choose from {', '.join(BACKENDS)})")
+
+
+def bgr_to_pil(frame: np.ndarray):
+    """BGR 프레임을 RGB PIL 이미지로 변환"""
+    import cv2
+    from PIL import Image
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def check_parity(reference: FrameClassifierBackend, candidate: FrameClassifierBackend,
+                 frames: List[np.ndarray], batch_size: int = 8) -> Dict[str, Any]:
+    """기준 백엔드(PIL 파이프라인 경로)와 후보 백엔드(프레임 전처리 경로)의 분류 결과 일치도 비교"""
+    expected = reference.classify([bgr_to_pil(frame) for frame in frames], batch_size)
+    actual = candidate.classify_frames([candidate.preprocessor.prepare(frame) for frame in frames], batch_size)
+
+    top1_matches = 0
+    top5_overlap = 0.0
+    score_diffs = []
+    mismatches = []
+    for index, (ref, cand) in enumerate(zip(expected, actual)):
+        if ref[0]["label"] == cand[0]["label"]:
+            top1_matches += 1
+            score_diffs.append(abs(ref[0]["score"] - cand[0]["score"]))
+        else:
+            mismatches.append({"index": index, "reference": ref[0]["label"], "candidate": cand[0]["label"]})
+        ref_labels = {r["label"] for r in ref}
+        top5_overlap += len(ref_labels & {c["label"] for c in cand}) / len(ref_labels)
+
+    total = len(expected) or 1
+    return {
+        "reference": reference.name,
+        "candidate": candidate.name,
+        "images": len(expected),
+        "top1_agreement": top1_matches / total,
+        "top5_overlap": top5_overlap / total,
+        "max_top1_score_diff": max(score_diffs) if score_diffs else 0.0,
+        "mismatches": mismatches,
+    }
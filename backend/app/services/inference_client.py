@@ -0,0 +1,94 @@
+import base64
+import io
+import threading
+from typing import Any, Dict, List, Union
+
+import httpx
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+from app.services.frame_preprocess import FramePreprocessor
+from app.services.inference_backends import FrameClassifierBackend
+
+# 분류 모델 전처리(짧은 변 256 → 224 crop)와 같은 크기로 줄여서 전송
+TRANSFER_SHORT_EDGE = 256
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_inference_http_client() -> httpx.Client:
+    """추론 서버용 공용 HTTP 클라이언트 (Unix 소켓 또는 localhost HTTP)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                transport = httpx.HTTPTransport(uds=settings.INFERENCE_SERVER_UDS) if settings.INFERENCE_SERVER_UDS else None
+                _client = httpx.Client(
+                    base_url=settings.INFERENCE_SERVER_URL,
+                    transport=transport,
+                    timeout=settings.INFERENCE_SERVER_TIMEOUT
+                )
+    return _client
+
+
+def encode_image(image: Image.Image) -> str:
+    """이미지를 축소 후 base64 JPEG로 인코딩"""
+    width, height = image.size
+    scale = TRANSFER_SHORT_EDGE / min(width, height)
+    if scale < 1:
+        image = image.resize((round(width * scale), round(height * scale)), Image.BILINEAR)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def decode_image(data: str) -> Image.Image:
+    return Image.open(io.BytesIO(base64.b64decode(data))).convert("RGB")
+
+
+def encode_frames(crops: List[np.ndarray]) -> Dict[str, Any]:
+    """전처리된 uint8 프레임 배치를 무손실 원본 바이트로 인코딩"""
+    batch = np.stack(crops)
+    return {"shape": list(batch.shape), "data": base64.b64encode(batch.tobytes()).decode()}
+
+
+def decode_frames(payload: Dict[str, Any]) -> List[np.ndarray]:
+    batch = np.frombuffer(base64.b64decode(payload["data"]), dtype=np.uint8).reshape(payload["shape"])
+    return list(batch)
+
+
+class RemoteFrameClassifier(FrameClassifierBackend):
+    """추론 서버의 프레임 분류 모델을 사용하는 클라이언트"""
+
+    name = "remote"
+
+    def __init__(self):
+        # 프레임 축소/crop은 클라이언트에서 수행하므로 모델 전처리 설정만 로드
+        self.preprocessor = FramePreprocessor.from_pretrained(settings.IMAGE_MODEL_NAME)
+
+    def classify_frames(self, crops: List[np.ndarray], batch_size: int) -> List[List[Dict[str, Any]]]:
+        response = get_inference_http_client().post("/classify_frames", json=encode_frames(crops))
+        response.raise_for_status()
+        return response.json()["results"]
+
+    def classify(self, images: List[Image.Image], batch_size: int) -> List[List[Dict[str, Any]]]:
+        response = get_inference_http_client().post("/classify", json={
+            "images": [encode_image(image) for image in images]
+        })
+        response.raise_for_status()
+        return response.json()["results"]
+
+
+class RemoteTextEmbedder:
+    """추론 서버의 SentenceTransformer를 사용하는 클라이언트 (encode 인터페이스 호환)"""
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        response = get_inference_http_client().post("/embed", json={
+            "texts": [sentences] if single else list(sentences)
+        })
+        response.raise_for_status()
+        embeddings = np.asarray(response.json()["embeddings"], dtype=np.float32)
+        return embeddings[0] if single else embeddings
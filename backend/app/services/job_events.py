@@ -0,0 +1,51 @@
+import json
+from typing import Any, AsyncIterator
+
+import redis.asyncio as aioredis
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.job_store import job_store, STATUS_SUCCEEDED, STATUS_FAILED
+
+# 프록시 유휴 연결 타임아웃보다 짧은 간격으로 주석 줄 전송
+KEEPALIVE_SECONDS = 15.0
+
+TERMINAL_EVENTS = {"done", "error"}
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def job_event_stream(job_id: str) -> AsyncIterator[str]:
+    """퀴즈 생성 작업의 진행 이벤트를 Server-Sent Events 형식으로 생성
+
+    먼저 구독한 뒤 현재 상태를 snapshot 이벤트로 보내므로, 구독 전에 끝난 단계도 놓치지 않는다.
+    작업이 끝나면(done/error) 스트림을 닫는다.
+    """
+    client = aioredis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(job_store.channel(job_id))
+    try:
+        job = await run_in_threadpool(job_store.get, job_id) or {}
+        yield format_sse("snapshot", job)
+        if job.get("status") == STATUS_SUCCEEDED:
+            yield format_sse("done", job["result"])
+            return
+        if not job or job.get("status") == STATUS_FAILED:
+            yield format_sse("error", {"error": job.get("error")})
+            return
+
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=KEEPALIVE_SECONDS)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            event = json.loads(message["data"])
+            yield format_sse(event["event"], event["data"])
+            if event["event"] in TERMINAL_EVENTS:
+                return
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.close()
+        await client.close()
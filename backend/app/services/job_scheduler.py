@@ -0,0 +1,246 @@
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 요청 종류: 사용자가 기다리는 생성 요청 / 재처리·재고 보충 같은 일괄 작업
+JOB_CLASSES = ["interactive", "bulk"]
+
+KEY_PREFIX = "sched"
+
+# 사용자 큐에 작업 추가, 처음 들어온 사용자면 라운드로빈 목록 끝에 등록
+ENQUEUE_SCRIPT = """
+local prefix = ARGV[1]
+local user = ARGV[2]
+redis.call('RPUSH', prefix .. ':queue:' .. user, ARGV[3])
+if not redis.call('LPOS', prefix .. ':users', user) then
+    redis.call('RPUSH', prefix .. ':users', user)
+end
+return redis.call('INCR', prefix .. ':depth')
+"""
+
+# 실행 중 작업이 한도 미만이면 라운드로빈 목록 맨 앞 사용자를 맨 뒤로 돌리며 그 사용자의
+# 가장 오래된 작업을 꺼내 실행 중 목록으로 옮김 (완료 전에 워커가 죽어도 작업이 사라지지 않음)
+DEQUEUE_SCRIPT = """
+local prefix = ARGV[1]
+local processing_key = ARGV[2]
+if redis.call('HLEN', processing_key) >= tonumber(ARGV[3]) then
+    return nil
+end
+local users_key = prefix .. ':users'
+for i = 1, redis.call('LLEN', users_key) do
+    local user = redis.call('LMOVE', users_key, users_key, 'LEFT', 'RIGHT')
+    local queue_key = prefix .. ':queue:' .. user
+    local job = redis.call('LPOP', queue_key)
+    if redis.call('LLEN', queue_key) == 0 then
+        redis.call('LREM', users_key, 0, user)
+    end
+    if job then
+        redis.call('DECR', prefix .. ':depth')
+        local job_id = cjson.decode(job)['job_id']
+        redis.call('HSET', processing_key, job_id, job)
+        redis.call('ZADD', processing_key .. ':started', ARGV[4], job_id)
+        return job
+    end
+end
+return nil
+"""
+
+# 시작한 지 오래된 실행 중 작업을 목록에서 빼서 반환 (다시 큐에 넣기 위해)
+REAP_SCRIPT = """
+local processing_key = KEYS[1]
+local started_key = KEYS[1] .. ':started'
+local stale = redis.call('ZRANGEBYSCORE', started_key, '-inf', ARGV[1])
+local jobs = {}
+for _, job_id in ipairs(stale) do
+    local job = redis.call('HGET', processing_key, job_id)
+    redis.call('HDEL', processing_key, job_id)
+    redis.call('ZREM', started_key, job_id)
+    if job then
+        table.insert(jobs, job)
+    end
+end
+return jobs
+"""
+
+# 같은 영상을 처리 중인 작업이 있으면 대기 목록에 추가하고 그 작업 id 반환, 없으면 자신이 처리 담당
+JOIN_SCRIPT = """
+local leader = redis.call('GET', KEYS[1])
+if leader then
+    redis.call('RPUSH', KEYS[2], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    return leader
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return nil
+"""
+
+# 처리 담당 해제 후 대기 작업 목록 반환 (TTL 만료 후 다른 작업이 담당이 됐으면 건드리지 않음)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return {}
+end
+local waiters = redis.call('LRANGE', KEYS[2], 0, -1)
+redis.call('DEL', KEYS[1], KEYS[2])
+return waiters
+"""
+
+# 다시 큐에 넣은 처리 담당 작업의 담당 표시 유지 (아직 담당이면 TTL 연장, 만료됐으면 다시 등록)
+REFRESH_SCRIPT = """
+local leader = redis.call('GET', KEYS[1])
+if leader and leader ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+class JobScheduler:
+    """퀴즈 생성 작업의 공정 스케줄러
+
+    - 요청 종류(interactive/bulk)별로 사용자마다 큐를 두고 사용자 간 라운드로빈으로 꺼낸다.
+    - 종류 간에는 가중치 비율로 번갈아 꺼내되, 한쪽이 비면 다른 쪽을 바로 처리한다.
+    - 같은 content hash의 작업이 처리 중이면 새 작업은 큐에 넣지 않고 결과를 기다린다.
+
+    Celery에는 작업 내용 없이 "티켓"(quiz.dispatch)만 넣고, 워커가 티켓을 실행하는 시점에
+    가장 공정한 작업을 고른다. 동시에 실행하는 작업 수를 SCHEDULER_MAX_ACTIVE로 제한하므로
+    단계 체인이 브로커에 들어간 뒤에도 대기 순서는 스케줄러가 정한다.
+
+    꺼낸 작업은 완료(complete)될 때까지 실행 중 목록(sched:processing)에 남고, 워커 장애로
+    SCHEDULER_PROCESSING_TIMEOUT 안에 끝나지 않으면 reap_stale()이 다시 큐에 넣는다.
+    """
+
+    def __init__(self):
+        self.client = get_redis_client()
+        self._enqueue = self.client.register_script(ENQUEUE_SCRIPT)
+        self._dequeue = self.client.register_script(DEQUEUE_SCRIPT)
+        self._join = self.client.register_script(JOIN_SCRIPT)
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+        self._refresh = self.client.register_script(REFRESH_SCRIPT)
+        self._reap = self.client.register_script(REAP_SCRIPT)
+        self.processing_key = f"{KEY_PREFIX}:processing"
+
+    def _prefix(self, job_class: str) -> str:
+        return f"{KEY_PREFIX}:{job_class}"
+
+    def _inflight_keys(self, content_hash: str) -> List[str]:
+        return [f"inflight:{content_hash}", f"inflight:{content_hash}:waiters"]
+
+    def _class_rotation(self) -> List[str]:
+        """가중치만큼 반복한 종류 순서 (예: interactive 4 : bulk 1)"""
+        weights = {
+            "interactive": settings.SCHEDULER_INTERACTIVE_WEIGHT,
+            "bulk": settings.SCHEDULER_BULK_WEIGHT,
+        }
+        return [job_class for job_class in JOB_CLASSES for _ in range(max(weights[job_class], 1))]
+
+    def enqueue(self, payload: Dict[str, Any], job_class: str = "interactive"):
+        if job_class not in JOB_CLASSES:
+            raise ValueError(f"Unknown job class: {job_class}")
+        payload = dict(payload, job_class=job_class, enqueued_at=time.time())
+        self._enqueue(args=[self._prefix(job_class), payload["user_id"], json.dumps(payload, ensure_ascii=False)])
+
+    def join_inflight(self, payload: Dict[str, Any]) -> Optional[str]:
+        """같은 영상을 처리 중인 작업 id 반환 (없으면 이 작업을 처리 담당으로 등록하고 None)"""
+        leader = self._join(
+            keys=self._inflight_keys(payload["content_hash"]),
+            args=[payload["job_id"], json.dumps(payload, ensure_ascii=False), settings.SCHEDULER_INFLIGHT_TTL]
+        )
+        return leader.decode() if leader else None
+
+    def release_inflight(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """처리 담당 해제 후 결과를 기다리던 작업 payload 목록 반환"""
+        waiters = self._release(keys=self._inflight_keys(payload["content_hash"]), args=[payload["job_id"]])
+        return [json.loads(waiter) for waiter in waiters]
+
+    def refresh_inflight(self, payload: Dict[str, Any]) -> bool:
+        """다시 큐에 넣는 처리 담당 작업의 담당 표시 유지 (다른 작업이 담당이 됐으면 False)"""
+        return bool(self._refresh(
+            keys=self._inflight_keys(payload["content_hash"]),
+            args=[payload["job_id"], settings.SCHEDULER_INFLIGHT_TTL]
+        ))
+
+    def dequeue(self) -> Optional[Dict[str, Any]]:
+        """가중치 순서에 따라 다음에 처리할 작업 꺼냄"""
+        rotation = self._class_rotation()
+        start = self.client.incr(f"{KEY_PREFIX}:cursor") % len(rotation)
+        tried = set()
+        for offset in range(len(rotation)):
+            job_class = rotation[(start + offset) % len(rotation)]
+            if job_class in tried:
+                continue
+            tried.add(job_class)
+            raw = self._dequeue(args=[
+                self._prefix(job_class), self.processing_key, settings.SCHEDULER_MAX_ACTIVE, time.time()
+            ])
+            if raw is not None:
+                payload = json.loads(raw)
+                self._record_wait(job_class, time.time() - payload["enqueued_at"])
+                return payload
+        return None
+
+    def complete(self, job_id: str):
+        """작업이 끝나면(성공/실패) 실행 중 목록에서 제거"""
+        pipe = self.client.pipeline()
+        pipe.hdel(self.processing_key, job_id)
+        pipe.zrem(f"{self.processing_key}:started", job_id)
+        pipe.execute()
+
+    def free_slots(self) -> int:
+        return max(settings.SCHEDULER_MAX_ACTIVE - self.client.hlen(self.processing_key), 0)
+
+    def reap_stale(self) -> List[Dict[str, Any]]:
+        """SCHEDULER_PROCESSING_TIMEOUT 넘게 끝나지 않은 작업을 실행 중 목록에서 빼서 반환"""
+        deadline = time.time() - settings.SCHEDULER_PROCESSING_TIMEOUT
+        return [json.loads(job) for job in self._reap(keys=[self.processing_key], args=[deadline])]
+
+    def _record_wait(self, job_class: str, wait: float):
+        key = f"{self._prefix(job_class)}:stats"
+        pipe = self.client.pipeline()
+        pipe.hincrby(key, "dispatched", 1)
+        pipe.hincrbyfloat(key, "wait_total", wait)
+        pipe.hset(key, "wait_last", wait)
+        pipe.execute()
+        # 최대값은 모니터링용이므로 원자적으로 갱신하지 않음
+        current = self.client.hget(key, "wait_max")
+        if current is None or float(current) < wait:
+            self.client.hset(key, "wait_max", wait)
+
+    def record_coalesced(self, job_class: str):
+        self.client.hincrby(f"{self._prefix(job_class)}:stats", "coalesced", 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """종류별 큐 깊이, 대기 시간, 병합된 작업 수 및 실행 중 작업 수"""
+        result = {"processing": self.client.hlen(self.processing_key)}
+        for job_class in JOB_CLASSES:
+            prefix = self._prefix(job_class)
+            data = {name.decode(): float(value) for name, value in self.client.hgetall(f"{prefix}:stats").items()}
+            dispatched = int(data.get("dispatched", 0))
+            result[job_class] = {
+                "depth": int(self.client.get(f"{prefix}:depth") or 0),
+                "active_users": self.client.llen(f"{prefix}:users"),
+                "dispatched": dispatched,
+                "coalesced": int(data.get("coalesced", 0)),
+                "wait_avg": round(data["wait_total"] / dispatched, 3) if dispatched else 0.0,
+                "wait_last": round(data.get("wait_last", 0.0), 3),
+                "wait_max": round(data.get("wait_max", 0.0), 3),
+            }
+        return result
+
+
+_scheduler: Optional[JobScheduler] = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    """프로세스 공용 스케줄러 (Redis 스크립트 등록을 첫 사용 시점으로 미룸)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
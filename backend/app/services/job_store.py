@@ -0,0 +1,129 @@
+import json
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 퀴즈 생성 작업 단계 (app/tasks.py의 체인 순서)
+JOB_STAGES = ["analyze", "describe", "generate", "persist"]
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+class JobStore:
+    """Redis 해시(job:{id})에 저장하는 퀴즈 생성 작업 상태
+
+    API 프로세스와 Celery 워커가 같은 Redis를 보므로 상태 조회에 Celery 결과 백엔드를 쓰지 않는다.
+    값은 필드별 JSON으로 저장해 단계마다 바뀐 필드만 갱신한다.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or settings.JOB_TTL
+
+    def _key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def channel(self, job_id: str) -> str:
+        """작업 진행 이벤트 pub/sub 채널"""
+        return f"job:{job_id}:events"
+
+    def _update(self, job_id: str, event: Optional[str] = None, data: Any = None, **fields):
+        """필드 갱신 (event가 있으면 같은 트랜잭션으로 이벤트 발행)"""
+        fields["updated_at"] = time.time()
+        client = get_redis_client()
+        key = self._key(job_id)
+        pipe = client.pipeline()
+        pipe.hset(key, mapping={name: json.dumps(value, ensure_ascii=False) for name, value in fields.items()})
+        pipe.expire(key, self.ttl)
+        if event is not None:
+            pipe.publish(self.channel(job_id), json.dumps({"event": event, "data": data}, ensure_ascii=False))
+        pipe.execute()
+
+    def emit(self, job_id: str, event: str, data: Any):
+        """중간 결과 저장 및 이벤트 발행 (나중에 연결한 클라이언트도 스냅샷으로 받음)"""
+        self._update(job_id, event=event, data=data, **{event: data})
+
+    def create(self, user_id: int, category: str, analysis_id: Optional[int] = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._update(
+            job_id,
+            id=job_id,
+            user_id=user_id,
+            category=category,
+            analysis_id=analysis_id,
+            status=STATUS_QUEUED,
+            stage=None,
+            stages={stage: "pending" for stage in JOB_STAGES},
+            timings={},
+            road_elements=None,
+            description=None,
+            quiz=None,
+            result=None,
+            error=None,
+            created_at=now
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = get_redis_client().hgetall(self._key(job_id))
+        if not data:
+            return None
+        job = {name.decode(): json.loads(value) for name, value in data.items()}
+        done = sum(1 for state in job["stages"].values() if state == "done")
+        job["progress"] = round(done / len(JOB_STAGES), 2)
+        return job
+
+    def _set_stage(self, job_id: str, stage: str, state: str, seconds: Optional[float] = None, **fields):
+        job = self.get(job_id) or {}
+        stages = job.get("stages", {})
+        stages[stage] = state
+        timings = job.get("timings") or {}
+        if seconds is not None:
+            timings[stage] = round(seconds, 3)
+        self._update(job_id, event="stage", data={"stage": stage, "state": state},
+                     stages=stages, timings=timings, **fields)
+
+    @contextmanager
+    def stage(self, job_id: str, stage: str):
+        """단계 실행 구간: 시작/완료를 기록하고 예외가 나면 작업을 실패로 표시"""
+        self._set_stage(job_id, stage, "running", status=STATUS_RUNNING, stage=stage)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed at {stage}")
+            self._set_stage(job_id, stage, "failed", status=STATUS_FAILED, error=str(e))
+            self._update(job_id, event="error", data={"stage": stage, "error": str(e)})
+            raise
+        self._set_stage(job_id, stage, "done", seconds=time.monotonic() - started)
+
+    def mark_coalesced(self, job_id: str, leader_job_id: str):
+        """같은 영상을 처리 중인 작업의 결과를 기다리는 상태로 표시"""
+        self._update(job_id, coalesced_with=leader_job_id)
+
+    def mark_shared(self, job_id: str, stages: List[str]):
+        """처리 담당 작업의 결과를 받아 건너뛴 단계 표시"""
+        job = self.get(job_id) or {}
+        done = dict(job.get("stages", {}), **{stage: "done" for stage in stages})
+        self._update(job_id, stages=done)
+
+    def fail(self, job_id: str, error: str):
+        """단계 밖에서 실패한 경우 (예: 워커 장애로 재시도 한도 초과)"""
+        self._update(job_id, event="error", data={"stage": None, "error": error},
+                     status=STATUS_FAILED, stage=None, error=error)
+
+    def succeed(self, job_id: str, result: Dict[str, Any]):
+        self._update(job_id, event="done", data=result, status=STATUS_SUCCEEDED, stage=None, result=result)
+
+
+job_store = JobStore()
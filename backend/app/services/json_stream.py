@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    """LLM 스트리밍 출력에서 첫 번째 JSON 객체를 점진적으로 파싱
+
+    객체 앞의 설명 문장이나 ```json 코드 펜스, 객체 뒤의 텍스트는 무시한다.
+    최상위 필드는 값이 끝나는 즉시 (키, 값)으로 반환하므로 보기/해설이 생성되기 전에
+    질문을 먼저 표시할 수 있다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def _complete_value(self, end: int, completed: List[Tuple[str, Any]]):
+        if self._key is not None and self._value_start is not None:
+            try:
+                value = json.loads(self.buffer[self._value_start:end])
+            except ValueError:
+                value = None
+            else:
+                self.fields[self._key] = value
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """텍스트 조각을 추가하고 이번에 완성된 최상위 필드 목록 반환"""
+        self.buffer += text
+        completed: List[Tuple[str, Any]] = []
+        buffer = self.buffer
+        while self._pos < len(buffer) and not self.done:
+            i = self._pos
+            ch = buffer[i]
+            self._pos += 1
+
+            if self._start is None:
+                if ch == "{":
+                    self._start = i
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(buffer[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+                    self._expect_key = False
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_value(i, completed)
+                    self._end = i + 1
+                    self.done = True
+            elif ch == ":" and self._depth == 1:
+                self._value_start = i + 1
+            elif ch == "," and self._depth == 1:
+                self._complete_value(i, completed)
+                self._expect_key = True
+        return completed
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """객체가 닫혔으면 파싱 결과 반환 (전체 파싱이 안 되면 완성된 필드만)"""
+        if not self.done:
+            return None
+        try:
+            value = json.loads(self.buffer[self._start:self._end])
+        except ValueError:
+            return dict(self.fields)
+        return value if isinstance(value, dict) else None
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """설명 문장/코드 펜스가 섞인 응답에서 첫 번째 JSON 객체 추출"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result()
@@ -0,0 +1,106 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+
+def downscale_keyframe(frame: np.ndarray, short_edge: int) -> np.ndarray:
+    """짧은 변을 short_edge로 축소 (모델에 무관한 저장용 크기)"""
+    height, width = frame.shape[:2]
+    scale = short_edge / min(height, width)
+    if scale >= 1:
+        return frame
+    size = (round(width * scale), round(height * scale))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+class KeyframeStore:
+    """영상 내용 해시별 축소 키프레임 저장소
+
+    키프레임은 (N, H, W, 3) uint8 BGR 배열 하나의 .npy 파일로 저장하고 메모리 매핑으로 읽어,
+    모델 교체 후 재분석 시 영상을 다시 디코딩하지 않는다. 같은 영상을 여러 번 올려도 키프레임은
+    한 벌만 두고, VideoAnalysis 행은 analyses/{id} 링크 파일로 content hash를 가리킨다.
+    """
+
+    def __init__(self, root: Optional[str] = None, short_edge: Optional[int] = None):
+        self.root = root or settings.KEYFRAME_DIR
+        self.short_edge = short_edge or settings.KEYFRAME_SHORT_EDGE
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.npy")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def _link_path(self, analysis_id: int) -> str:
+        return os.path.join(self.root, "analyses", str(analysis_id))
+
+    def exists(self, content_hash: str) -> bool:
+        return os.path.exists(self._path(content_hash))
+
+    def save(self, content_hash: str, frames: List[np.ndarray],
+             timestamps: Optional[List[float]] = None) -> Optional[str]:
+        """키프레임 축소 후 저장 (같은 영상의 프레임은 크기가 같으므로 하나의 배열로 쌓음)"""
+        if not frames:
+            return None
+
+        os.makedirs(self.root, exist_ok=True)
+        array = np.stack([downscale_keyframe(frame, self.short_edge) for frame in frames])
+        path = self._path(content_hash)
+        # 쓰는 도중 읽히지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+
+        with open(self._meta_path(content_hash), "w") as f:
+            json.dump({"timestamps": timestamps, "shape": list(array.shape)}, f)
+        return path
+
+    def link(self, analysis_id: int, content_hash: str):
+        """분석 행이 content hash의 키프레임을 사용하도록 연결"""
+        path = self._link_path(analysis_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content_hash)
+
+    def resolve(self, analysis_id: int) -> Optional[str]:
+        """분석 행에 연결된 키프레임 키 (이전 형식인 {analysis_id}.npy도 지원)"""
+        path = self._link_path(analysis_id)
+        if os.path.exists(path):
+            with open(path) as f:
+                return f.read().strip()
+        if os.path.exists(self._path(str(analysis_id))):
+            return str(analysis_id)
+        return None
+
+    def load(self, content_hash: str) -> Optional[np.ndarray]:
+        """메모리 매핑된 (N, H, W, 3) 배열 반환"""
+        path = self._path(content_hash)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def load_for_analysis(self, analysis_id: int) -> Optional[np.ndarray]:
+        key = self.resolve(analysis_id)
+        return self.load(key) if key is not None else None
+
+    def load_meta(self, content_hash: str) -> Dict[str, Any]:
+        path = self._meta_path(content_hash)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def delete(self, content_hash: str):
+        """키프레임 삭제 (연결된 분석 행의 링크는 load 시 None으로 처리됨)"""
+        for path in (self._path(content_hash), self._meta_path(content_hash)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+keyframe_store = KeyframeStore()
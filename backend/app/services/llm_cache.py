@@ -0,0 +1,212 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import redis
+
+from app.core.config import settings
+from app.services.cache import TieredCache, get_redis_client
+from app.services.model_registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "llm:cache:stats"
+# 임베딩하는 텍스트가 바뀌면 이전 인덱스와 섞이지 않도록 버전을 올림 (이전 키는 TTL로 만료)
+SEMANTIC_KEY_PREFIX = "llm:semantic:v2"
+
+WHITESPACE = re.compile(r"\s+")
+
+# 유사 응답 인덱스를 Redis와 다시 맞추는 최소 간격 (초)
+SEMANTIC_SYNC_INTERVAL = 5.0
+
+
+def normalize_prompt(messages: List[Dict[str, str]]) -> str:
+    """공백/줄바꿈 차이만 있는 프롬프트를 같은 키로 취급"""
+    return "\n".join(f"{m['role']}:{WHITESPACE.sub(' ', m['content']).strip()}" for m in messages)
+
+
+def estimate_tokens(text: str) -> int:
+    """사용량 정보가 없는 스트리밍 응답의 대략적인 토큰 수 (한국어는 대략 글자당 1토큰)"""
+    return len(text)
+
+
+class SemanticIndex:
+    """프롬프트 임베딩 → 캐시 키 인덱스 (모델/파라미터 조합별)
+
+    임베딩은 Redis 해시에 float32 바이트로 공유하고, 프로세스 내에는 정규화된 행렬로 보관해
+    코사인 유사도를 한 번의 행렬 곱으로 계산한다. 추가 시각은 정렬 집합(점수=추가 시각)에 두어
+    응답 TTL이 지난 항목과 LLM_SEMANTIC_CACHE_MAX_ITEMS를 넘는 오래된 항목을 항목별로 뺀다.
+    """
+
+    def __init__(self, scope: str):
+        self.redis_key = f"{SEMANTIC_KEY_PREFIX}:{scope}"
+        self.added_key = f"{self.redis_key}:added"
+        self.keys: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self._version = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _evict(self, client, now: float):
+        """응답 TTL이 지난 항목과 최대 개수를 넘는 오래된 항목 제거"""
+        stale = client.zrangebyscore(self.added_key, "-inf", now - settings.LLM_CACHE_TTL)
+        stale += client.zrange(self.added_key, 0, -settings.LLM_SEMANTIC_CACHE_MAX_ITEMS - 1)
+        if stale:
+            pipe = client.pipeline()
+            pipe.hdel(self.redis_key, *stale)
+            pipe.zrem(self.added_key, *stale)
+            pipe.execute()
+
+    def _sync(self):
+        if time.monotonic() - self._synced_at < SEMANTIC_SYNC_INTERVAL:
+            return
+        self._synced_at = time.monotonic()
+        client = get_redis_client()
+        self._evict(client, time.time())
+        # 항목 수가 같아도 추가/제거가 있었으면 최근 추가 항목이 달라짐
+        version = (client.zcard(self.added_key), client.zrange(self.added_key, -1, -1, withscores=True))
+        if version == self._version:
+            return
+        entries = client.hgetall(self.redis_key)
+        self._version = version
+        self.keys = [key.decode() for key in entries]
+        self.matrix = np.stack([np.frombuffer(vector, dtype=np.float32) for vector in entries.values()]) if entries else None
+
+    def search(self, embedding: np.ndarray, threshold: float) -> Optional[str]:
+        with self._lock:
+            self._sync()
+            if self.matrix is None:
+                return None
+            scores = self.matrix @ embedding
+            best = int(np.argmax(scores))
+            return self.keys[best] if scores[best] >= threshold else None
+
+    def add(self, key: str, embedding: np.ndarray):
+        client = get_redis_client()
+        now = time.time()
+        pipe = client.pipeline()
+        pipe.hset(self.redis_key, key, embedding.astype(np.float32).tobytes())
+        pipe.zadd(self.added_key, {key: now})
+        pipe.expire(self.redis_key, settings.LLM_CACHE_TTL)
+        pipe.expire(self.added_key, settings.LLM_CACHE_TTL)
+        pipe.execute()
+        self._evict(client, now)
+        with self._lock:
+            self._synced_at = 0.0
+
+    def remove(self, key: str):
+        client = get_redis_client()
+        pipe = client.pipeline()
+        pipe.hdel(self.redis_key, key)
+        pipe.zrem(self.added_key, key)
+        pipe.execute()
+        with self._lock:
+            self._synced_at = 0.0
+
+
+class LLMResponseCache:
+    """(모델, temperature, 파라미터, 정규화 프롬프트) 키의 LLM 응답 캐시
+
+    정확히 같은 프롬프트는 TieredCache(인메모리 LRU + Redis TTL)에서 찾고, semantic 텍스트를 넘긴
+    호출은 그 임베딩의 코사인 유사도가 임계값 이상인 기존 응답도 재사용한다. 고정된 프롬프트 틀까지
+    임베딩하면 입력이 달라도 유사도가 높게 나오므로, 호출자는 프롬프트에서 바뀌는 부분만 넘긴다.
+    """
+
+    def __init__(self):
+        self.cache = TieredCache(
+            namespace="llm",
+            ttl=settings.LLM_CACHE_TTL,
+            max_items=settings.LLM_CACHE_MAX_ITEMS
+        )
+        self._semantic: Dict[str, SemanticIndex] = {}
+
+    def _scope(self, params: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    def key(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        return hashlib.sha256(f"{self._scope(params)}|{normalize_prompt(messages)}".encode()).hexdigest()
+
+    def _semantic_index(self, params: Dict[str, Any]) -> SemanticIndex:
+        scope = self._scope(params)
+        if scope not in self._semantic:
+            self._semantic[scope] = SemanticIndex(scope)
+        return self._semantic[scope]
+
+    def _embed(self, text: str) -> np.ndarray:
+        embedding = np.asarray(model_registry.get("text_embedder").encode(text), dtype=np.float32)
+        return embedding / (np.linalg.norm(embedding) or 1.0)
+
+    def _record(self, **counters):
+        try:
+            pipe = get_redis_client().pipeline()
+            for name, value in counters.items():
+                pipe.hincrby(STATS_KEY, name, value)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"LLM cache stats update failed: {str(e)}")
+
+    def get(self, messages: List[Dict[str, str]], params: Dict[str, Any],
+            semantic: Optional[str] = None) -> Optional[str]:
+        if not settings.LLM_CACHE_ENABLED:
+            return None
+
+        key = self.key(messages, params)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self._record(lookups=1, hits_exact=1, saved_tokens=entry["tokens"])
+            return entry["content"]
+
+        if semantic is not None and settings.LLM_SEMANTIC_CACHE_ENABLED:
+            try:
+                index = self._semantic_index(params)
+                match = index.search(self._embed(semantic), settings.LLM_SEMANTIC_CACHE_THRESHOLD)
+                if match is not None:
+                    entry = self.cache.get(match)
+                    if entry is None:
+                        # 응답이 TTL로 만료됐으면 인덱스에서도 제거
+                        index.remove(match)
+                    else:
+                        self._record(lookups=1, hits_semantic=1, saved_tokens=entry["tokens"])
+                        return entry["content"]
+            except Exception as e:
+                logger.warning(f"Semantic LLM cache lookup failed: {str(e)}")
+
+        self._record(lookups=1)
+        return None
+
+    def set(self, messages: List[Dict[str, str]], params: Dict[str, Any], content: str,
+            tokens: Optional[int] = None, semantic: Optional[str] = None):
+        if not settings.LLM_CACHE_ENABLED:
+            return
+
+        key = self.key(messages, params)
+        if tokens is None:
+            tokens = estimate_tokens(normalize_prompt(messages)) + estimate_tokens(content)
+        self.cache.set(key, {"content": content, "tokens": tokens})
+
+        if semantic is not None and settings.LLM_SEMANTIC_CACHE_ENABLED:
+            try:
+                self._semantic_index(params).add(key, self._embed(semantic))
+            except Exception as e:
+                logger.warning(f"Semantic LLM cache write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        raw = get_redis_client().hgetall(STATS_KEY)
+        data = {name.decode(): int(value) for name, value in raw.items()}
+        lookups = data.get("lookups", 0)
+        hits = data.get("hits_exact", 0) + data.get("hits_semantic", 0)
+        return {
+            "lookups": lookups,
+            "hits_exact": data.get("hits_exact", 0),
+            "hits_semantic": data.get("hits_semantic", 0),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "saved_tokens": data.get("saved_tokens", 0),
+        }
+
+
+llm_cache = LLMResponseCache()
@@ -0,0 +1,273 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailable(Exception):
+    """서킷이 열려 있거나 재시도를 모두 소진한 경우"""
+
+
+class StreamInterrupted(LLMUnavailable):
+    """스트리밍 도중 연결이 끊긴 경우 (이미 전달한 내용이 있어 재시도하지 않음)"""
+
+
+# 스트림 종료 표시
+_STREAM_END = object()
+
+
+class CircuitBreaker:
+    """연속 실패가 임계값을 넘으면 일정 시간 호출을 차단
+
+    차단 시간이 지나면 한 번의 시험 호출(half-open)만 허용하고, 성공하면 닫는다.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def is_retryable(error: Exception) -> bool:
+    """429, 5xx, 타임아웃, 연결 오류만 재시도"""
+    import openai
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def retry_delay(attempt: int, error: Exception) -> float:
+    """Retry-After 헤더가 있으면 따르고, 없으면 full jitter 지수 백오프"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), settings.LLM_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return random.uniform(0, min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class LLMGateway:
+    """OpenAI 호환 API 비동기 게이트웨이
+
+    전용 이벤트 루프 스레드 하나가 AsyncOpenAI 클라이언트(공유 커넥션 풀)와 동시 호출 제한
+    세마포어를 소유하고, chat()/stream()은 그 루프에 호출을 넘긴 뒤 결과를 기다린다.
+    LLM 호출은 Celery 워커와 스레드풀에서만 하므로 API 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(settings.LLM_CIRCUIT_FAILURE_THRESHOLD, settings.LLM_CIRCUIT_RESET_SECONDS)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                    self._loop = loop
+        return self._loop
+
+    def _get_client(self):
+        """게이트웨이 루프 안에서만 호출 (httpx 풀은 생성된 루프에 묶임)"""
+        if self._client is None:
+            from openai import AsyncOpenAI
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+                ),
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT)
+            )
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
+                http_client=http_client,
+                max_retries=0  # 재시도는 게이트웨이에서 지터를 넣어 직접 처리
+            )
+            self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        return self._client
+
+    async def _with_retries(self, attempt_call):
+        """attempt_call()을 서킷/세마포어/재시도 정책 아래에서 실행"""
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            if not self.breaker.allow():
+                self.stats["rejected"] += 1
+                raise LLMUnavailable(f"LLM circuit {self.breaker.state}")
+
+            self.stats["calls"] += 1
+            try:
+                async with self._semaphore:
+                    result = await attempt_call()
+            except StreamInterrupted:
+                # 이미 일부 내용을 전달했으므로 처음부터 재시도하지 않음
+                self.breaker.record_failure()
+                self.stats["failures"] += 1
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    # 요청 자체의 오류(4xx)는 서버가 응답한 것이므로 실패로 세지 않음
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                self.stats["failures"] += 1
+                if attempt == settings.LLM_MAX_RETRIES:
+                    raise LLMUnavailable(f"LLM call failed after {attempt + 1} attempts: {e}") from e
+                self.stats["retries"] += 1
+                delay = retry_delay(attempt, e)
+                logger.warning(f"LLM call failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    async def _complete(self, messages: List[Dict[str, str]], timeout: Optional[float], **kwargs) -> Tuple[str, Optional[int]]:
+        """(응답 내용, 사용 토큰 수) 반환"""
+        client = self._get_client()
+
+        async def attempt():
+            response = await client.chat.completions.create(
+                messages=messages,
+                timeout=timeout or settings.LLM_TIMEOUT,
+                **kwargs
+            )
+            tokens = response.usage.total_tokens if response.usage else None
+            return response.choices[0].message.content.strip(), tokens
+
+        return await self._with_retries(attempt)
+
+    async def _stream(self, messages: List[Dict[str, str]], timeout: Optional[float],
+                      emit: Callable[[str], None], **kwargs):
+        """토큰 조각을 받는 대로 emit으로 전달 (첫 조각 전의 실패만 재시도)"""
+        client = self._get_client()
+
+        async def attempt():
+            started = False
+            try:
+                stream = await client.chat.completions.create(
+                    messages=messages,
+                    timeout=timeout or settings.LLM_TIMEOUT,
+                    stream=True,
+                    **kwargs
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        started = True
+                        emit(delta)
+            except Exception as e:
+                if started:
+                    raise StreamInterrupted(f"LLM stream interrupted: {e}") from e
+                raise
+
+        await self._with_retries(attempt)
+
+    def chat(self, messages: List[Dict[str, str]], timeout: Optional[float] = None,
+             cache: bool = False, semantic: Optional[str] = None, **kwargs) -> str:
+        """chat completion 내용 반환 (게이트웨이 루프에서 실행될 때까지 대기)
+
+        응답 캐시는 같은 입력에 같은 답을 돌려줘도 되는 호출만 cache=True로 사용한다.
+        semantic에 프롬프트의 가변 부분을 넘기면 그 텍스트가 비슷한 기존 응답도 재사용한다.
+        """
+        kwargs.setdefault("model", settings.LLM_MODEL)
+        if cache:
+            cached = llm_cache.get(messages, kwargs, semantic)
+            if cached is not None:
+                return cached
+
+        future = asyncio.run_coroutine_threadsafe(self._complete(messages, timeout, **kwargs), self._ensure_loop())
+        content, tokens = future.result()
+        if cache:
+            llm_cache.set(messages, kwargs, content, tokens, semantic)
+        return content
+
+    def stream(self, messages: List[Dict[str, str]], timeout: Optional[float] = None,
+               cache: bool = False, semantic: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """스트리밍: 토큰 조각을 도착하는 대로 반환 (캐시 적중 시 한 조각으로 반환)"""
+        kwargs.setdefault("model", settings.LLM_MODEL)
+        if cache:
+            cached = llm_cache.get(messages, kwargs, semantic)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks: "queue.Queue" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(messages, timeout, chunks.put, **kwargs), self._ensure_loop()
+        )
+        future.add_done_callback(lambda _: chunks.put(_STREAM_END))
+        received = []
+        while True:
+            chunk = chunks.get()
+            if chunk is _STREAM_END:
+                break
+            received.append(chunk)
+            yield chunk
+        future.result()
+        if cache:
+            llm_cache.set(messages, kwargs, "".join(received).strip(), None, semantic)
+
+    @property
+    def degraded(self) -> bool:
+        """서킷이 열려 있으면 True (호출자는 예비 경로를 바로 사용)
+
+        half-open이면 False를 반환해 호출자가 시험 호출을 하게 한다. 시험 호출이 이미 진행 중이면
+        allow()가 나머지 호출을 LLMUnavailable로 바로 거절하므로 그 호출자는 예비 경로로 간다.
+        """
+        return self.breaker.state == "open"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(self.stats, circuit=self.breaker.state, failures_in_row=self.breaker.failures)
+
+
+llm_gateway = LLMGateway()
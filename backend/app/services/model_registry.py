@@ -0,0 +1,145 @@
+import gc
+import time
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """프로세스 전역 모델 레지스트리
+
+    모델은 처음 사용할 때 로드되어 모든 서비스 인스턴스가 공유하며,
+    오래 사용하지 않은 모델은 unload_idle()로 메모리에서 내릴 수 있다.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._last_used: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """모델 로더 등록 (이미 로드된 모델은 내림)"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """모델 반환 (필요 시 로드)"""
+        model = self._models.get(name)
+        if model is None:
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model: {name}")
+            with self._locks[name]:
+                model = self._models.get(name)
+                if model is None:
+                    started = time.perf_counter()
+                    model = self._loaders[name]()
+                    self._models[name] = model
+                    logger.info(f"Loaded model '{name}' in {time.perf_counter() - started:.2f}s")
+        self._last_used[name] = time.monotonic()
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def loaded_models(self) -> List[str]:
+        return list(self._models)
+
+    def warmup(self, names: Optional[Iterable[str]] = None):
+        """지정한 모델(기본: 전체)을 미리 로드"""
+        for name in names if names is not None else list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Model warmup failed for '{name}': {str(e)}")
+
+    def unload(self, name: str):
+        with self._locks.get(name, self._lock):
+            if self._models.pop(name, None) is not None:
+                self._last_used.pop(name, None)
+                logger.info(f"Unloaded model '{name}'")
+
+    def unload_idle(self, max_idle_seconds: float) -> List[str]:
+        """max_idle_seconds 이상 사용하지 않은 모델을 내림"""
+        now = time.monotonic()
+        idle = [name for name, used in list(self._last_used.items()) if now - used >= max_idle_seconds]
+        for name in idle:
+            self.unload(name)
+        if idle:
+            gc.collect()
+        return idle
+
+    def start_idle_reaper(self, max_idle_seconds: float, interval: float = 60.0):
+        """유휴 모델 정리 백그라운드 스레드 시작"""
+        if self._reaper is not None:
+            return
+
+        def reap():
+            while True:
+                time.sleep(interval)
+                self.unload_idle(max_idle_seconds)
+
+        self._reaper = threading.Thread(target=reap, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+
+def load_local_image_classifier():
+    from app.services.inference_backends import load_frame_classifier
+    return load_frame_classifier(settings.FRAME_CLASSIFIER_BACKEND)
+
+
+def load_local_text_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.TEXT_EMBED_MODEL)
+
+
+def _load_image_classifier():
+    # 추론 서버가 설정되어 있으면 모델을 로드하지 않고 클라이언트 사용
+    if settings.INFERENCE_SERVER_URL:
+        from app.services.inference_client import RemoteFrameClassifier
+        return RemoteFrameClassifier()
+    return load_local_image_classifier()
+
+
+def _load_text_embedder():
+    if settings.INFERENCE_SERVER_URL:
+        from app.services.inference_client import RemoteTextEmbedder
+        return RemoteTextEmbedder()
+    return load_local_text_embedder()
+
+
+def _load_clip_tagger():
+    from app.services.ai_service import TRAFFIC_KEYWORDS
+    from app.services.clip_tagger import ClipFrameTagger
+    return ClipFrameTagger(TRAFFIC_KEYWORDS)
+
+
+def _load_object_detector():
+    from transformers import pipeline
+    return pipeline("object-detection", model=settings.DETECTOR_MODEL)
+
+
+def _load_weaviate_client():
+    import weaviate
+    return weaviate.Client(settings.WEAVIATE_URL)
+
+
+model_registry = ModelRegistry()
+model_registry.register("image_classifier", _load_image_classifier)
+model_registry.register("text_embedder", _load_text_embedder)
+model_registry.register("clip_tagger", _load_clip_tagger)
+model_registry.register("object_detector", _load_object_detector)
+model_registry.register("weaviate_client", _load_weaviate_client)
+
+
+def parse_model_names(value: str) -> List[str]:
+    """쉼표로 구분된 모델 이름 목록 파싱"""
+    return [name.strip() for name in value.split(",") if name.strip()]
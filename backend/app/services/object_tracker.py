@@ -0,0 +1,145 @@
+import itertools
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# (x1, y1, x2, y2)
+Box = Tuple[float, float, float, float]
+
+
+def iou(a: Box, b: Box) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    if intersection == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return intersection / (area_a + area_b - intersection)
+
+
+class Track:
+    """한 객체의 시간별 추적 상태"""
+
+    def __init__(self, track_id: int, label: str, box: Box, score: float, timestamp: float):
+        self.track_id = track_id
+        self.label = label
+        self.box = box
+        self.score = score
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.hits = 1  # 검출 모델에 잡힌 횟수
+        self.misses = 0  # 연속으로 검출되지 않은 횟수
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.track_id,
+            "label": self.label,
+            "start": round(self.first_seen, 2),
+            "end": round(self.last_seen, 2),
+            "hits": self.hits,
+            "score": round(self.score, 3),
+        }
+
+
+class IouTracker:
+    """검출 프레임 사이는 광학 흐름으로 박스를 옮기고, 검출 프레임에서는 IoU로 매칭하는 추적기"""
+
+    def __init__(self, iou_threshold: float = 0.3, max_misses: int = 2):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.active: List[Track] = []
+        self.finished: List[Track] = []
+        self._ids = itertools.count(1)
+
+    def update(self, detections: List[Dict[str, Any]], timestamp: float):
+        """검출 결과와 기존 트랙을 같은 라벨끼리 IoU가 큰 순서로 매칭"""
+        pairs = sorted(
+            ((iou(track.box, det["box"]), t, d)
+             for t, track in enumerate(self.active)
+             for d, det in enumerate(detections)
+             if track.label == det["label"]),
+            reverse=True
+        )
+        matched_tracks, matched_detections = set(), set()
+        for overlap, t, d in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if t in matched_tracks or d in matched_detections:
+                continue
+            track, det = self.active[t], detections[d]
+            track.box, track.score = det["box"], max(track.score, det["score"])
+            track.last_seen = timestamp
+            track.hits += 1
+            track.misses = 0
+            matched_tracks.add(t)
+            matched_detections.add(d)
+
+        survivors = []
+        for t, track in enumerate(self.active):
+            if t not in matched_tracks:
+                track.misses += 1
+            if track.misses > self.max_misses:
+                self.finished.append(track)
+            else:
+                survivors.append(track)
+
+        for d, det in enumerate(detections):
+            if d not in matched_detections:
+                survivors.append(Track(next(self._ids), det["label"], det["box"], det["score"], timestamp))
+        self.active = survivors
+
+    def propagate(self, prev_gray: np.ndarray, gray: np.ndarray, timestamp: float):
+        """검출하지 않는 프레임: 박스 안 특징점의 중앙값 이동만큼 박스 이동"""
+        height, width = gray.shape
+        for track in self.active:
+            x1, y1, x2, y2 = (int(v) for v in track.box)
+            x1, y1 = max(x1, 0), max(y1, 0)
+            x2, y2 = min(x2, width), min(y2, height)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                continue
+
+            points = cv2.goodFeaturesToTrack(prev_gray[y1:y2, x1:x2], maxCorners=20, qualityLevel=0.01, minDistance=3)
+            if points is None:
+                continue
+            points = points + np.array([x1, y1], dtype=np.float32)
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None)
+            valid = status.flatten() == 1
+            if not valid.any():
+                continue
+
+            dx, dy = np.median((moved - points)[valid].reshape(-1, 2), axis=0)
+            bx1, by1, bx2, by2 = track.box
+            track.box = (bx1 + dx, by1 + dy, bx2 + dx, by2 + dy)
+            track.last_seen = timestamp
+
+    def tracks(self) -> List[Track]:
+        """시작 시각 순으로 정렬된 전체 트랙"""
+        return sorted(self.finished + self.active, key=lambda track: (track.first_seen, track.track_id))
+
+
+def track_objects(frames: Iterable[Tuple[float, np.ndarray]],
+                  detect: Callable[[np.ndarray], List[Dict[str, Any]]],
+                  detection_interval: int,
+                  tracker: Optional[IouTracker] = None,
+                  min_hits: int = 1) -> List[Track]:
+    """k번째 프레임마다만 검출하고 사이 프레임은 추적으로 보간
+
+    frames는 (타임스탬프, BGR 프레임), detect는 BGR 프레임 → [{"label", "score", "box"}].
+    검출 프레임에서 min_hits번 이상 잡힌 트랙만 반환해 한 번 스친 오검출을 거른다
+    (영상이 짧아 검출 횟수가 min_hits보다 적으면 검출 횟수를 기준으로 함).
+    """
+    tracker = tracker or IouTracker()
+    prev_gray = None
+    detections_run = 0
+    for index, (timestamp, frame) in enumerate(frames):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if index % detection_interval == 0:
+            tracker.update(detect(frame), timestamp)
+            detections_run += 1
+        elif prev_gray is not None:
+            tracker.propagate(prev_gray, gray, timestamp)
+        prev_gray = gray
+    required = min(min_hits, detections_run)
+    return [track for track in tracker.tracks() if track.hits >= required]
@@ -0,0 +1,140 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Quiz, QuizPool, VideoAnalysis
+
+
+def create_video_analysis(db: Session, user_id: int, video_path: str, category: str) -> VideoAnalysis:
+    """분석 전 VideoAnalysis 행 생성 (키프레임 저장소 키로 id 사용)"""
+    analysis = VideoAnalysis(user_id=user_id, video_path=video_path, category=category)
+    db.add(analysis)
+    db.commit()
+    db.refresh(analysis)
+    return analysis
+
+
+def save_generated_quiz(db: Session, user_id: int, analysis: VideoAnalysis, result: Dict[str, Any]) -> Quiz:
+    """AIService.create_quiz_from_video 결과를 분석 행과 퀴즈 행에 저장"""
+    quiz_data = result["quiz"]
+    road_elements = json.dumps(result["road_elements"], ensure_ascii=False)
+
+    analysis.road_elements = road_elements
+    analysis.description = result["description"]
+
+    quiz = Quiz(
+        user_id=user_id,
+        category=result["category"],
+        question=quiz_data["question"],
+        options=json.dumps(quiz_data["options"], ensure_ascii=False),
+        correct_answer=quiz_data["correct"],
+        explanation=quiz_data["explanation"],
+        video_path=result["video_path"],
+        road_elements=road_elements,
+        ai_generated=True
+    )
+    db.add(quiz)
+    db.commit()
+    db.refresh(quiz)
+    return quiz
+
+
+def quiz_to_dict(quiz: Quiz) -> Dict[str, Any]:
+    """프론트엔드 응답 형식으로 변환"""
+    return {
+        "id": quiz.id,
+        "question": quiz.question,
+        "options": json.loads(quiz.options),
+        "correct_answer": quiz.correct_answer,
+        "explanation": quiz.explanation,
+        "category": quiz.category
+    }
+
+
+def count_pool_quizzes(db: Session, category: str) -> int:
+    """카테고리별 미리 생성된 퀴즈 재고 수"""
+    return db.query(QuizPool).filter(QuizPool.category == category).count()
+
+
+def _question_key(question: str) -> str:
+    """공백 차이만 있는 질문을 같은 질문으로 취급"""
+    return " ".join(question.split())
+
+
+def add_pool_quizzes(db: Session, category: str, quizzes: List[Dict[str, Any]]) -> int:
+    """생성된 퀴즈를 재고에 추가 (재고에 있거나 최근 QUIZ_POOL_DEDUP_WINDOW개 안에 출제된 질문은 제외)"""
+    recent = (
+        db.query(Quiz.question)
+        .filter(Quiz.category == category)
+        .order_by(Quiz.id.desc())
+        .limit(settings.QUIZ_POOL_DEDUP_WINDOW)
+    )
+    stocked = db.query(QuizPool.question).filter(QuizPool.category == category)
+    existing = {_question_key(question) for (question,) in list(recent) + list(stocked) if question}
+    added = 0
+    for quiz_data in quizzes:
+        key = _question_key(quiz_data["question"])
+        if key in existing:
+            continue
+        existing.add(key)
+        db.add(QuizPool(
+            category=category,
+            question=quiz_data["question"],
+            options=json.dumps(quiz_data["options"], ensure_ascii=False),
+            correct_answer=quiz_data["correct"],
+            explanation=quiz_data["explanation"]
+        ))
+        added += 1
+    db.commit()
+    return added
+
+
+def claim_pool_quiz(db: Session, user_id: int, category: str) -> Optional[Quiz]:
+    """재고에서 가장 오래된 퀴즈 하나를 꺼내 사용자 퀴즈로 저장
+
+    (category, id) 인덱스 조회 한 번으로 찾고, SKIP LOCKED로 동시 요청끼리 같은 행을 기다리지 않는다.
+    """
+    entry = (
+        db.query(QuizPool)
+        .filter(QuizPool.category == category)
+        .order_by(QuizPool.id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if entry is None:
+        db.rollback()
+        return None
+
+    quiz = Quiz(
+        user_id=user_id,
+        category=entry.category,
+        question=entry.question,
+        options=entry.options,
+        correct_answer=entry.correct_answer,
+        explanation=entry.explanation,
+        ai_generated=True
+    )
+    db.add(quiz)
+    db.delete(entry)
+    db.commit()
+    db.refresh(quiz)
+    return quiz
+
+
+def save_default_quiz(db: Session, user_id: int, category: str, quiz_data: Dict[str, Any]) -> Quiz:
+    """재고가 없을 때 기본 퀴즈를 사용자 퀴즈로 저장 (답안 제출에 id가 필요)"""
+    quiz = Quiz(
+        user_id=user_id,
+        category=category,
+        question=quiz_data["question"],
+        options=json.dumps(quiz_data["options"], ensure_ascii=False),
+        correct_answer=quiz_data["correct"],
+        explanation=quiz_data["explanation"],
+        ai_generated=False
+    )
+    db.add(quiz)
+    db.commit()
+    db.refresh(quiz)
+    return quiz
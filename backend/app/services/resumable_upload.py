@@ -0,0 +1,224 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.services.upload_service import finalize_upload, payload_too_large
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+# 완료 후 해시 검증 시 읽기 단위
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def parse_content_range(value: Optional[str]):
+    """'bytes start-end/total' 헤더를 (start, end, total)로 변환 (end 포함)"""
+    match = CONTENT_RANGE_PATTERN.match(value or "")
+    if not match:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content-Range: bytes start-end/total required")
+    start, end, total = (int(group) for group in match.groups())
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Range")
+    return start, end, total
+
+
+class UploadSessionStore:
+    """이어받기 가능한 업로드 세션 저장소
+
+    세션 메타데이터는 JSON 파일, 받은 바이트는 .part 파일로 UPLOAD_DIR/sessions에 둔다.
+    현재 오프셋은 .part 파일 크기로 판단하므로 워커가 재시작돼도 이어서 받을 수 있고,
+    청크 쓰기는 파일 잠금으로 직렬화해 여러 워커 프로세스에서도 안전하다.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: Optional[int] = None):
+        self.root = root or os.path.join(settings.UPLOAD_DIR, "sessions")
+        self.ttl = ttl or settings.UPLOAD_SESSION_TTL
+
+    def _meta_path(self, session_id: str) -> str:
+        return os.path.join(self.root, f"{session_id}.json")
+
+    def _data_path(self, session_id: str) -> str:
+        return os.path.join(self.root, f"{session_id}.part")
+
+    def _write_meta(self, session: Dict[str, Any]):
+        path = self._meta_path(session["id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(session, f)
+        os.replace(tmp_path, path)
+
+    def offset(self, session_id: str) -> int:
+        path = self._data_path(session_id)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def create(self, user_id: int, filename: str, size: int, category: str,
+               sha256: Optional[str] = None) -> Dict[str, Any]:
+        if size <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload size must be positive")
+        if size > settings.MAX_FILE_SIZE:
+            raise payload_too_large()
+
+        os.makedirs(self.root, exist_ok=True)
+        self.purge_expired()
+
+        session = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "filename": filename,
+            "size": size,
+            "category": category,
+            "sha256": sha256.lower() if sha256 else None,
+            "expires_at": time.time() + self.ttl
+        }
+        open(self._data_path(session["id"]), "wb").close()
+        self._write_meta(session)
+        return session
+
+    def get(self, session_id: str, user_id: int) -> Dict[str, Any]:
+        """세션 조회 (없거나 만료됐거나 다른 사용자의 세션이면 404)"""
+        path = self._meta_path(session_id)
+        if not SESSION_ID_PATTERN.match(session_id) or not os.path.exists(path):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+        with open(path) as f:
+            session = json.load(f)
+        if session["user_id"] != user_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+        if session["expires_at"] < time.time():
+            self.delete(session_id)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session expired")
+        return session
+
+    @contextmanager
+    def _locked(self, session_id: str, blocking: bool = True):
+        """세션 .part 파일 배타 잠금
+
+        blocking=False면 다른 요청이 쓰는 중일 때 기다리지 않고 409와 현재 오프셋을 반환한다.
+        이벤트 루프에서는 반드시 blocking=False로 호출해야 한다 (같은 워커의 다른 요청이 잠금을
+        쥔 채 다음 청크를 기다리는 중이면 루프 전체가 멈춤).
+        """
+        with open(self._data_path(session_id), "ab") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={"message": "Upload in progress", "offset": self.offset(session_id)}
+                )
+            # 잠금을 기다리는 동안 다른 워커가 이어 썼을 수 있으므로 끝으로 다시 이동
+            f.seek(0, os.SEEK_END)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    async def write_range(self, session: Dict[str, Any], start: int, end: int, total: int,
+                          body: AsyncIterator[bytes]) -> int:
+        """Content-Range 구간을 .part 파일 끝에 이어 쓰고 새 오프셋 반환
+
+        구간은 현재 오프셋부터 순서대로만 받는다 (어긋나거나 같은 세션에 다른 요청이 쓰는 중이면
+        409와 현재 오프셋을 알려줌).
+        """
+        if total != session["size"] or end >= total:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content-Range does not match upload size")
+        if end - start + 1 > settings.UPLOAD_CHUNK_MAX_SIZE:
+            raise payload_too_large()
+
+        with self._locked(session["id"], blocking=False) as f:
+            offset = f.tell()
+            if start != offset:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={"message": "Unexpected range start", "offset": offset}
+                )
+
+            expected = end - start + 1
+            received = 0
+            try:
+                async for chunk in body:
+                    received += len(chunk)
+                    if received > expected:
+                        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body longer than Content-Range")
+                    f.write(chunk)
+            except Exception:
+                # 연결이 끊기거나 잘못된 본문이면 이번 구간 전체를 되돌려 오프셋을 일관되게 유지
+                f.truncate(offset)
+                raise
+            if received != expected:
+                f.truncate(offset)
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body shorter than Content-Range")
+            f.flush()
+            return f.tell()
+
+    def complete(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """크기/체크섬 검증 후 내용 해시 기반 경로로 이동 (스레드풀에서 호출)"""
+        session_id = session["id"]
+        with self._locked(session_id) as f:
+            size = f.tell()
+            if size != session["size"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={"message": "Upload incomplete", "offset": size}
+                )
+
+            # 요청마다 나눠 받아 해시 상태를 이어갈 수 없으므로 완료 시 한 번 계산
+            digest = hashlib.sha256()
+            with open(self._data_path(session_id), "rb") as data:
+                for chunk in iter(lambda: data.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+            if session["sha256"] and session["sha256"] != sha256:
+                self.delete(session_id)
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Checksum mismatch")
+
+            path = finalize_upload(self._data_path(session_id), sha256, session["filename"])
+
+        os.remove(self._meta_path(session_id))
+        return {"path": path, "sha256": sha256, "size": size}
+
+    def delete(self, session_id: str):
+        for path in (self._meta_path(session_id), self._data_path(session_id)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def purge_expired(self) -> int:
+        """만료된 세션과 메타데이터 없는 .part 파일 정리"""
+        if not os.path.isdir(self.root):
+            return 0
+
+        now = time.time()
+        removed = 0
+        for name in os.listdir(self.root):
+            session_id, ext = os.path.splitext(name)
+            path = os.path.join(self.root, name)
+            try:
+                if ext == ".json":
+                    with open(path) as f:
+                        expired = json.load(f)["expires_at"] < now
+                elif ext == ".part":
+                    expired = not os.path.exists(self._meta_path(session_id)) and os.path.getmtime(path) + self.ttl < now
+                else:
+                    continue
+            except (OSError, ValueError, KeyError):
+                continue
+            if expired:
+                self.delete(session_id)
+                removed += 1
+
+        if removed:
+            logger.info(f"Purged {removed} expired upload sessions")
+        return removed
+
+
+upload_sessions = UploadSessionStore()
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import tempfile
+import logging
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v"}
+
+# 파일이 아닌 폼 필드(category 등)의 최대 크기
+MAX_FIELD_SIZE = 64 * 1024
+
+
+class StreamedUpload:
+    """디스크에 바로 저장된 업로드 파일 정보"""
+
+    def __init__(self, path: str, filename: str, size: int, sha256: str, fields: Dict[str, str]):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.fields = fields
+
+
+def video_extension(filename: Optional[str]) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if ext in ALLOWED_VIDEO_EXTENSIONS else ".mp4"
+
+
+def finalize_upload(tmp_path: str, sha256: str, filename: Optional[str]) -> str:
+    """임시 파일을 내용 해시 기반 경로로 이동 (같은 영상이 이미 있으면 임시 파일 삭제)"""
+    path = os.path.join(settings.UPLOAD_DIR, sha256 + video_extension(filename))
+    if os.path.exists(path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    return path
+
+
+def payload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds maximum size of {settings.MAX_FILE_SIZE} bytes"
+    )
+
+
+def invalid_field(name: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name}")
+
+
+class _MultipartStreamHandler:
+    """멀티파트 파서 콜백: 파일 파트는 디스크에 쓰면서 해시/크기 계산, 나머지 필드는 메모리에 보관"""
+
+    def __init__(self, file_field: str, file_obj, max_size: int,
+                 field_validators: Optional[Dict[str, Callable[[Optional[str]], bool]]] = None):
+        self.file_field = file_field
+        self.file_obj = file_obj
+        self.max_size = max_size
+        self.field_validators = field_validators or {}
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.filename: Optional[str] = None
+        self.file_received = False
+        self.fields: Dict[str, str] = {}
+
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name: Optional[str] = None
+        self._is_file = False
+        self._field_data = bytearray()
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._field_data = bytearray()
+
+    def on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8")
+        self._is_file = self._name == self.file_field and b"filename" in options
+        if self._is_file:
+            self.filename = options[b"filename"].decode("utf-8")
+
+    def on_part_data(self, data, start, end):
+        chunk = data[start:end]
+        if self._is_file:
+            self.size += len(chunk)
+            if self.size > self.max_size:
+                raise payload_too_large()
+            self.digest.update(chunk)
+            self.file_obj.write(chunk)
+        else:
+            self._field_data += chunk
+            if len(self._field_data) > MAX_FIELD_SIZE:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Field '{self._name}' is too large")
+
+    def on_part_end(self):
+        if self._is_file:
+            self.file_received = True
+        elif self._name:
+            value = self._field_data.decode("utf-8")
+            # 파일보다 앞에 온 필드가 잘못됐으면 영상 본문을 받기 전에 중단
+            validator = self.field_validators.get(self._name)
+            if validator is not None and not validator(value):
+                raise invalid_field(self._name)
+            self.fields[self._name] = value
+
+    def validate_fields(self):
+        """빠졌거나 파일 뒤에 온 필드까지 포함해 모든 필드 검사"""
+        for name, validator in self.field_validators.items():
+            if not validator(self.fields.get(name)):
+                raise invalid_field(name)
+
+
+async def stream_multipart_upload(request: Request, file_field: str = "video", max_size: Optional[int] = None,
+                                  field_validators: Optional[Dict[str, Callable[[Optional[str]], bool]]] = None
+                                  ) -> StreamedUpload:
+    """multipart/form-data 요청 본문을 청크 단위로 UPLOAD_DIR에 저장
+
+    메모리에 파일 전체를 올리거나 임시 파일에 한 번 더 쓰지 않으며,
+    크기 제한을 넘는 순간 수신을 중단하고 413을 반환한다.
+    field_validators(필드 이름 → 검사 함수)를 통과하지 못하면 임시 파일을 지우고 400을 반환한다.
+    """
+    max_size = max_size or settings.MAX_FILE_SIZE
+
+    # Content-Length만으로도 초과가 확실하면 본문을 읽기 전에 거절
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + MAX_FIELD_SIZE:
+        raise payload_too_large()
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="multipart/form-data request required")
+
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=settings.UPLOAD_DIR, suffix=".part", delete=False)
+    handler = _MultipartStreamHandler(file_field, tmp, max_size, field_validators)
+    parser = MultipartParser(boundary, handler.callbacks())
+
+    try:
+        with tmp:
+            async for chunk in request.stream():
+                parser.write(chunk)
+            parser.finalize()
+        # 내용 해시 경로로 옮기기 전에 검사 (옮긴 뒤에는 같은 영상의 다른 업로드와 파일을 공유할 수 있음)
+        handler.validate_fields()
+    except Exception:
+        os.remove(tmp.name)
+        raise
+
+    if not handler.file_received:
+        os.remove(tmp.name)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing file field '{file_field}'")
+
+    sha256 = handler.digest.hexdigest()
+    path = finalize_upload(tmp.name, sha256, handler.filename)
+    logger.info(f"Stored upload {handler.filename} ({handler.size} bytes) at {path}")
+    return StreamedUpload(path, handler.filename, handler.size, sha256, handler.fields)
@@ -0,0 +1,223 @@
+import json
+import threading
+import time
+import logging
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import redis
+
+from app.core.config import settings
+from app.services.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 밝기 변화가 거의 없는 프레임(검은 화면 등)은 모든 영상과 일치하므로 제외
+MIN_FRAME_STDDEV = 5.0
+
+# 다중 인덱스 해싱 구간 수 (64비트 해시를 16비트씩 나눔)
+HASH_BANDS = 4
+BAND_BITS = 64 // HASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# 이전 형식(단일 해시 phash:index)과 겹치지 않는 이름 사용 (이전 키는 TTL로 만료)
+REDIS_INDEX_KEY = "phash:videos"
+REDIS_ENTRY_PREFIX = "phash"
+
+
+def dhash(frame: np.ndarray) -> Optional[int]:
+    """프레임의 64비트 difference hash 계산"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    if small.std() < MIN_FRAME_STDDEV:
+        return None
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(radius: int) -> Tuple[int, ...]:
+    """한 구간 안에서 radius비트 이하를 바꾸는 XOR 마스크 목록"""
+    return tuple(
+        sum(1 << bit for bit in bits)
+        for count in range(radius + 1) for bits in combinations(range(BAND_BITS), count)
+    )
+
+
+class MultiIndexHash:
+    """해밍 거리 검색용 다중 인덱스 해싱
+
+    64비트 해시를 16비트 구간 4개로 나눠 구간별 사전에 넣는다. 두 해시의 거리가 r 이하면 적어도
+    한 구간은 r // 4비트 이하만 다르므로, 각 구간에서 그만큼만 비트를 바꾼 값을 조회해 후보를 찾고
+    전체 거리로 확인한다. 추가만 하므로 다른 스레드가 추가하는 동안에도 잠금 없이 검색할 수 있다.
+    """
+
+    def __init__(self):
+        self.tables: List[Dict[int, List[int]]] = [{} for _ in range(HASH_BANDS)]
+        self.items: List[Tuple[int, str]] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.items)
+
+    def add(self, item: int, value: str):
+        # 항목을 먼저 넣어야 구간 사전에서 찾은 번호가 항상 유효함
+        index = len(self.items)
+        self.items.append((item, value))
+        for band, table in enumerate(self.tables):
+            table.setdefault((item >> (band * BAND_BITS)) & BAND_MASK, []).append(index)
+
+    def search(self, item: int, max_distance: int) -> List[Tuple[int, str]]:
+        """(거리, 값) 목록 반환"""
+        masks = _flip_masks(max_distance // HASH_BANDS)
+        seen = set()
+        matches = []
+        for band, table in enumerate(self.tables):
+            key = (item >> (band * BAND_BITS)) & BAND_MASK
+            for mask in masks:
+                for index in table.get(key ^ mask, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    stored, value = self.items[index]
+                    distance = hamming_distance(item, stored)
+                    if distance <= max_distance:
+                        matches.append((distance, value))
+        return matches
+
+
+class NearDuplicateIndex:
+    """키프레임 perceptual hash로 재인코딩/잘린 영상을 찾는 인덱스
+
+    프로세스 내 다중 인덱스 해싱으로 검색하고, 워커 간 공유와 재시작을 위해 Redis에도 저장한다.
+    영상별 해시는 각자 TTL을 가진 키(phash:{content_hash})에 두고, 추가 순서는 정렬 집합
+    (phash:videos, 점수=추가 시각)으로 관리해 NEAR_DUP_MAX_VIDEOS개를 넘으면 오래된 것부터 뺀다.
+    로컬 인덱스는 마지막으로 본 점수 이후 추가된 영상만 가져와 이어 붙인다.
+    잠금은 로컬 인덱스를 바꿀 때만 잡고, Redis 조회와 검색은 잠금 밖에서 한다.
+    """
+
+    def __init__(self):
+        self.index = MultiIndexHash()
+        self._indexed: Dict[str, List[int]] = {}
+        self._synced_score = 0.0
+        self._lock = threading.Lock()
+
+    def _entry_key(self, content_hash: str) -> str:
+        return f"{REDIS_ENTRY_PREFIX}:{content_hash}"
+
+    def _add_local(self, content_hash: str, frame_hashes: List[int]):
+        if content_hash in self._indexed:
+            return
+        self._indexed[content_hash] = frame_hashes
+        for frame_hash in frame_hashes:
+            self.index.add(frame_hash, content_hash)
+
+    def _rebuild_local(self, live: Dict[str, List[int]]):
+        """인덱스는 삭제를 지원하지 않으므로 살아 있는 항목으로 새로 만들어 교체 (검색 중인 스레드는 이전 인덱스 사용)"""
+        index = MultiIndexHash()
+        for content_hash, frame_hashes in live.items():
+            for frame_hash in frame_hashes:
+                index.add(frame_hash, content_hash)
+        with self._lock:
+            self.index = index
+            self._indexed = dict(live)
+
+    def _sync_from_redis(self):
+        """다른 워커가 추가한 영상만 로컬 인덱스에 반영"""
+        synced_score = self._synced_score
+        try:
+            client = get_redis_client()
+            entries = client.zrangebyscore(REDIS_INDEX_KEY, synced_score, "+inf", withscores=True)
+            new = [(member.decode(), score) for member, score in entries if member.decode() not in self._indexed]
+            values = client.mget([self._entry_key(content_hash) for content_hash, _ in new]) if new else []
+        except redis.RedisError as e:
+            logger.warning(f"Near-duplicate index sync failed: {str(e)}")
+            return
+
+        with self._lock:
+            for (content_hash, _), value in zip(new, values):
+                if value is not None:
+                    self._add_local(content_hash, json.loads(value))
+            if entries:
+                self._synced_score = max(self._synced_score, entries[-1][1])
+            oversized = len(self._indexed) > settings.NEAR_DUP_MAX_VIDEOS * 1.5
+
+        if oversized:
+            self._reload_live()
+
+    def _reload_live(self):
+        try:
+            client = get_redis_client()
+            members = [member.decode() for member in client.zrange(REDIS_INDEX_KEY, 0, -1)]
+            values = client.mget([self._entry_key(content_hash) for content_hash in members]) if members else []
+        except redis.RedisError as e:
+            logger.warning(f"Near-duplicate index reload failed: {str(e)}")
+            return
+        self._rebuild_local({
+            content_hash: json.loads(value)
+            for content_hash, value in zip(members, values) if value is not None
+        })
+
+    def add(self, content_hash: str, frame_hashes: Iterable[Optional[int]]):
+        frame_hashes = [h for h in frame_hashes if h is not None]
+        if not frame_hashes:
+            return
+
+        with self._lock:
+            self._add_local(content_hash, frame_hashes)
+        try:
+            now = time.time()
+            pipe = get_redis_client().pipeline()
+            pipe.set(self._entry_key(content_hash), json.dumps(frame_hashes), ex=settings.ANALYSIS_CACHE_TTL)
+            pipe.zadd(REDIS_INDEX_KEY, {content_hash: now})
+            # 해시 키가 만료된 항목과 최대 개수를 넘는 오래된 항목 제거
+            pipe.zremrangebyscore(REDIS_INDEX_KEY, "-inf", now - settings.ANALYSIS_CACHE_TTL)
+            pipe.zremrangebyrank(REDIS_INDEX_KEY, 0, -settings.NEAR_DUP_MAX_VIDEOS - 1)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Near-duplicate index write failed: {str(e)}")
+
+    def find(self, frame_hashes: Iterable[Optional[int]], exclude: Optional[str] = None) -> Optional[str]:
+        """충분히 많은 키프레임이 일치하는 기존 영상의 content hash 반환"""
+        frame_hashes = [h for h in frame_hashes if h is not None]
+        if not frame_hashes:
+            return None
+
+        self._sync_from_redis()
+        # 교체되더라도 이 검색은 지금 인덱스로 끝까지 진행
+        index = self.index
+        votes: Counter = Counter()
+        for frame_hash in frame_hashes:
+            # 한 키프레임은 영상당 한 표만 행사
+            matched = {value for _, value in index.search(frame_hash, settings.NEAR_DUP_MAX_DISTANCE)}
+            votes.update(matched - {exclude})
+
+        if not votes:
+            return None
+        content_hash, count = votes.most_common(1)[0]
+        if count / len(frame_hashes) < settings.NEAR_DUP_MIN_MATCH_RATIO:
+            return None
+        return content_hash
+
+
+def fingerprint_frames(frames: List[np.ndarray]) -> List[Optional[int]]:
+    """분석용으로 이미 디코딩한 프레임에서 고르게 NEAR_DUP_MAX_FINGERPRINTS개 이하를 골라 해시 계산"""
+    count = min(len(frames), settings.NEAR_DUP_MAX_FINGERPRINTS)
+    if count == 0:
+        return []
+    step = len(frames) / count
+    return [dhash(frames[int(step * (i + 0.5))]) for i in range(count)]
+
+
+near_duplicate_index = NearDuplicateIndex()
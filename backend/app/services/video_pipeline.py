@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 디코더 스레드 종료 표시
+_END = object()
+
+
+class PipelineStats:
+    """파이프라인 1회 실행의 단계별 소요 시간 및 큐 상태"""
+
+    def __init__(self, queue_size: int, batch_size: int):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.frames = 0
+        self.batches = 0
+        self.decode_time = 0.0  # 프레임 디코딩 (디코더 스레드)
+        self.preprocess_time = 0.0  # 색상 변환 등 전처리 (디코더 스레드)
+        self.producer_blocked_time = 0.0  # 큐가 가득 차 디코더가 대기한 시간
+        self.consumer_wait_time = 0.0  # 큐가 비어 추론 단계가 대기한 시간
+        self.inference_time = 0.0  # 모델 추론
+        self.total_time = 0.0
+        self.max_queue_depth = 0
+        self._depth_sum = 0
+        self._depth_samples = 0
+
+    def sample_depth(self, depth: int):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_sum += depth
+        self._depth_samples += 1
+
+    @property
+    def avg_queue_depth(self) -> float:
+        return self._depth_sum / self._depth_samples if self._depth_samples else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queue_size": self.queue_size,
+            "batch_size": self.batch_size,
+            "frames": self.frames,
+            "batches": self.batches,
+            "decode_time": round(self.decode_time, 4),
+            "preprocess_time": round(self.preprocess_time, 4),
+            "producer_blocked_time": round(self.producer_blocked_time, 4),
+            "consumer_wait_time": round(self.consumer_wait_time, 4),
+            "inference_time": round(self.inference_time, 4),
+            "total_time": round(self.total_time, 4),
+            "max_queue_depth": self.max_queue_depth,
+            "avg_queue_depth": round(self.avg_queue_depth, 2),
+        }
+
+
+class PipelineMetrics:
+    """프로세스 전체 파이프라인 실행 통계 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.active_runs = 0
+        self.totals: Dict[str, float] = {}
+        self.max_queue_depth = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        with self._lock:
+            self.active_runs += 1
+
+    def record(self, stats: PipelineStats):
+        data = stats.as_dict()
+        with self._lock:
+            self.active_runs -= 1
+            self.runs += 1
+            for key in ("frames", "batches", "decode_time", "preprocess_time", "producer_blocked_time",
+                        "consumer_wait_time", "inference_time", "total_time"):
+                self.totals[key] = self.totals.get(key, 0) + data[key]
+            self.max_queue_depth = max(self.max_queue_depth, stats.max_queue_depth)
+            self.last_run = data
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            averages = {key: round(value / self.runs, 4) for key, value in self.totals.items()} if self.runs else {}
+            return {
+                "runs": self.runs,
+                "active_runs": self.active_runs,
+                "max_queue_depth": self.max_queue_depth,
+                "averages": averages,
+                "last_run": self.last_run,
+            }
+
+
+pipeline_metrics = PipelineMetrics()
+
+
+class FramePipeline:
+    """디코더 스레드와 추론 단계를 제한된 큐로 연결하는 스트리밍 파이프라인
+
+    OpenCV 디코딩은 GIL을 해제하므로 디코딩/전처리와 모델 추론이 겹쳐 실행된다.
+    """
+
+    def __init__(self, preprocess: Callable[[Any], Any], infer: Callable[[List[Any]], List[Any]],
+                 batch_size: int, queue_size: int):
+        self.preprocess = preprocess
+        self.infer = infer
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def _produce(self, frames: Iterable[Any], frame_queue: queue.Queue, stats: PipelineStats,
+                 stop: threading.Event):
+        """디코더 스레드: 프레임 디코딩 → 전처리 → 큐 적재"""
+        try:
+            iterator = iter(frames)
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    frame = next(iterator)
+                except StopIteration:
+                    break
+                decoded = time.perf_counter()
+                item = self.preprocess(frame)
+                preprocessed = time.perf_counter()
+                frame_queue.put(item)
+                stats.decode_time += decoded - started
+                stats.preprocess_time += preprocessed - decoded
+                stats.producer_blocked_time += time.perf_counter() - preprocessed
+        except Exception as e:
+            frame_queue.put(e)
+            return
+        frame_queue.put(_END)
+
+    def _infer_batch(self, batch: List[Any], results: List[Any], stats: PipelineStats):
+        started = time.perf_counter()
+        results.extend(self.infer(batch))
+        stats.inference_time += time.perf_counter() - started
+        stats.frames += len(batch)
+        stats.batches += 1
+
+    def run(self, frames: Iterable[Any]) -> List[Any]:
+        """프레임별 추론 결과를 입력 순서대로 반환"""
+        stats = PipelineStats(self.queue_size, self.batch_size)
+        frame_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(frames, frame_queue, stats, stop), daemon=True)
+
+        pipeline_metrics.start()
+        started = time.perf_counter()
+        producer.start()
+        results: List[Any] = []
+        batch: List[Any] = []
+        try:
+            while True:
+                stats.sample_depth(frame_queue.qsize())
+                waited = time.perf_counter()
+                item = frame_queue.get()
+                stats.consumer_wait_time += time.perf_counter() - waited
+
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                batch.append(item)
+                if len(batch) == self.batch_size:
+                    self._infer_batch(batch, results, stats)
+                    batch = []
+
+            if batch:
+                self._infer_batch(batch, results, stats)
+        finally:
+            # 추론 단계 오류 시 디코더 스레드가 큐에서 막히지 않도록 비움
+            stop.set()
+            while producer.is_alive():
+                try:
+                    frame_queue.get_nowait()
+                except queue.Empty:
+                    producer.join(timeout=0.05)
+            stats.total_time = time.perf_counter() - started
+            pipeline_metrics.record(stats)
+            logger.info(f"Frame pipeline finished: {stats.as_dict()}")
+
+        return results
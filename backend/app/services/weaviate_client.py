@@ -1,5 +1,7 @@
 import weaviate
+from typing import Any, Dict, List, Optional
 from app.core.config import settings
+from app.services.model_registry import model_registry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,68 @@ def get_weaviate_client():
         logger.error(f"Failed to connect to Weaviate: {str(e)}")
         return None
 
+def byo_vectors(vectorizer: Optional[str] = None) -> bool:
+    """벡터를 직접 계산해 전달하는 모드인지 (vectorizer: none)"""
+    return (vectorizer or settings.WEAVIATE_VECTORIZER) == "none"
+
+def quiz_text(quiz_data: Dict[str, Any]) -> str:
+    """퀴즈 객체 벡터의 원문 (질문 + 보기)"""
+    return f"{quiz_data['question']} {' '.join(quiz_data.get('options') or [])}"
+
+def embed_text(text: str) -> List[float]:
+    """저장과 검색에 같은 텍스트 임베딩 모델(TEXT_EMBED_MODEL) 사용"""
+    return model_registry.get("text_embedder").encode(text).tolist()
+
+def with_similarity(query, text: str):
+    """퀴즈 검색 쿼리에 유사도 조건 추가 (모드에 따라 near_vector 또는 near_text)"""
+    if byo_vectors():
+        return query.with_near_vector({"vector": embed_text(text)})
+    return query.with_near_text({"concepts": [text]})
+
+def quiz_class_schema(vectorizer: Optional[str] = None) -> Dict[str, Any]:
+    """Quiz 클래스 스키마 (vectorizer, 기본값 WEAVIATE_VECTORIZER에 따라 벡터 생성 방식 결정)"""
+    properties = [
+        {"name": "question", "dataType": ["text"], "description": "퀴즈 문제"},
+        {"name": "options", "dataType": ["text[]"], "description": "보기"},
+        {"name": "correct_answer", "dataType": ["int"], "description": "정답 인덱스"},
+        {"name": "explanation", "dataType": ["text"], "description": "정답 설명"},
+        {"name": "category", "dataType": ["text"], "description": "퀴즈 카테고리"},
+        {"name": "road_elements", "dataType": ["text[]"], "description": "감지된 도로 요소"},
+        {"name": "description", "dataType": ["text"], "description": "도로 상황 설명"},
+        {"name": "difficulty", "dataType": ["text"], "description": "문제 난이도"}
+    ]
+
+    if byo_vectors(vectorizer):
+        # 벡터는 text_embedder로 계산해 객체마다 전달 (Weaviate 쪽 벡터화 없음)
+        return {
+            "class": "Quiz",
+            "description": "도로 주행 퀴즈 문제",
+            "vectorizer": "none",
+            "properties": properties
+        }
+
+    # text2vec-transformers 모드: 질문만 벡터화
+    for prop in properties:
+        prop["moduleConfig"] = {
+            "text2vec-transformers": {
+                "skip": prop["name"] != "question",
+                "vectorizePropertyName": False
+            }
+        }
+    return {
+        "class": "Quiz",
+        "description": "도로 주행 퀴즈 문제",
+        "vectorizer": "text2vec-transformers",
+        "moduleConfig": {
+            "text2vec-transformers": {
+                "model": "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+                "poolingStrategy": "mean",
+                "vectorizeClassName": False
+            }
+        },
+        "properties": properties
+    }
+
 def init_weaviate_schema():
     """
     Weaviate 스키마 초기화
@@ -30,50 +94,23 @@ def init_weaviate_schema():
         return False
 
     try:
-        # Quiz 클래스 스키마
-        quiz_class = {
-            "class": "Quiz",
-            "description": "도로 주행 퀴즈 문제",
-            "vectorizer": "text2vec-transformers",
-            "moduleConfig": {
-                "text2vec-transformers": {
-                    "model": "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-                    "poolingStrategy": "mean",
-                    "vectorizeClassName": False
-                }
-            },
-            "properties": [
-                {
-                    "name": "question",
-                    "dataType": ["text"],
-                    "description": "퀴즈 문제",
-                    "moduleConfig": {
-                        "text2vec-transformers": {
-                            "skip": False,
-                            "vectorizePropertyName": False
-                        }
-                    }
-                },
-                {
-                    "name": "category",
-                    "dataType": ["text"],
-                    "description": "퀴즈 카테고리"
-                },
-                {
-                    "name": "difficulty",
-                    "dataType": ["text"],
-                    "description": "문제 난이도"
-                }
-            ]
-        }
+        quiz_class = quiz_class_schema()
 
         # 기존 스키마가 있는지 확인
         if not client.schema.exists("Quiz"):
             client.schema.create_class(quiz_class)
             logger.info("Quiz class schema created successfully")
+        else:
+            existing = client.schema.get("Quiz").get("vectorizer")
+            if existing != quiz_class["vectorizer"]:
+                # vectorizer는 변경할 수 없으므로 클래스를 다시 만들고 기존 객체를 재임베딩해야 함
+                logger.warning(
+                    f"Quiz class uses vectorizer '{existing}' but WEAVIATE_VECTORIZER is "
+                    f"'{quiz_class['vectorizer']}'; run migrate_weaviate_vectors.py to switch modes"
+                )
 
         return True
 
     except Exception as e:
         logger.error(f"Failed to initialize Weaviate schema: {str(e)}")
-        return False
\ No newline at end of file
+        return False
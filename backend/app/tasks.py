@@ -0,0 +1,286 @@
+from typing import Any, Callable, Dict, Optional
+
+from celery import chain
+from sqlalchemy.orm import Session
+
+from app.celery import celery
+from app.database import SessionLocal
+from app.models import VideoAnalysis
+from app.core.config import settings
+from app.services.ai_service import AIService, TRAFFIC_KEYWORDS
+from app.services.cache import get_redis_client
+from app.services.job_store import job_store
+from app.services.job_scheduler import get_job_scheduler
+from app.services.resumable_upload import upload_sessions
+from app.services.quiz_service import (
+    create_video_analysis, save_generated_quiz, quiz_to_dict, count_pool_quizzes, add_pool_quizzes
+)
+
+# 단계 사이에는 JSON으로 직렬화 가능한 payload dict만 전달한다 (프레임 배열은 keyframe_store에 저장)
+
+
+def partial_emitter(job_id: str) -> Callable[[str, Any], None]:
+    """스트리밍 중 완성된 필드를 바로 SSE 이벤트로 전달 (설명 → description, 퀴즈 필드 → quiz_partial)"""
+    partial: Dict[str, Any] = {}
+
+    def on_field(key: str, value: Any):
+        if key == "description":
+            job_store.emit(job_id, "description", value)
+        else:
+            partial[key] = value
+            job_store.emit(job_id, "quiz_partial", dict(partial))
+    return on_field
+
+
+@celery.task(name="quiz.analyze")
+def analyze_video_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """1단계: 키프레임 추출 및 도로 요소 분석"""
+    with job_store.stage(payload["job_id"], "analyze"):
+        analysis = AIService().analyze_video_stage(
+            payload["video_path"],
+            content_hash=payload["content_hash"],
+            analysis_id=payload["analysis_id"]
+        )
+    job_store.emit(payload["job_id"], "road_elements", analysis["road_elements"])
+    return dict(payload, analysis=analysis)
+
+
+@celery.task(name="quiz.describe")
+def describe_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """2단계: 상황 설명 생성"""
+    with job_store.stage(payload["job_id"], "describe"):
+        analysis = AIService().describe_stage(payload["analysis"], payload["category"], partial_emitter(payload["job_id"]))
+    job_store.emit(payload["job_id"], "description", analysis["description"])
+    return dict(payload, analysis=analysis)
+
+
+@celery.task(name="quiz.generate")
+def generate_quiz_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """3단계: 상황 설명으로 퀴즈 생성"""
+    with job_store.stage(payload["job_id"], "generate"):
+        quiz = AIService().quiz_stage(
+            payload["analysis"], payload["category"], partial_emitter(payload["job_id"]), payload["user_id"]
+        )
+    job_store.emit(payload["job_id"], "quiz", quiz)
+    return dict(payload, quiz=quiz)
+
+
+@celery.task(name="quiz.persist")
+def persist_quiz_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """4단계: MariaDB와 Weaviate에 저장 후 작업 결과 기록
+
+    같은 영상 처리 결과를 공유받은 작업(shared)은 처리 담당이 이미 Weaviate에 저장했으므로 DB에만 저장한다.
+    """
+    job_id = payload["job_id"]
+    analysis = payload["analysis"]
+    with job_store.stage(job_id, "persist"):
+        result = {
+            "video_path": payload["video_path"],
+            "road_elements": analysis["road_elements"],
+            "description": analysis["description"],
+            "quiz": payload["quiz"],
+            "category": payload["category"]
+        }
+        db = SessionLocal()
+        try:
+            video_analysis = db.query(VideoAnalysis).filter(VideoAnalysis.id == payload["analysis_id"]).one()
+            quiz = quiz_to_dict(save_generated_quiz(db, payload["user_id"], video_analysis, result))
+        finally:
+            db.close()
+
+        if not payload.get("shared"):
+            AIService().store_in_weaviate(payload["quiz"], {
+                "road_elements": analysis["road_elements"],
+                "description": analysis["description"],
+                "category": payload["category"]
+            })
+
+    response = {
+        "quiz": quiz,
+        "analysis": {
+            "id": payload["analysis_id"],
+            "road_elements": analysis["road_elements"],
+            "description": analysis["description"]
+        },
+        "cache_hit": analysis["cache_hit"]
+    }
+    job_store.succeed(job_id, response)
+    return dict(payload, result=response)
+
+
+def build_quiz_chain(payload: Dict[str, Any]):
+    """단계별 작업을 브로커로 잇는 체인 (마지막에 스케줄러 정리, 실패 시 quiz.failed)"""
+    return chain(
+        analyze_video_task.s(payload),
+        describe_task.s(),
+        generate_quiz_task.s(),
+        persist_quiz_task.s(),
+        finish_quiz_job.s()
+    ).on_error(quiz_job_failed.si(payload))
+
+
+def share_result(leader: Dict[str, Any], waiter: Dict[str, Any]):
+    """같은 영상을 기다리던 작업에 처리 결과 공유
+
+    카테고리가 같으면 퀴즈까지 공유해 DB에만 저장하고, 다르면 분석 결과가 캐시에 있으므로
+    다시 스케줄링해 퀴즈 생성만 수행되게 한다.
+    """
+    if waiter["category"] != leader["category"]:
+        enqueue_quiz_job(waiter, waiter["job_class"], coalesce=False)
+        return
+
+    job_store.mark_shared(waiter["job_id"], ["analyze", "describe", "generate"])
+    persist_quiz_task.delay(dict(waiter, analysis=leader["analysis"], quiz=leader["quiz"], shared=True))
+
+
+@celery.task(name="quiz.finish")
+def finish_quiz_job(payload: Dict[str, Any]) -> str:
+    """체인 마지막 단계: 실행 중 목록에서 제거하고 기다리던 작업에 결과를 넘긴 뒤 다음 작업 시작"""
+    scheduler = get_job_scheduler()
+    scheduler.complete(payload["job_id"])
+    if payload.get("inflight"):
+        for waiter in scheduler.release_inflight(payload):
+            share_result(payload, waiter)
+    dispatch_next_job.delay()
+    return payload["job_id"]
+
+
+@celery.task(name="quiz.failed")
+def quiz_job_failed(payload: Dict[str, Any]):
+    """체인 단계가 실패하면 호출 (실패 상태는 job_store.stage에서 기록됨)"""
+    scheduler = get_job_scheduler()
+    scheduler.complete(payload["job_id"])
+    if payload.get("inflight"):
+        # 처리 담당이 실패하면 기다리던 작업은 각자 다시 시도
+        for waiter in scheduler.release_inflight(payload):
+            enqueue_quiz_job(waiter, waiter["job_class"])
+    dispatch_next_job.delay()
+
+
+@celery.task(name="quiz.dispatch")
+def dispatch_next_job():
+    """티켓 작업: 실행 가능한 자리가 있으면 스케줄러가 고른 작업 하나의 단계 체인을 시작
+
+    꺼낸 작업은 완료될 때까지 스케줄러의 실행 중 목록에 남으므로, 체인을 시작하기 전에
+    워커가 죽어도 reap_stale_jobs가 다시 큐에 넣는다.
+    """
+    payload = get_job_scheduler().dequeue()
+    if payload is None:
+        return None
+    build_quiz_chain(payload).apply_async()
+    return payload["job_id"]
+
+
+@celery.task(name="quiz.reap_stale")
+def reap_stale_jobs() -> int:
+    """SCHEDULER_PROCESSING_TIMEOUT 안에 끝나지 않은 작업을 다시 큐에 넣고 빈 자리만큼 티켓 발행 (beat 주기 실행)"""
+    scheduler = get_job_scheduler()
+    requeued = 0
+    for payload in scheduler.reap_stale():
+        attempts = payload.get("attempts", 0) + 1
+        if attempts >= settings.SCHEDULER_MAX_ATTEMPTS:
+            job_store.fail(payload["job_id"], "Job did not finish after worker failures")
+            if payload.get("inflight"):
+                for waiter in scheduler.release_inflight(payload):
+                    enqueue_quiz_job(waiter, waiter["job_class"])
+            continue
+        if payload.get("inflight") and not scheduler.refresh_inflight(payload):
+            # 담당 표시가 만료돼 다른 작업이 담당이 됐으면 일반 작업으로 다시 실행
+            payload = dict(payload, inflight=False)
+        scheduler.enqueue(dict(payload, attempts=attempts), payload["job_class"])
+        requeued += 1
+
+    # 티켓이 유실된 경우에도 대기 중인 작업이 시작되도록 빈 자리만큼 발행
+    for _ in range(scheduler.free_slots()):
+        dispatch_next_job.delay()
+    return requeued
+
+
+def enqueue_quiz_job(payload: Dict[str, Any], job_class: str, coalesce: bool = True) -> Dict[str, Any]:
+    """같은 영상이 처리 중이면 결과를 기다리고, 아니면 사용자 큐에 넣고 티켓 발행"""
+    scheduler = get_job_scheduler()
+    if coalesce:
+        leader = scheduler.join_inflight(dict(payload, job_class=job_class))
+        if leader is not None:
+            job_store.mark_coalesced(payload["job_id"], leader)
+            scheduler.record_coalesced(job_class)
+            return {"job_id": payload["job_id"], "status": "queued", "coalesced_with": leader}
+        # 이 작업이 처리 담당: 끝나면 기다리는 작업에 결과를 넘겨야 함
+        payload = dict(payload, inflight=True)
+
+    scheduler.enqueue(payload, job_class)
+    dispatch_next_job.delay()
+    return {"job_id": payload["job_id"], "status": "queued", "coalesced_with": None}
+
+
+def start_quiz_job(db: Session, user_id: int, video_path: str, content_hash: str, category: str,
+                   job_class: str = "interactive") -> Dict[str, Any]:
+    """분석 행과 작업 상태를 만들고 스케줄러에 등록"""
+    analysis = create_video_analysis(db, user_id, video_path, category)
+    job_id = job_store.create(user_id, category, analysis.id)
+    payload = {
+        "job_id": job_id,
+        "user_id": user_id,
+        "analysis_id": analysis.id,
+        "video_path": video_path,
+        "content_hash": content_hash,
+        "category": category
+    }
+    return dict(enqueue_quiz_job(payload, job_class), analysis_id=analysis.id)
+
+
+def refill_category_pool(category: str) -> int:
+    """재고가 하한 미만이면 목표치까지 일괄 생성으로 보충하고 추가된 수 반환"""
+    db = SessionLocal()
+    try:
+        stock = count_pool_quizzes(db, category)
+        if stock >= settings.QUIZ_POOL_LOW_WATER:
+            return 0
+
+        ai_service = AIService()
+        added = 0
+        # 중복 질문만 돌아오는 경우에도 끝나도록 필요한 호출 수 + 1회로 제한
+        batches = -(-(settings.QUIZ_POOL_HIGH_WATER - stock) // settings.QUIZ_POOL_BATCH_SIZE) + 1
+        for _ in range(batches):
+            if stock + added >= settings.QUIZ_POOL_HIGH_WATER:
+                break
+            quizzes = ai_service.generate_quiz_batch(category, settings.QUIZ_POOL_BATCH_SIZE)
+            if not quizzes:
+                # LLM 장애 중에는 다음 주기에 다시 시도
+                break
+            added += add_pool_quizzes(db, category, quizzes)
+        return added
+    finally:
+        db.close()
+
+
+@celery.task(name="quiz.refill_pool")
+def refill_quiz_pool(category: Optional[str] = None) -> Dict[str, int]:
+    """카테고리별 퀴즈 재고 보충 (beat 주기 실행 + 재고가 하한 아래로 내려가면 즉시 실행)"""
+    client = get_redis_client()
+    categories = [category] if category else list(TRAFFIC_KEYWORDS)
+    added = {}
+    for name in categories:
+        # 실행을 시작했으므로 이후 재고 감소는 다시 보충 요청 가능
+        client.delete(f"quiz_pool:refill_queued:{name}")
+        # 같은 카테고리를 여러 워커가 동시에 보충하지 않도록 잠금
+        lock = f"quiz_pool:refill:{name}"
+        if not client.set(lock, 1, nx=True, ex=settings.QUIZ_POOL_REFILL_INTERVAL):
+            continue
+        try:
+            added[name] = refill_category_pool(name)
+        finally:
+            client.delete(lock)
+    return added
+
+
+def request_pool_refill(category: str):
+    """재고가 하한 아래로 내려가면 보충 작업 등록 (요청마다 작업이 쌓이지 않도록 대기 중인 작업이 없을 때만)"""
+    if get_redis_client().set(f"quiz_pool:refill_queued:{category}", 1, nx=True, ex=settings.QUIZ_POOL_REFILL_INTERVAL):
+        refill_quiz_pool.delay(category)
+
+
+@celery.task(name="uploads.purge_sessions")
+def purge_upload_sessions() -> int:
+    """중단된 이어받기 업로드의 만료 세션/.part 파일 정리 (beat 주기 실행)"""
+    return upload_sessions.purge_expired()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+프레임 분류 백엔드 정확도 비교
+
+기준 백엔드(fp32 torch 파이프라인, PIL 전처리)와 후보 백엔드(ONNX / int8 양자화,
+OpenCV 프레임 전처리)의 분류 결과 및 도로 요소 라벨 일치도를 확인한다.
+
+사용법: python check_inference_parity.py <영상 경로>... [--backend onnx-int8] [--min-agreement 0.95]
+"""
+
+import argparse
+import sys
+import time
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+from app.services.frame_sampler import KeyframeSampler
+from app.services.inference_backends import BACKENDS, bgr_to_pil, check_parity, load_frame_classifier
+
+def load_frames(video_paths):
+    """영상에서 키프레임(BGR) 추출"""
+    sampler = KeyframeSampler()
+    frames = []
+    for path in video_paths:
+        frames.extend(frame for _, frame in sampler.iter_keyframes(path))
+    return frames
+
+def timed(classify, inputs):
+    started = time.perf_counter()
+    results = classify(inputs, settings.FRAME_BATCH_SIZE)
+    return results, (time.perf_counter() - started) / max(len(inputs), 1)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--backend", default=settings.FRAME_CLASSIFIER_BACKEND, choices=BACKENDS)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    frames = load_frames(args.videos)
+    if not frames:
+        print("❌ 키프레임을 추출하지 못했습니다.")
+        return False
+    print(f"🎞️ 키프레임 {len(frames)}장")
+
+    reference = load_frame_classifier("torch")
+    candidate = load_frame_classifier(args.backend)
+
+    report = check_parity(reference, candidate, frames, settings.FRAME_BATCH_SIZE)
+    print(f"📊 top-1 일치율: {report['top1_agreement']:.3f}")
+    print(f"📊 top-5 겹침 비율: {report['top5_overlap']:.3f}")
+    print(f"📊 top-1 점수 최대 차이: {report['max_top1_score_diff']:.4f}")
+    for mismatch in report["mismatches"]:
+        print(f"   - #{mismatch['index']}: {mismatch['reference']} → {mismatch['candidate']}")
+
+    # 실제 서비스에서 사용하는 도로 요소 라벨 일치 여부
+    service = AIService()
+    ref_results, ref_latency = timed(reference.classify, [bgr_to_pil(frame) for frame in frames])
+    cand_results, cand_latency = timed(
+        candidate.classify_frames, [candidate.preprocessor.prepare(frame) for frame in frames]
+    )
+    road_matches = sum(
+        set(service._extract_road_elements(ref)) == set(service._extract_road_elements(cand))
+        for ref, cand in zip(ref_results, cand_results)
+    )
+    road_agreement = road_matches / len(frames)
+    print(f"📊 도로 요소 라벨 일치율: {road_agreement:.3f}")
+    print(f"⏱️ 프레임당 추론 시간: torch {ref_latency * 1000:.1f}ms / {candidate.name} {cand_latency * 1000:.1f}ms")
+
+    return report["top1_agreement"] >= args.min_agreement and road_agreement >= args.min_agreement
+
+if __name__ == "__main__":
+    print("🚀 추론 백엔드 정확도 비교 시작...")
+    success = main()
+
+    if success:
+        print("🎉 정확도 기준 통과!")
+    else:
+        print("💥 정확도 기준 미달!")
+        sys.exit(1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+로컬 테스트용 OpenAI 호환 서버
+
+LLM 게이트웨이(app/services/llm_gateway.py)의 타임아웃/재시도/서킷 차단을 실제 API 없이 확인한다.
+환경 변수로 지연과 실패율을 조절할 수 있다.
+
+사용법:
+  FAKE_OPENAI_FAIL_RATE=0.3 FAKE_OPENAI_LATENCY=0.5 python fake_openai_server.py
+  OPENAI_BASE_URL=http://localhost:8002/v1 OPENAI_API_KEY=test python main.py
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+app = FastAPI()
+
+FAIL_RATE = float(os.getenv("FAKE_OPENAI_FAIL_RATE", "0"))  # 429/500 응답 비율
+LATENCY = float(os.getenv("FAKE_OPENAI_LATENCY", "0.2"))  # 응답 지연 (초)
+
+stats = {"requests": 0, "errors": 0}
+
+FAKE_QUIZ = {
+    "question": "교차로에서 우회전할 때 가장 안전한 방법은?",
+    "options": [
+        "빨리 우회전하기",
+        "왼쪽을 확인하고 천천히 우회전하기",
+        "신호등만 보고 우회전하기",
+        "다른 차량이 없으면 무시하고 우회전하기"
+    ],
+    "correct": 1,
+    "explanation": "우회전 시에는 반드시 왼쪽을 확인하고 천천히 우회전해야 합니다."
+}
+
+FAKE_DESCRIPTION = "교차로 앞에서 신호등이 노란불로 바뀌고 있어 정지선 앞에서 멈출 준비를 해야 하는 상황입니다."
+
+def fake_content(messages):
+    """프롬프트에 JSON 요청이 있으면 퀴즈 JSON(설명 필드/일괄 생성 요청 시 포함), 아니면 상황 설명"""
+    prompt = " ".join(message.get("content", "") for message in messages)
+    if '"quizzes"' in prompt:
+        # 재고 중복 제거를 통과하도록 질문마다 번호를 붙임
+        quizzes = [dict(FAKE_QUIZ, question=f"{FAKE_QUIZ['question']} ({uuid.uuid4().hex[:6]})") for _ in range(5)]
+        return json.dumps({"quizzes": quizzes}, ensure_ascii=False)
+    if '"description"' in prompt:
+        return json.dumps(dict(FAKE_QUIZ, description=FAKE_DESCRIPTION), ensure_ascii=False)
+    if "JSON" in prompt:
+        return json.dumps(FAKE_QUIZ, ensure_ascii=False)
+    return FAKE_DESCRIPTION
+
+async def stream_chunks(body, content, chunk_size=8):
+    """OpenAI 스트리밍 형식(chat.completion.chunk)으로 몇 글자씩 전송"""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    for start in range(0, len(content), chunk_size):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "delta": {"content": content[start:start + chunk_size]}, "finish_reason": None}]
+        }
+        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        await asyncio.sleep(LATENCY / 10)
+    yield "data: [DONE]\n\n"
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+    await asyncio.sleep(LATENCY)
+
+    if random.random() < FAIL_RATE:
+        stats["errors"] += 1
+        if random.random() < 0.5:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                headers={"retry-after": "1"}
+            )
+        return JSONResponse(status_code=500, content={"error": {"message": "Internal error", "type": "server_error"}})
+
+    content = fake_content(body.get("messages", []))
+    if body.get("stream"):
+        return StreamingResponse(stream_chunks(body, content), media_type="text/event-stream")
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content), "total_tokens": len(content)}
+    }
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("FAKE_OPENAI_PORT", "8002")))
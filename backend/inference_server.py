@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+로컬 추론 서버
+
+이미지 분류 모델과 텍스트 임베딩 모델을 한 프로세스에서만 로드하고,
+여러 API/Celery 워커의 동시 요청을 동적 배치로 묶어 처리한다.
+
+사용법: python inference_server.py  (INFERENCE_SERVER_UDS 설정 시 Unix 소켓으로 실행)
+"""
+
+import asyncio
+from typing import List
+
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.dynamic_batcher import DynamicBatcher
+from app.services.inference_client import decode_frames, decode_image
+from app.services.model_registry import (
+    load_local_image_classifier, load_local_text_embedder, model_registry, parse_model_names
+)
+
+# 이 프로세스는 항상 모델을 직접 로드
+model_registry.register("image_classifier", load_local_image_classifier)
+model_registry.register("text_embedder", load_local_text_embedder)
+
+app = FastAPI(title="추론 서버")
+
+class ClassifyRequest(BaseModel):
+    images: List[str]  # base64 JPEG
+
+class FramesRequest(BaseModel):
+    shape: List[int]  # (N, H, W, 3)
+    data: str  # base64 uint8 원본 바이트
+
+class EmbedRequest(BaseModel):
+    texts: List[str]
+
+def classify_batch(images):
+    classifier = model_registry.get("image_classifier")
+    return classifier.classify(images, batch_size=len(images))
+
+def classify_frames_batch(crops):
+    classifier = model_registry.get("image_classifier")
+    return classifier.classify_frames(crops, batch_size=len(crops))
+
+def embed_batch(texts):
+    return model_registry.get("text_embedder").encode(texts).tolist()
+
+batchers = {
+    "classify": DynamicBatcher("classify", classify_batch, settings.INFERENCE_MAX_BATCH_SIZE, settings.INFERENCE_MAX_WAIT_MS),
+    "classify_frames": DynamicBatcher("classify_frames", classify_frames_batch, settings.INFERENCE_MAX_BATCH_SIZE, settings.INFERENCE_MAX_WAIT_MS),
+    "embed": DynamicBatcher("embed", embed_batch, settings.INFERENCE_MAX_BATCH_SIZE, settings.INFERENCE_MAX_WAIT_MS),
+}
+
+@app.on_event("startup")
+def start_batchers():
+    model_registry.warmup(parse_model_names(settings.MODEL_WARMUP))
+    for batcher in batchers.values():
+        batcher.start()
+
+@app.on_event("shutdown")
+async def stop_batchers():
+    for batcher in batchers.values():
+        await batcher.stop()
+
+@app.post("/classify")
+async def classify(request: ClassifyRequest):
+    """이미지 분류 (요청 간 동적 배치)"""
+    images = [decode_image(data) for data in request.images]
+    results = await asyncio.gather(*(batchers["classify"].submit(image) for image in images))
+    return {"results": results}
+
+@app.post("/classify_frames")
+async def classify_frames(request: FramesRequest):
+    """전처리된 프레임 분류 (요청 간 동적 배치)"""
+    crops = decode_frames(request.dict())
+    results = await asyncio.gather(*(batchers["classify_frames"].submit(crop) for crop in crops))
+    return {"results": results}
+
+@app.post("/embed")
+async def embed(request: EmbedRequest):
+    """텍스트 임베딩 (요청 간 동적 배치)"""
+    embeddings = await asyncio.gather(*(batchers["embed"].submit(text) for text in request.texts))
+    return {"embeddings": embeddings}
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "loaded": model_registry.loaded_models()}
+
+@app.get("/stats")
+async def stats():
+    return {name: batcher.stats() for name, batcher in batchers.items()}
+
+if __name__ == "__main__":
+    if settings.INFERENCE_SERVER_UDS:
+        uvicorn.run(app, uds=settings.INFERENCE_SERVER_UDS)
+    else:
+        uvicorn.run(app, host=settings.INFERENCE_SERVER_HOST, port=settings.INFERENCE_SERVER_PORT)
@@ -9,8 +9,10 @@ from dotenv import load_dotenv
 
 from app.database import get_db, engine
 from app.models import Base
-from app.routers import auth, quiz, analysis, user
+from app.routers import auth, quiz, analysis, user, metrics, uploads
 from app.core.config import settings
+from app.services.model_registry import model_registry, parse_model_names
+from app.services.fallback_bank import fallback_bank
 
 # 환경 변수 로드
 load_dotenv()
@@ -38,9 +40,19 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # 라우터 등록
 app.include_router(auth.router, prefix="/api/auth", tags=["인증"])
+app.include_router(uploads.router, prefix="/api/quiz/uploads", tags=["퀴즈"])
 app.include_router(quiz.router, prefix="/api/quiz", tags=["퀴즈"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["분석"])
 app.include_router(user.router, prefix="/api/user", tags=["사용자"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["모니터링"])
+
+@app.on_event("startup")
+def load_models():
+    """AI 모델 워밍업, 예비 퀴즈 로드 및 유휴 모델 정리 스레드 시작"""
+    model_registry.warmup(parse_model_names(settings.MODEL_WARMUP))
+    fallback_bank.load()
+    if settings.MODEL_IDLE_TIMEOUT > 0:
+        model_registry.start_idle_reaper(settings.MODEL_IDLE_TIMEOUT)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Weaviate Quiz 클래스를 벡터 직접 전달 모드(vectorizer: none)로 이전
+
+text2vec-transformers(mpnet, 768차원)로 만든 기존 Quiz 클래스에는 TEXT_EMBED_MODEL 벡터를 넣을 수
+없으므로, 모든 객체를 읽어 TEXT_EMBED_MODEL로 다시 임베딩한 뒤 클래스를 새로 만들고 같은 id로
+다시 넣는다. 임베딩은 클래스를 지우기 전에 모두 계산하고, 읽은 객체는 백업 파일로도 남긴다.
+이전이 끝나면 WEAVIATE_VECTORIZER=none으로 설정한 뒤 서버를 다시 시작한다.
+
+사용법: python migrate_weaviate_vectors.py [--backup quiz_backup.json] [--page 100]
+"""
+
+import argparse
+import json
+import sys
+
+from app.services.weaviate_client import embed_text, get_weaviate_client, quiz_class_schema, quiz_text
+
+def read_quizzes(client, page):
+    """Quiz 객체 전체를 id 커서로 나눠 읽기"""
+    objects = []
+    after = None
+    while True:
+        result = client.data_object.get(class_name="Quiz", limit=page, after=after)
+        batch = result.get("objects") or []
+        if not batch:
+            return objects
+        objects.extend({"id": obj["id"], "properties": obj.get("properties", {})} for obj in batch)
+        after = batch[-1]["id"]
+
+def migrate(backup_path, page=100):
+    """Quiz 클래스를 vectorizer: none으로 다시 만들고 기존 객체를 재임베딩해 복원"""
+    client = get_weaviate_client()
+    if not client:
+        print("❌ Weaviate에 연결할 수 없습니다")
+        return False
+
+    if not client.schema.exists("Quiz"):
+        client.schema.create_class(quiz_class_schema("none"))
+        print("✅ 기존 Quiz 클래스가 없어 새로 만들었습니다")
+        return True
+    if client.schema.get("Quiz").get("vectorizer") == "none":
+        print("✅ 이미 vectorizer: none 클래스입니다")
+        return True
+
+    objects = read_quizzes(client, page)
+    print(f"✅ 기존 퀴즈 {len(objects)}건 읽음")
+    with open(backup_path, "w", encoding="utf-8") as f:
+        json.dump(objects, f, ensure_ascii=False)
+    print(f"✅ 백업 저장: {backup_path}")
+
+    # 클래스를 지우기 전에 임베딩을 모두 계산 (모델 오류 시 기존 데이터 유지)
+    vectors = [embed_text(quiz_text(dict({"question": ""}, **obj["properties"]))) for obj in objects]
+    print(f"✅ 재임베딩 완료 ({len(vectors[0]) if vectors else 0}차원)")
+
+    failed = []
+
+    def collect_errors(results):
+        # 배치 쓰기 오류는 예외가 아니라 결과로 오므로 따로 모음
+        for result in results or []:
+            if "errors" in result.get("result", {}):
+                failed.append(result["id"])
+
+    client.schema.delete_class("Quiz")
+    client.schema.create_class(quiz_class_schema("none"))
+    with client.batch(batch_size=page, callback=collect_errors) as batch:
+        for obj, vector in zip(objects, vectors):
+            batch.add_data_object(obj["properties"], "Quiz", uuid=obj["id"], vector=vector)
+
+    if failed:
+        print(f"❌ {len(failed)}건 복원 실패 (백업 파일 {backup_path} 참고): {failed[:10]}")
+        return False
+    print(f"🎉 이전 완료: {len(objects)}건. WEAVIATE_VECTORIZER=none으로 설정한 뒤 서버를 다시 시작하세요")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backup", default="quiz_backup.json", help="이전 전 객체 백업 파일")
+    parser.add_argument("--page", type=int, default=100, help="읽기/쓰기 묶음 크기")
+    args = parser.parse_args()
+
+    print("🚀 Weaviate Quiz 벡터 이전 시작...")
+    try:
+        ok = migrate(args.backup, args.page)
+    except Exception as e:
+        print(f"❌ 이전 실패: {e}")
+        ok = False
+    if not ok:
+        sys.exit(1)
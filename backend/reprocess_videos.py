@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+저장된 키프레임으로 영상 분석 결과 재계산
+
+분류 모델이나 프롬프트를 바꾼 뒤 video_analyses의 도로 요소(및 상황 설명)를 다시 계산한다.
+키프레임 저장소에서 메모리 매핑으로 읽으므로 영상을 다시 디코딩하지 않으며,
+키프레임이 없는 항목만 원본 영상에서 추출해 내용 해시별로 저장한다.
+
+사용법: python reprocess_videos.py [--ids 1 2 3] [--describe] [--batch 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from app.database import SessionLocal
+from app.models import VideoAnalysis
+from app.services.ai_service import AIService
+from app.services.analysis_cache import hash_file
+from app.services.frame_sampler import KeyframeSampler
+from app.services.keyframe_store import keyframe_store
+
+def load_keyframes(analysis):
+    """저장된 키프레임 로드 (없으면 원본 영상에서 추출 후 저장)"""
+    frames = keyframe_store.load_for_analysis(analysis.id)
+    if frames is not None:
+        return list(frames)
+
+    # 링크가 없는 이전 항목은 같은 내용의 다른 업로드가 저장한 키프레임부터 찾음
+    if not os.path.exists(analysis.video_path):
+        return []
+    content_hash = hash_file(analysis.video_path)
+    frames = keyframe_store.load(content_hash)
+    if frames is None:
+        sampled = KeyframeSampler().sample(analysis.video_path)
+        if not sampled:
+            return []
+        keyframe_store.save(content_hash, [frame for _, frame in sampled], [timestamp for timestamp, _ in sampled])
+        frames = keyframe_store.load(content_hash)
+    keyframe_store.link(analysis.id, content_hash)
+    return list(frames)
+
+def reprocess(ids=None, describe=False, batch=50):
+    """분석 결과 재계산"""
+    service = AIService()
+    db = SessionLocal()
+    processed = 0
+    skipped = 0
+
+    try:
+        query = db.query(VideoAnalysis.id).order_by(VideoAnalysis.id)
+        if ids:
+            query = query.filter(VideoAnalysis.id.in_(ids))
+        analysis_ids = [row.id for row in query]
+
+        # 스트리밍 커서를 열어둔 채 커밋하지 않도록 id 묶음 단위로 조회
+        for start in range(0, len(analysis_ids), batch):
+            chunk = analysis_ids[start:start + batch]
+            for analysis in db.query(VideoAnalysis).filter(VideoAnalysis.id.in_(chunk)).all():
+                frames = load_keyframes(analysis)
+                if not frames:
+                    print(f"⚠️ #{analysis.id}: 키프레임 없음 ({analysis.video_path})")
+                    skipped += 1
+                    continue
+
+                road_elements = service.analyze_keyframes(frames)
+                analysis.road_elements = json.dumps(road_elements, ensure_ascii=False)
+                if describe:
+                    analysis.description = service.generate_scenario_description(road_elements)
+                processed += 1
+
+            db.commit()
+            print(f"✅ {processed}건 처리")
+
+        print(f"🎉 재분석 완료: {processed}건 처리, {skipped}건 건너뜀")
+        return True
+
+    except Exception as e:
+        print(f"❌ 재분석 실패: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ids", type=int, nargs="*", help="재분석할 VideoAnalysis id (기본: 전체)")
+    parser.add_argument("--describe", action="store_true", help="상황 설명도 다시 생성")
+    parser.add_argument("--batch", type=int, default=50, help="커밋 단위")
+    args = parser.parse_args()
+
+    print("🚀 영상 분석 재계산 시작...")
+    if not reprocess(args.ids, args.describe, args.batch):
+        sys.exit(1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+운영용 서버 실행 스크립트
+
+gunicorn 마스터 프로세스에서 앱과 AI 모델을 미리 로드한 뒤 워커를 fork하여
+모델 가중치를 copy-on-write로 공유한다. 워커마다 torch 스레드 수를 나눠
+CPU 과다 할당을 막는다.
+
+사용법: python serve.py
+"""
+
+import gc
+import os
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+
+from app.core.config import settings
+
+
+def worker_count() -> int:
+    return settings.WEB_WORKERS or os.cpu_count() or 1
+
+
+def torch_threads_per_worker() -> int:
+    if settings.TORCH_THREADS_PER_WORKER > 0:
+        return settings.TORCH_THREADS_PER_WORKER
+    return max(1, (os.cpu_count() or 1) // worker_count())
+
+
+def when_ready(server):
+    """마스터: 워커 fork 전에 모델 로드"""
+    from app.services.model_registry import model_registry, parse_model_names
+    from app.services.fallback_bank import fallback_bank
+
+    model_registry.warmup(parse_model_names(settings.MODEL_WARMUP))
+    fallback_bank.load()
+    # 로드된 객체를 GC 추적에서 제외하여 워커에서 페이지가 복사되지 않도록 함
+    gc.freeze()
+    server.log.info(f"Preloaded models: {model_registry.loaded_models()}")
+
+
+def post_fork(server, worker):
+    """워커: torch 스레드 수 설정 및 fork 전에 열린 연결 정리"""
+    from app.database import engine
+
+    # 마스터에서 만든 DB 연결 풀을 워커 간에 공유하지 않도록 폐기
+    engine.dispose()
+
+    try:
+        import torch
+    except ImportError:
+        return
+
+    threads = torch_threads_per_worker()
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(settings.TORCH_INTEROP_THREADS)
+    except RuntimeError as e:
+        # 마스터에서 이미 병렬 작업이 시작된 경우 inter-op 스레드 수는 변경 불가
+        server.log.warning(f"Could not set torch inter-op threads: {e}")
+    server.log.info(f"Worker {worker.pid}: torch intra-op threads={threads}")
+
+
+class ProductionServer(BaseApplication):
+    """gunicorn + uvicorn 워커 기반 운영 서버"""
+
+    def __init__(self, app_uri: str, options: dict):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return import_app(self.app_uri)
+
+
+if __name__ == "__main__":
+    # 워커에서 유휴 모델을 내리면 공유 페이지 대신 워커별 재로드가 일어나므로 비활성화
+    if settings.MODEL_IDLE_TIMEOUT > 0:
+        print("MODEL_IDLE_TIMEOUT is ignored under serve.py (models are shared across workers)")
+        settings.MODEL_IDLE_TIMEOUT = 0
+
+    options = {
+        "bind": f"0.0.0.0:{settings.WEB_PORT}",
+        "workers": worker_count(),
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "timeout": settings.WEB_TIMEOUT,
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+    }
+    ProductionServer("main:app", options).run()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+LLM 장애 대비 예비 퀴즈 은행 테스트
+"""
+
+import itertools
+import json
+import os
+import tempfile
+
+from app.core.config import settings
+from app.services.fallback_bank import DEFAULT_CATEGORY, FallbackQuizBank
+
+
+def make_bank(counts):
+    """카테고리별 문제 수가 counts인 임시 예비 퀴즈 은행 생성"""
+    data = {
+        category: [
+            {"question": f"{category} {i}", "options": ["a", "b", "c", "d"], "correct": 0, "explanation": ""}
+            for i in range(count)
+        ]
+        for category, count in counts.items()
+    }
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    bank = FallbackQuizBank(path)
+    bank.load()
+    os.remove(path)
+    return bank
+
+
+def test_each_cycle_is_a_permutation():
+    """한 바퀴(n문제) 안에서는 같은 문제가 다시 나오지 않는지"""
+    # 소수, 합성수, 1문제 카테고리 모두 확인
+    bank = make_bank({"소수": 13, "합성수": 12, "한 문제": 1})
+    for category, n in (("소수", 13), ("합성수", 12), ("한 문제", 1)):
+        for user_id in (1, 2, 99):
+            for cycle in range(3):
+                indices = [bank._permuted_index(user_id, category, cycle * n + i) for i in range(n)]
+                assert sorted(indices) == list(range(n))
+
+
+def test_order_differs_between_users_and_cycles():
+    """사용자나 바퀴가 바뀌면 출제 순서도 달라지는지"""
+    bank = make_bank({"카테고리": 40})
+    orders = {
+        (user_id, cycle): tuple(bank._permuted_index(user_id, "카테고리", cycle * 40 + i) for i in range(40))
+        for user_id in range(1, 6) for cycle in range(3)
+    }
+    assert len(set(orders.values())) > len(orders) // 2
+
+
+def test_pick_uses_user_counter():
+    """pick이 사용자 카운터 순서대로 한 바퀴 안에서 중복 없이 고르는지"""
+    bank = make_bank({DEFAULT_CATEGORY: 10})
+    counter = itertools.count()
+    bank._next_counter = lambda user_id, category: next(counter)
+    questions = [bank.pick(DEFAULT_CATEGORY, user_id=7)["question"] for _ in range(10)]
+    assert len(set(questions)) == 10
+
+
+def test_pick_unknown_category_and_anonymous():
+    """없는 카테고리는 기본 카테고리로, user_id가 없으면 카운터 없이 고르는지"""
+    def no_counter(user_id, category):
+        raise AssertionError("anonymous pick must not use the user counter")
+
+    bank = make_bank({DEFAULT_CATEGORY: 5})
+    bank._next_counter = no_counter
+    assert bank.pick("없는 카테고리")["question"].startswith(DEFAULT_CATEGORY)
+
+
+def test_pick_returns_copy():
+    """반환된 퀴즈를 수정해도 은행 데이터는 바뀌지 않는지"""
+    bank = make_bank({DEFAULT_CATEGORY: 1})
+    quiz = bank.pick(DEFAULT_CATEGORY)
+    quiz["question"] = "수정"
+    assert bank.load()[DEFAULT_CATEGORY][0]["question"] != "수정"
+
+
+def test_shipped_bank_is_valid():
+    """배포되는 예비 퀴즈 파일의 형식 확인"""
+    with open(settings.FALLBACK_QUIZ_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    assert DEFAULT_CATEGORY in data
+    for category, quizzes in data.items():
+        assert len(quizzes) >= 40, category
+        assert len({quiz["question"] for quiz in quizzes}) == len(quizzes), category
+        for quiz in quizzes:
+            assert len(quiz["options"]) == 4 and len(set(quiz["options"])) == 4, quiz["question"]
+            assert 0 <= quiz["correct"] < 4, quiz["question"]
+            assert quiz["explanation"], quiz["question"]
+
+
+if __name__ == "__main__":
+    print("🚀 예비 퀴즈 은행 테스트 시작...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
+    print("🎉 예비 퀴즈 은행 테스트 성공!")
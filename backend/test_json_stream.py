@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+LLM 스트리밍 JSON 파서 테스트
+"""
+
+import json
+
+from app.services.json_stream import IncrementalJSONParser, extract_json_object
+
+QUIZ = {
+    "question": "황색 점멸 신호의 의미는?",
+    "options": ["정지", "서행", "주의하며 진행", "유턴"],
+    "correct": 2,
+    "explanation": "다른 교통에 주의하면서 진행할 수 있습니다. {괄호}와 \"따옴표\"도 포함"
+}
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalJSONParser()
+    completed = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start:start + size]))
+    return parser, completed
+
+
+def test_fields_complete_in_order():
+    """최상위 필드가 값이 끝나는 순서대로 반환되는지"""
+    text = json.dumps(QUIZ, ensure_ascii=False)
+    for size in (1, 3, 7, len(text)):
+        parser, completed = feed_in_chunks(text, size)
+        assert [key for key, _ in completed] == list(QUIZ)
+        assert dict(completed) == QUIZ
+        assert parser.result() == QUIZ
+
+
+def test_question_before_object_closes():
+    """객체가 닫히기 전에도 완성된 필드는 바로 반환되는지"""
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"question": "질문", "options": ["a", ') == [("question", "질문")]
+    assert parser.result() is None
+    assert parser.feed('"b"], "correct": 1}') == [("options", ["a", "b"]), ("correct", 1)]
+    assert parser.result() == {"question": "질문", "options": ["a", "b"], "correct": 1}
+
+
+def test_ignores_prose_and_code_fence():
+    """객체 앞 설명 문장, 코드 펜스와 객체 뒤 텍스트 무시"""
+    text = "다음은 퀴즈입니다:\n```json\n" + json.dumps(QUIZ, ensure_ascii=False) + "\n```\n도움이 되길 바랍니다."
+    assert extract_json_object(text) == QUIZ
+
+
+def test_nested_values():
+    """중첩 객체/배열 안의 쉼표와 콜론은 최상위 필드로 취급하지 않음"""
+    data = {"a": {"b": [1, {"c": "d,e:f"}]}, "g": "h"}
+    parser, completed = feed_in_chunks(json.dumps(data), 2)
+    assert completed == [("a", data["a"]), ("g", "h")]
+
+
+def test_incomplete_or_missing_object():
+    """객체가 없거나 닫히지 않으면 None"""
+    assert extract_json_object("JSON이 없는 응답") is None
+    assert extract_json_object('{"question": "잘린 응답"') is None
+
+
+def test_invalid_object_returns_completed_fields():
+    """전체 파싱이 실패하면 완성된 필드만 반환"""
+    assert extract_json_object('{"question": "질문", "correct": 01}') == {"question": "질문"}
+
+
+if __name__ == "__main__":
+    print("🚀 JSON 스트리밍 파서 테스트 시작...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
+    print("🎉 JSON 스트리밍 파서 테스트 성공!")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+유사 영상 지문(dhash, 다중 인덱스 해싱) 테스트
+"""
+
+import random
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.services.video_fingerprint import MultiIndexHash, dhash, fingerprint_frames, hamming_distance
+
+
+def flip_bits(value, count, rng):
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def test_hamming_distance():
+    assert hamming_distance(0, 0) == 0
+    assert hamming_distance(0b1011, 0b0001) == 2
+    assert hamming_distance(0, (1 << 64) - 1) == 64
+
+
+def test_multi_index_matches_brute_force():
+    """다중 인덱스 검색 결과가 전수 비교와 같은지"""
+    rng = random.Random(42)
+    # 서로 가까운 해시 묶음과 무작위 해시를 섞어 같은 구간 값을 공유하는 항목을 만든다
+    items = []
+    for group in range(30):
+        base = rng.getrandbits(64)
+        items.append((base, f"video{group}"))
+        items.extend((flip_bits(base, rng.randint(1, 12), rng), f"video{group}") for _ in range(10))
+    items.extend((rng.getrandbits(64), f"random{i}") for i in range(200))
+
+    index = MultiIndexHash()
+    for item, value in items:
+        index.add(item, value)
+    assert index.size == len(items)
+
+    for query, _ in rng.sample(items, 50) + [(rng.getrandbits(64), None) for _ in range(20)]:
+        for max_distance in (0, 3, 4, 7, 10):
+            expected = sorted(
+                (hamming_distance(query, item), value) for item, value in items
+                if hamming_distance(query, item) <= max_distance
+            )
+            assert sorted(index.search(query, max_distance)) == expected
+
+
+def test_multi_index_duplicate_hashes_keep_all_values():
+    """같은 해시를 가진 여러 영상이 모두 검색되는지"""
+    index = MultiIndexHash()
+    index.add(0xABCDEF, "a")
+    index.add(0xABCDEF, "b")
+    assert sorted(index.search(0xABCDEF, 0)) == [(0, "a"), (0, "b")]
+    assert MultiIndexHash().search(0xABCDEF, 10) == []
+
+
+def test_multi_index_finds_distance_spread_across_bands():
+    """차이 비트가 모든 구간에 고르게 퍼져 있어도 반경 안이면 찾는지"""
+    index = MultiIndexHash()
+    base = 0x0123456789ABCDEF
+    # 구간마다 2비트씩 (총 8비트) 다르게 하면 반경 7에서는 빠지고 반경 8에서는 찾아야 함
+    spread = base ^ sum((0b11 << (band * 16)) for band in range(4))
+    index.add(spread, "spread")
+    assert index.search(base, 7) == []
+    assert index.search(base, 8) == [(8, "spread")]
+
+
+def test_dhash_stable_under_rescale_and_skips_flat_frames():
+    """재인코딩(크기 변경/밝기 변화)에도 해시가 가깝고, 단색 프레임은 제외되는지"""
+    # 축소해도 구조가 남도록 거친 무작위 패턴을 확대해 사용
+    rng = np.random.default_rng(0)
+    coarse = (rng.random((12, 16, 3)) * 255).astype(np.uint8)
+    frame = cv2.resize(coarse, (640, 360), interpolation=cv2.INTER_CUBIC)
+    resized = cv2.resize(frame, (320, 180), interpolation=cv2.INTER_AREA)
+    brighter = np.clip(frame.astype(np.int16) + 20, 0, 255).astype(np.uint8)
+
+    original = dhash(frame)
+    assert original is not None
+    assert hamming_distance(original, dhash(resized)) <= 6
+    assert hamming_distance(original, dhash(brighter)) <= 6
+    assert dhash(np.full((360, 640, 3), 16, dtype=np.uint8)) is None
+
+
+def test_fingerprint_frames_capped_and_evenly_spaced():
+    """분석 프레임이 많아도 지문은 최대 개수만큼 고르게 뽑는지"""
+    rng = np.random.default_rng(1)
+    frames = [
+        cv2.resize((rng.random((12, 16, 3)) * 255).astype(np.uint8), (160, 90), interpolation=cv2.INTER_CUBIC)
+        for _ in range(settings.NEAR_DUP_MAX_FINGERPRINTS * 3)
+    ]
+    hashes = fingerprint_frames(frames)
+    assert len(hashes) == settings.NEAR_DUP_MAX_FINGERPRINTS
+    assert hashes[0] == dhash(frames[1]) and hashes[-1] == dhash(frames[-2])
+    assert fingerprint_frames(frames[:3]) == [dhash(frame) for frame in frames[:3]]
+    assert fingerprint_frames([]) == []
+
+
+if __name__ == "__main__":
+    print("🚀 유사 영상 지문 테스트 시작...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
+    print("🎉 유사 영상 지문 테스트 성공!")
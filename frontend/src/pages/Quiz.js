@@ -25,10 +25,75 @@ const QuizCard = styled(Card)`
   box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
 `;
 
+const JOB_POLL_INTERVAL = 1500;
+const JOB_POLL_TIMEOUT = 5 * 60 * 1000;
+
+const STAGE_LABELS = {
+  analyze: '영상 분석',
+  describe: '상황 설명 생성',
+  generate: '퀴즈 생성',
+  persist: '저장',
+};
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// 퀴즈 생성 작업이 끝날 때까지 상태 조회
+const waitForJob = async (jobId, onProgress) => {
+  const deadline = Date.now() + JOB_POLL_TIMEOUT;
+  while (Date.now() < deadline) {
+    const { data: job } = await quizAPI.getJob(jobId);
+    if (job.status === 'succeeded') {
+      return job.result;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || '퀴즈 생성 작업이 실패했습니다.');
+    }
+    onProgress(job);
+    await sleep(JOB_POLL_INTERVAL);
+  }
+  throw new Error('퀴즈 생성 시간이 초과되었습니다.');
+};
+
+// SSE로 단계별 결과(도로 요소 → 상황 설명 → 퀴즈)를 받아 표시, 스트림이 끊기면 상태 조회로 전환
+const followJob = async (jobId, onProgress) => {
+  let job = null;
+  let result = null;
+  let failure = null;
+
+  const handleEvent = (event, data) => {
+    if (event === 'snapshot') {
+      job = data;
+    } else if (event === 'stage') {
+      job = { ...job, stage: data.stage, stages: { ...job.stages, [data.stage]: data.state } };
+      const done = Object.values(job.stages).filter((state) => state === 'done').length;
+      job.progress = done / Object.keys(job.stages).length;
+    } else if (event === 'done') {
+      result = data;
+      return;
+    } else if (event === 'error') {
+      failure = new Error(data.error || '퀴즈 생성 작업이 실패했습니다.');
+      return;
+    } else {
+      job = { ...job, [event]: data };
+    }
+    onProgress(job);
+  };
+
+  try {
+    await quizAPI.streamJobEvents(jobId, handleEvent);
+  } catch (error) {
+    console.warn('이벤트 스트림 오류, 상태 조회로 전환합니다.', error);
+  }
+  if (failure) throw failure;
+  if (result) return result;
+  return waitForJob(jobId, onProgress);
+};
+
 const Quiz = () => {
   // eslint-disable-next-line no-unused-vars
   const { user } = useAuth();
   const [loading, setLoading] = useState(false);
+  const [jobProgress, setJobProgress] = useState(null);
   const [videoFile, setVideoFile] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('신호 및 표지');
   const [generatedQuiz, setGeneratedQuiz] = useState(null);
@@ -62,19 +127,20 @@ const Quiz = () => {
     }
 
     setLoading(true);
+    setJobProgress(null);
     try {
-      const formData = new FormData();
-      formData.append('video', videoFile.originFileObj);
-      formData.append('category', selectedCategory);
-
       const response = await quizAPI.generateAIQuiz(videoFile.originFileObj, selectedCategory);
-      setGeneratedQuiz(response.data);
+      const result = await followJob(response.data.job_id, setJobProgress);
+      setGeneratedQuiz(result);
+      setSelectedAnswer(null);
+      setShowResult(false);
       message.success('AI 퀴즈가 생성되었습니다!');
     } catch (error) {
       message.error('퀴즈 생성 중 오류가 발생했습니다.');
       console.error(error);
     } finally {
       setLoading(false);
+      setJobProgress(null);
     }
   };
 
@@ -102,26 +168,17 @@ const Quiz = () => {
     }
   };
 
-  const startExistingQuiz = () => {
-    // 임시 퀴즈 데이터 생성
-    const tempQuiz = {
-      id: 1,
-      question: "교차로에서 우회전할 때 가장 안전한 방법은?",
-      options: [
-        "빨리 우회전하기",
-        "왼쪽을 확인하고 천천히 우회전하기", 
-        "신호등만 보고 우회전하기",
-        "다른 차량이 없으면 무시하고 우회전하기"
-      ],
-      correct_answer: 1,
-      explanation: "우회전 시에는 반드시 왼쪽을 확인하고 천천히 우회전해야 합니다. 특히 보행자와 자전거를 주의해야 합니다.",
-      category: selectedExistingCategory
-    };
-    
-    setExistingQuiz(tempQuiz);
-    setSelectedAnswer(null);
-    setShowResult(false);
-    message.success('퀴즈가 시작되었습니다!');
+  const startExistingQuiz = async () => {
+    try {
+      const response = await quizAPI.getPoolQuiz(selectedExistingCategory);
+      setExistingQuiz(response.data);
+      setSelectedAnswer(null);
+      setShowResult(false);
+      message.success('퀴즈가 시작되었습니다!');
+    } catch (error) {
+      message.error('퀴즈를 불러오는 중 오류가 발생했습니다.');
+      console.error(error);
+    }
   };
 
   const renderAIQuizTab = () => (
@@ -178,6 +235,17 @@ const Quiz = () => {
         >
           🤖 AI 퀴즈 생성
         </Button>
+        {jobProgress && (
+          <p style={{ marginTop: 12 }}>
+            {jobProgress.stage ? `${STAGE_LABELS[jobProgress.stage]} 중...` : '대기 중...'}
+            {' '}({Math.round(jobProgress.progress * 100)}%)
+          </p>
+        )}
+        {jobProgress?.road_elements && (
+          <p>감지된 도로 요소: {jobProgress.road_elements.join(', ') || '없음'}</p>
+        )}
+        {jobProgress?.description && <p>상황 설명: {jobProgress.description}</p>}
+        {jobProgress?.quiz_partial?.question && <p>질문: {jobProgress.quiz_partial.question}</p>}
       </Card>
 
       {generatedQuiz && (
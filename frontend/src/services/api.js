@@ -44,6 +44,7 @@ export const authAPI = {
 export const quizAPI = {
   getQuizzes: () => api.get('/quiz'),
   getQuiz: (id) => api.get(`/quiz/${id}`),
+  getPoolQuiz: (category) => api.get(`/quiz/pool/${encodeURIComponent(category)}`),
   createQuiz: (quizData) => api.post('/quiz', quizData),
   submitAnswer: (quizId, answer) => api.post(`/quiz/${quizId}/answer`, { answer }),
   generateAIQuiz: (videoFile, category) => {
@@ -54,6 +55,38 @@ export const quizAPI = {
       headers: { 'Content-Type': 'multipart/form-data' },
     });
   },
+  getJob: (jobId) => api.get(`/quiz/jobs/${jobId}`),
+  // EventSource는 Authorization 헤더를 보낼 수 없으므로 fetch 스트림으로 SSE 읽기
+  streamJobEvents: async (jobId, onEvent) => {
+    const response = await fetch(`${API_BASE_URL}/quiz/jobs/${jobId}/events`, {
+      headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`이벤트 스트림 연결 실패 (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = 'message';
+        let data = '';
+        frame.split('\n').forEach((line) => {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        if (data) onEvent(event, JSON.parse(data));
+      }
+    }
+  },
 };
 
 export const analysisAPI = {